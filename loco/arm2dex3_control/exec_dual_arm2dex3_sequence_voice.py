@@ -9,7 +9,6 @@
 import sys
 import time
 import json
-import threading
 import os
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Union
@@ -27,6 +26,7 @@ try:
     from xiangyang.loco.common.tts_client import TTSClient
     from xiangyang.loco.common.robot_state_manager import robot_state
     from unitree_sdk2py.arm.arm_client import G1ArmGestures
+    from unitree_sdk2py.whole_body.whole_body_controller import WholeBodyController
 except ImportError as e:
     print(f"❌ 导入模块失败: {e}")
     sys.exit(1)
@@ -38,6 +38,7 @@ class FullBodyPoseSequence:
         self.arm_client = None
         self.left_hand_client = None
         self.right_hand_client = None
+        self.body = None  # 全身控制循环 (手臂 + 双手共用一个控制线程)
         
         self.left_arm_poses = {}
         self.right_arm_poses = {}
@@ -74,6 +75,12 @@ class FullBodyPoseSequence:
                 print("❌ 右手初始化失败")
                 return False
             
+            # 3. 启动全身控制循环
+            self.body = WholeBodyController(self.arm_client, self.left_hand_client, self.right_hand_client)
+            if not self.body.start():
+                print("❌ 全身控制循环启动失败")
+                return False
+            
             # 加载姿态文件
             self._load_poses()
             
@@ -184,38 +191,14 @@ class FullBodyPoseSequence:
 
         print(f"  ▶️  执行: L_Arm[{left_arm or 'keep'}] R_Arm[{right_arm or 'keep'}] | L_Hand[{left_hand or 'keep'}] R_Hand[{right_hand or 'keep'}]")
         
-        # --- 并行执行 ---
-        errors = []
-
-        def run_arm():
-            try:
-                self.arm_client.set_joint_positions(target_arm_positions, speed_factor=speed_factor)
-            except Exception as e:
-                errors.append(f"Arm error: {e}")
-
-        def run_left_hand():
-            try:
-                self.left_hand_client.set_joint_positions(target_left_hand_pos, speed_factor=speed_factor)
-            except Exception as e:
-                errors.append(f"Left Hand error: {e}")
-
-        def run_right_hand():
-            try:
-                self.right_hand_client.set_joint_positions(target_right_hand_pos, speed_factor=speed_factor)
-            except Exception as e:
-                errors.append(f"Right Hand error: {e}")
-
-        # 启动线程
-        t1 = threading.Thread(target=run_arm)
-        t2 = threading.Thread(target=run_left_hand)
-        t3 = threading.Thread(target=run_right_hand)
-        
-        threads = [t1, t2, t3]
-        for t in threads: t.start()
-        for t in threads: t.join()
-        
-        if errors:
-            print(f"  ❌ 执行出错: {'; '.join(errors)}")
+        # --- 同步执行: 一个控制循环推进手臂和双手, 整个姿态一个完成句柄 ---
+        handle = self.body.set_pose(target_arm_positions, target_left_hand_pos, target_right_hand_pos,
+                                    speed_factor=speed_factor)
+        if handle is None:
+            print("  ❌ 执行出错: 目标无效")
+            return False
+        if not handle.wait():
+            print(f"  ❌ 执行出错: 运动未完成 ({handle.status})")
             return False
             
         return True
@@ -262,6 +245,8 @@ class FullBodyPoseSequence:
 
     def shutdown(self):
         print("\n🔧 停止所有控制...")
+        if self.body:
+            self.body.stop()
         if self.arm_client:
             self.arm_client.stop_control()
             robot_state.reset_arm_state("left")
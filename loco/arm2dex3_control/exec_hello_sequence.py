@@ -4,7 +4,7 @@
 功能：
 - 使用序列配置方式执行打招呼动作
 - 支持灵活编排手臂和灵巧手动作
-- 基于 _current_jpos_des 维护状态
+- 只控制一侧手臂 (set_arm_positions), 不影响另一侧手臂的运动
 """
 import sys
 import time
@@ -95,16 +95,34 @@ class HelloGestureSequence:
             return False
         
         positions = self.arm_poses[pose_name]['positions']
-        offset = 0 if self.arm == 'left' else 7
-        
-        # 基于当前 _current_jpos_des 构建目标
-        target_positions = self.arm_client._current_jpos_des.copy()
-        target_positions[offset:offset+7] = positions
         
         print(f"  ▶️  [ARM] {pose_name}")
         
         try:
-            self.arm_client.set_joint_positions(target_positions, speed_factor=speed_factor)
+            if not self.arm_client.set_arm_positions(self.arm, positions, speed_factor=speed_factor):
+                print(f"  ❌ [ARM] 失败")
+                return False
+            print(f"  ✅ [ARM] 完成")
+            return True
+        except Exception as e:
+            print(f"  ❌ [ARM] 失败: {e}")
+            return False
+    
+    def execute_arm_waypoints(self, pose_names: List[str], speed_factor: float = 1.0) -> bool:
+        """连续执行多个手臂姿态 (路径点之间不停顿, 只在最后一个姿态停下)"""
+        waypoints = []
+        for pose_name in pose_names:
+            if pose_name not in self.arm_poses:
+                print(f"❌ 手臂姿态不存在: {pose_name}")
+                return False
+            waypoints.append(self.arm_poses[pose_name]['positions'])
+        
+        print(f"  ▶️  [ARM] {' -> '.join(pose_names)}")
+        
+        try:
+            if not self.arm_client.execute_waypoints(waypoints, speed_factor=speed_factor, side=self.arm):
+                print(f"  ❌ [ARM] 失败")
+                return False
             print(f"  ✅ [ARM] 完成")
             return True
         except Exception as e:
@@ -167,12 +185,27 @@ class HelloGestureSequence:
                     print(f"\n🔵 执行序列 ({len(sequence)} 步)")
                     print("-"*70)
                     
-                    for i, step in enumerate(sequence, 1):
-                        print(f"[步骤 {i}/{len(sequence)}]", end=" ")
-                        if not self.execute_step(step, speed_factor):
+                    i = 0
+                    while i < len(sequence):
+                        step = sequence[i]
+                        # 连续的手臂步骤合并为一条经过各姿态的连续轨迹, 中间不停顿
+                        count = 1
+                        while (step.get('type') == 'arm' and i + count < len(sequence)
+                               and sequence[i + count].get('type') == 'arm'):
+                            count += 1
+                        
+                        if count > 1:
+                            print(f"[步骤 {i + 1}-{i + count}/{len(sequence)}]", end=" ")
+                            pose_names = [arm_step['pose'] for arm_step in sequence[i:i + count]]
+                            success = self.execute_arm_waypoints(pose_names, speed_factor)
+                        else:
+                            print(f"[步骤 {i + 1}/{len(sequence)}]", end=" ")
+                            success = self.execute_step(step, speed_factor)
+                        if not success:
                             print("❌ 序列执行中断")
                             return False
                         
+                        i += count
                         if i < len(sequence):
                             time.sleep(0.3)  # 步骤间延时
                     
@@ -171,5 +171,11 @@ class AdvancedLocomotionController:
 
     def cleanup(self):
         self.stop()
+        if self.loco_client:
+            # Move 调用的时延分布 / 超时 / 迟到响应统计
+            for api_id, stats in self.loco_client.GetRpcStats()["apis"].items():
+                latency = stats["latency"]
+                logger.info(f"📊 RPC {api_id}: 调用 {latency['count']}, p50 {latency['p50']}s, "
+                            f"p99 {latency['p99']}s, 超时 {stats['timeouts']}, 迟到 {stats['late']}")
         if self.odom_client:
             self.odom_client.print_stats()
\ No newline at end of file
@@ -17,6 +17,9 @@ class RobotStateManager:
     _instance = None
     _lock = threading.Lock()
     
+    # 等待手臂停止完成的余量(秒), 加在 G1ArmClient.estimate_stop_time() 上
+    ARM_STOP_MARGIN = 2.0
+    
     def __new__(cls):
         if cls._instance is None:
             with cls._lock:
@@ -289,16 +292,19 @@ class RobotStateManager:
         success = True
         
         # 停止双臂（只需调用一次，因为只有一个客户端）
+        # 先发出停止 (立即抢占正在执行的运动, 返回句柄), 不在锁后面排队等当前动作做完;
+        # 手臂回到自然位和卸力在控制线程中进行, 与停止双手同时进行
+        arm_stop = None
         if self._arm_client:
-            # 需要同时持有两个锁
-            with self._arm_control_locks['left']:
-                with self._arm_control_locks['right']:
-                    try:
-                        self._arm_client.stop_control()
-                        self._log("✅ 双臂已停止")
-                    except Exception as e:
-                        self._log(f"❌ 双臂停止失败: {e}")
-                        success = False
+            try:
+                arm_deadline = self._arm_stop_deadline()
+                arm_stop = self._arm_client.stop_control(wait=False)
+                if arm_stop is None:
+                    self._log("❌ 双臂停止失败")
+                    success = False
+            except Exception as e:
+                self._log(f"❌ 双臂停止失败: {e}")
+                success = False
         
         # 停止左右手
         for hand in ['left', 'right']:
@@ -312,6 +318,16 @@ class RobotStateManager:
                         self._log(f"❌ {hand.upper()} 手停止失败: {e}")
                         success = False
         
+        # 等待双臂停止完成 (需要同时持有两个锁); 有超时, 控制循环不再运行时不会永远持锁等待
+        if arm_stop is not None:
+            with self._arm_control_locks['left']:
+                with self._arm_control_locks['right']:
+                    if arm_stop.wait(max(0.0, arm_deadline - time.monotonic())):
+                        self._log("✅ 双臂已停止")
+                    else:
+                        self._log_arm_stop_failure("双臂", arm_stop)
+                        success = False
+        
         self.reset_all_states()
         return success
     
@@ -330,21 +346,40 @@ class RobotStateManager:
         
         if self._arm_client:
             lock = self._arm_control_locks[arm]
+            try:
+                # 注意：这会停止整个手臂客户端
+                # 先发出停止 (立即抢占正在执行的运动), 再持锁等待完成 (有超时)
+                arm_deadline = self._arm_stop_deadline()
+                arm_stop = self._arm_client.stop_control(wait=False)
+            except Exception as e:
+                self._log(f"❌ {arm.upper()} 手臂停止失败: {e}")
+                return False
+            if arm_stop is None:
+                self._log(f"❌ {arm.upper()} 手臂停止失败: 未发出")
+                return False
             with lock:
-                try:
-                    # 注意：这会停止整个手臂客户端
-                    self._arm_client.stop_control()
+                if arm_stop.wait(max(0.0, arm_deadline - time.monotonic())):
                     self.is_arm_controlling[arm] = False
                     self._arm_controller_names[arm] = None
                     self._log(f"✅ {arm.upper()} 手臂已停止")
                     return True
-                except Exception as e:
-                    self._log(f"❌ {arm.upper()} 手臂停止失败: {e}")
-                    return False
+            self._log_arm_stop_failure(f"{arm.upper()} 手臂", arm_stop)
+            return False
         else:
             self._log(f"⚠️  手臂客户端未创建")
             return False
     
+    def _arm_stop_deadline(self) -> float:
+        """手臂停止的等待截止时间 (time.monotonic): 预计停止时间 + 余量, 须在 stop_control 之前计算"""
+        return time.monotonic() + self._arm_client.estimate_stop_time() + self.ARM_STOP_MARGIN
+    
+    def _log_arm_stop_failure(self, name: str, arm_stop):
+        if arm_stop.done():
+            self._log(f"❌ {name}停止失败: {arm_stop.status}")
+        else:
+            # 停止仍未完成: 流式控制没有推进 (如外部时钟的控制循环已退出)
+            self._log(f"❌ {name}停止超时 ({arm_stop.status}), 控制循环可能已停止运行")
+    
     def emergency_stop_hand(self, hand: str) -> bool:
         """紧急停止指定手"""
         if hand not in ['left', 'right']:
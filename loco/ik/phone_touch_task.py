@@ -266,12 +266,13 @@ class PhoneTouchController:
             return False
         
         positions = self.arm_poses[pose_name]['positions']
-        target = self.arm_client._current_jpos_des.copy()
-        target[0:7] = positions
         
         print(f"  ▶️  移动手臂到: {pose_name}")
         try:
-            self.arm_client.set_joint_positions(target, speed_factor=speed_factor)
+            # 只控制左臂槽位, 不影响右臂正在执行的运动
+            if not self.arm_client.set_arm_positions('left', positions, speed_factor=speed_factor):
+                print(f"  ❌ 失败")
+                return False
             time.sleep(0.3)
             print(f"  ✅ 完成")
             return True
@@ -281,12 +282,11 @@ class PhoneTouchController:
     
     def move_arm_to_angles(self, joint_angles: List[float], speed_factor: float = 1.0) -> bool:
         """移动手臂到指定关节角度"""
-        target = self.arm_client._current_jpos_des.copy()
-        target[0:7] = joint_angles
-        
         print(f"  ▶️  移动到目标位置")
         try:
-            self.arm_client.set_joint_positions(target, speed_factor=speed_factor)
+            if not self.arm_client.set_arm_positions('left', joint_angles, speed_factor=speed_factor):
+                print(f"  ❌ 失败")
+                return False
             time.sleep(0.3)
             print(f"  ✅ 完成")
             return True
@@ -319,8 +319,8 @@ class PhoneTouchController:
             return False
     
     def adjust_single_joint(self, joint_index: int, delta_rad: float, speed_factor: float = 1.0):
-        """调整单个关节角度"""
-        target = self.arm_client._current_jpos_des.copy()
+        """调整单个关节角度 (左臂, 只占用左臂槽位)"""
+        target = self.arm_client._current_jpos_des[0:7]
         target[joint_index] += delta_rad
         
         joint_names = [
@@ -330,7 +330,7 @@ class PhoneTouchController:
         
         print(f"  🔧 调整 {joint_names[joint_index]}: {delta_rad:+.2f} rad")
         try:
-            self.arm_client.set_joint_positions(target, speed_factor=speed_factor)
+            self.arm_client.set_arm_positions('left', target, speed_factor=speed_factor)
             time.sleep(0.3)
             print(f"  ✅ 完成")
         except Exception as e:
@@ -103,10 +103,10 @@ class GreetingSkill:
                         
                         if step_type == 'arm':
                             positions = self.arm_poses[pose_name]['positions']
-                            offset = 0 if self.arm_side == 'left' else 7
-                            target = self.arm_client._current_jpos_des.copy()
-                            target[offset:offset+7] = positions
-                            self.arm_client.set_joint_positions(target, speed_factor=1.0)
+                            # 只控制本侧手臂槽位, 另一侧手臂的运动不受影响
+                            if not self.arm_client.set_arm_positions(self.arm_side, positions, speed_factor=1.0):
+                                logger.error(f"❌ 手臂动作失败: {pose_name}")
+                                return False
                         
                         elif step_type == 'hand':
                             positions = self.hand_poses[pose_name]['positions']
@@ -1,10 +1,21 @@
-from . import idl, utils, core, rpc, go2, b2
+import importlib
 
+# subpackages are imported on first access (PEP 562)
 __all__ = [
-    "idl"
-    "utils"
+    "idl",
+    "utils",
     "core",
     "rpc",
     "go2",
     "b2",
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
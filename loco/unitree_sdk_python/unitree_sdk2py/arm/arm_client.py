@@ -14,7 +14,14 @@ import math
 from typing import Optional, List, Tuple, Dict, Any
 from dataclasses import dataclass
 
+import numpy as np
+
 from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber, ChannelFactoryInitialize
+from unitree_sdk2py.core.channel_qos import QOS_PROFILE_CONTROL, QOS_PROFILE_STATE
+from unitree_sdk2py.utils.thread import PeriodicTimer, OverrunPolicy, RecurrentThread
+from unitree_sdk2py.utils.joint_history import JointHistory
+from unitree_sdk2py.utils.motion_handle import MotionHandle
+from unitree_sdk2py.utils.trajectory import JointTrajectory, TrajectoryDuration, WaypointTrajectory
 
 
 @dataclass
@@ -30,12 +37,32 @@ class G1ArmConfig:
     control_dt: float = 0.02  # 控制周期 20ms
     max_joint_velocity: float = 0.5  # 最大关节速度 rad/s
     # max_joint_velocity: float = 1.0  # 最大关节速度 rad/s
+    max_joint_acceleration: float = 4.0  # 最大关节加速度 rad/s²
     # weight_rate: float = 0.2  # 权重变化率
-    weight_rate: float = 0.4  # 权重变化率 ,需要修改initialize_arms中的时间为2.5s 
+    weight_rate: float = 0.4  # 权重变化率 (每秒), 0.4 即 2.5s 完成一次 0<->1 过渡
+    
+    # 流式控制: 后台线程按 control_dt 周期发布 rt/arm_sdk (可设 0.002~0.02 即 50~500Hz),
+    # set_joint_positions(wait=False) 立即返回 MotionHandle; 也可随时调用 start_streaming()
+    streaming: bool = False
+    
+    # 轨迹类型: "trapezoid" 梯形速度 / "quintic" 五次多项式(最小冲击) / "step" 旧算法(每周期限幅逼近, 各关节不同时到达)
+    # trapezoid/quintic 按各关节速度/加速度上限算出统一时长, 所有关节同时起停, 整段轨迹预先计算
+    trajectory_profile: str = "trapezoid"
+    
+    # 轨迹规划的逐关节速度/加速度上限 (rad/s, rad/s²), None 时全部取 max_joint_velocity / max_joint_acceleration
+    motion_velocity_limits: List[float] = None
+    motion_acceleration_limits: List[float] = None
     
     # 安全参数
     enable_waist_control: bool = False  # 是否启用腰部控制
     
+    # 状态来源: 共享内存名 (lowstate守护进程, 见 core/lowstate_shm.py), None 则直接订阅 rt/lowstate
+    lowstate_shm_name: Optional[str] = None
+    
+    # 命令/实测关节状态历史 (环形缓冲, 每次发布命令记录一行): 行数, 0 为关闭
+    # 内存固定不随运行时间增长, 30000 行在 50Hz 下约 10 分钟 (14 关节约 10MB), 见 get_tracking_stats()
+    history_size: int = 0
+    
     # 关节限位 (单位: rad) - 基于G1 URDF
     joint_limits: List[Tuple[float, float]] = None
     
@@ -126,6 +153,12 @@ class G1ArmConfig:
                 37.0,  # 腰部侧倾: 37 rad/s
                 37.0,  # 腰部俯仰: 37 rad/s
             ]
+        
+        if self.motion_velocity_limits is None:
+            self.motion_velocity_limits = [self.max_joint_velocity] * 17
+        
+        if self.motion_acceleration_limits is None:
+            self.motion_acceleration_limits = [self.max_joint_acceleration] * 17
 
 
 class JointIndex:
@@ -153,6 +186,134 @@ class JointIndex:
     kNotUsedJoint = 29
 
 
+class _StepMotion:
+    """
+    流式控制中的一次运动 - "step" 轨迹类型:
+    每个周期每个关节最多移动 max_delta, 到达目标且运行满 min_steps 个周期后结束
+    """
+    
+    def __init__(self, handle: MotionHandle, target: np.ndarray, max_delta: float,
+                 min_steps: int = 0, kp: Optional[float] = None, kd: Optional[float] = None):
+        self.handle = handle
+        self.q = None
+        self.dq = None  # 不发送速度前馈
+        self.target = target
+        self.max_delta = max_delta
+        self.min_steps = min_steps
+        self.kp = kp
+        self.kd = kd
+        self.steps = 0
+    
+    def begin(self, q: np.ndarray):
+        """控制线程接收运动时调用, q 为当前期望位置"""
+        self.q = q.copy()
+    
+    def step(self) -> bool:
+        """前进一个周期, 返回是否结束"""
+        diff = self.target - self.q
+        self.q = np.where(np.abs(diff) <= self.max_delta, self.target, self.q + np.sign(diff) * self.max_delta)
+        self.steps += 1
+        return self.steps >= self.min_steps and np.array_equal(self.q, self.target)
+    
+    def remaining(self) -> Optional[int]:
+        """剩余周期数 (尚未接收时为None)"""
+        if self.q is None:
+            return None
+        distance = float(np.max(np.abs(self.target - self.q)))
+        return max(self.min_steps - self.steps, math.ceil(distance / self.max_delta - 1e-9))
+
+
+class _TrajectoryMotion:
+    """
+    流式控制中的一次运动 - "trapezoid"/"quintic" 轨迹类型:
+    接收时从当前期望位置规划整段轨迹, 之后每个周期只取下一个采样点 (位置 + 速度前馈)
+    """
+    
+    def __init__(self, handle: MotionHandle, planner, kp: Optional[float] = None, kd: Optional[float] = None):
+        self.handle = handle
+        self.q = None
+        self.dq = None
+        self.kp = kp
+        self.kd = kd
+        self._planner = planner
+        self._trajectory = None
+        self._index = 0
+    
+    def begin(self, q: np.ndarray):
+        """控制线程接收运动时调用, planner(q) 返回 JointTrajectory / WaypointTrajectory"""
+        self.q = q.copy()
+        self._trajectory = self._planner(self.q)
+    
+    def step(self) -> bool:
+        """前进一个周期, 返回是否结束 (结束后保持在目标位置)"""
+        trajectory = self._trajectory
+        if self._index < len(trajectory):
+            self.q = trajectory.positions[self._index]
+            self.dq = trajectory.velocities[self._index]
+            self._index += 1
+        return self._index >= len(trajectory)
+    
+    def remaining(self) -> Optional[int]:
+        """剩余周期数 (尚未接收时为None)"""
+        if self._trajectory is None:
+            return None
+        return len(self._trajectory) - self._index
+
+
+class _WeightRamp:
+    """
+    流式控制中的一次权重过渡 (initialize_arms / stop_control):
+    每个周期权重向目标变化 delta (发布 weight²), 与手臂运动 motion 同时进行;
+    align=True 时推迟开始, 使权重与 motion 同时到达 (回到自然位的最后一段才卸力)
+    """
+    
+    def __init__(self, handle: MotionHandle, target: float, delta: float, motion=None, align: bool = False):
+        self.handle = handle
+        self.target = target
+        self.delta = delta
+        self.motion = motion
+        self.align = align
+    
+    def step(self, weight: float) -> float:
+        """前进一个周期, 返回新的权重"""
+        if self.align and not self._motion_finished():
+            remaining = self.motion.remaining()
+            if remaining is None or remaining >= math.ceil(abs(self.target - weight) / self.delta - 1e-9):
+                return weight
+        if weight < self.target:
+            return min(self.target, weight + self.delta)
+        return max(self.target, weight - self.delta)
+    
+    def reached(self, weight: float) -> bool:
+        """权重到达目标且运动已结束"""
+        return weight == self.target and self._motion_finished()
+    
+    def status(self) -> str:
+        """到达后的结束状态: align (stop_control) 时只有返回运动本身 done 才算 done"""
+        motion = self.motion
+        if self.align and motion is not None and motion.handle.done() and motion.handle.status != MotionHandle.DONE:
+            return motion.handle.status
+        return MotionHandle.DONE
+    
+    def _motion_finished(self) -> bool:
+        motion = self.motion
+        return motion is None or motion.handle.done() or motion.remaining() == 0
+
+
+class _StreamSlot:
+    """
+    流式控制的一个关节组槽位 (左臂/右臂/腰部): 各自的当前运动、交叉过渡和增益,
+    控制线程每个周期把所有槽位合成一帧 rt/arm_sdk
+    """
+    
+    def __init__(self, name: str, joints: np.ndarray):
+        self.name = name
+        self.joints = joints          # 在手臂关节数组中的索引
+        self.motion = None            # 当前运动 (可同时占用多个槽位)
+        self.blend = None             # [被过渡的旧运动, 已过渡周期数, 总周期数]
+        self.gains = (None, None)     # 当前运动的 kp, kd (None为默认值)
+
+
 class G1ArmClient:
     """
     G1 机器人手臂控制客户端
@@ -166,6 +327,18 @@ class G1ArmClient:
         arm.initialize_arms()  # 初始化到自然位
         arm.set_joint_positions([0.0]*14, duration=3.0)  # 设置关节位置
         arm.stop_control()  # 安全停止
+    
+    initialize_arms() / stop_control() 的权重过渡也由流式控制线程执行 (未启动时自动启动),
+    与回到自然位的运动重叠; wait=False 时立即返回句柄, 可等待或取消。
+    自动启动的流式控制在 stop_control 完成 (权重降到0) 后自动停止; stop_control 之后
+    直到再次 initialize_arms, 新的运动都以 failed 结束, 不会覆盖返回自然位的运动。
+    
+    流式控制 (G1ArmConfig(streaming=True) 或 start_streaming()):
+        一个后台线程按 control_dt 周期独占发布 rt/arm_sdk, 两次运动之间持续保持最后的命令
+        (权重通道不会中断)。set_joint_positions(wait=False) 立即返回 MotionHandle,
+        新目标默认抢占当前运动, blend_time>0 时在该时间内与当前运动交叉过渡。
+        左臂/右臂(/腰部) 各有一个槽位, set_arm_positions() 只占用一侧, 两侧可同时运动,
+        每个周期合成一帧发布。
     """
     
     def __init__(self, interface: str = "eth0", config: Optional[G1ArmConfig] = None):
@@ -177,10 +350,7 @@ class G1ArmClient:
         self._state_topic = "rt/lowstate"   # 状态订阅话题
         self._cmd_publisher: Optional[ChannelPublisher] = None
         self._state_subscriber: Optional[ChannelSubscriber] = None
-        
-        # 状态缓存
-        self._latest_state: Optional[Any] = None
-        self._state_lock = threading.Lock()
+        self._state_view = None  # 共享内存状态 (LowStateView), 启用时代替状态订阅者
         
         # 手臂关节索引 - 与C++版本完全一致
         self._arm_joints = [
@@ -207,6 +377,7 @@ class G1ArmClient:
         self._delta_weight = self.config.weight_rate * self.config.control_dt  # 每步权重变化量
         self._max_joint_delta = self.config.max_joint_velocity * self.config.control_dt  # 每步最大关节变化量
         self._sleep_duration = self.config.control_dt  # 睡眠时长
+        self.last_loop_stats = None  # 最近一次控制循环的定时统计 (超时/抖动/执行时间)
         
         # 预定义位置 - 自然下垂位置 (14自由度)
         self._nature_pos = [
@@ -219,8 +390,59 @@ class G1ArmClient:
         # 当前期望位置状态 - 用于跟踪运动状态，避免位置跳变
         self._current_jpos_des = [0.0] * self.ARM_JOINT_COUNT
         
+        # 速度/力矩限位 (NumPy数组, 每步限位时直接使用, 无需重复构造列表)
+        self._velocity_limits = np.asarray(self.config.velocity_limits[:self.ARM_JOINT_COUNT], dtype=np.float64)
+        self._torque_limits = np.asarray(self.config.torque_limits[:self.ARM_JOINT_COUNT], dtype=np.float64)
+        self._default_velocities = np.clip(
+            np.full(self.ARM_JOINT_COUNT, self.config.default_dq), -self._velocity_limits, self._velocity_limits
+        ).tolist()
+        self._default_torques = np.clip(
+            np.full(self.ARM_JOINT_COUNT, self.config.default_tau_ff), -self._torque_limits, self._torque_limits
+        ).tolist()
+        
+        # 轨迹规划的速度/加速度上限 (速度不超过URDF速度限位)
+        self._motion_velocity_limits = np.minimum(
+            np.asarray(self.config.motion_velocity_limits[:self.ARM_JOINT_COUNT], dtype=np.float64), self._velocity_limits
+        )
+        self._motion_acceleration_limits = np.asarray(
+            self.config.motion_acceleration_limits[:self.ARM_JOINT_COUNT], dtype=np.float64
+        )
+        
+        # 命令/实测历史 (JointHistory), history_size 为 0 时为 None
+        self.history: Optional[JointHistory] = None
+        if self.config.history_size > 0:
+            self.history = JointHistory(self.ARM_JOINT_COUNT, self.config.history_size)
+        self._last_cmd = (None, None)  # 最近一次命令的 (位置, 速度), 发布成功后记入历史
+        
+        # 复用的命令消息 - 静态字段只写一次, 每个周期只更新手臂关节槽位
+        self._arm_cmd = None
+        self._arm_motor_cmds = []
+        self._weight_motor_cmd = None
+        self._build_arm_command()
+        
+        # 流式控制状态 (由 _stream_lock 保护, 控制线程与调用线程共用)
+        self._stream_lock = threading.Lock()
+        self._stream_thread: Optional[RecurrentThread] = None
+        self._stream_external = False    # 外部时钟驱动 (step_stream), 无自有线程
+        self._stream_q = None            # 当前期望位置 (NumPy数组)
+        self._stream_weight = 0.0        # 发布的权重值
+        self._stream_pending = []        # [(运动, 过渡周期数)], 下一个周期接收
+        self._stream_ramp = None         # 当前权重过渡 (_WeightRamp)
+        self._stream_stopping = False    # stop_control 之后拒绝新运动, 直到 initialize_arms
+        self._stream_auto = False        # 流式控制由 initialize_arms/stop_control 自动启动, 停止完成后自动关闭
+        # 命令混合: 左臂/右臂(/腰部) 各一个槽位, 各自运动互不覆盖, 合成一帧发布
+        self._stream_slots = {
+            'left': _StreamSlot('left', np.arange(0, 7)),
+            'right': _StreamSlot('right', np.arange(7, 14)),
+        }
+        if self.config.enable_waist_control:
+            self._stream_slots['waist'] = _StreamSlot('waist', np.arange(14, 17))
+        
         # 初始化DDS连接
         self._init_dds_connection()
+        
+        if self.config.streaming:
+            self.start_streaming()
     
     @staticmethod
     def _clamp(value: float, min_val: float, max_val: float) -> float:
@@ -245,19 +467,34 @@ class G1ArmClient:
             ChannelFactoryInitialize(0, self._interface)
         
         # 初始化命令发布者
-        self._cmd_publisher = ChannelPublisher(self._cmd_topic, LowCmd_)
+        self._cmd_publisher = ChannelPublisher(self._cmd_topic, LowCmd_, QOS_PROFILE_CONTROL)  # 只保留最新指令, 不排队重传
         self._cmd_publisher.Init()
         
-        # 初始化状态订阅者
-        self._state_subscriber = ChannelSubscriber(self._state_topic, LowState_)
-        self._state_subscriber.Init(self._state_callback, 10)
+        # 优先挂接lowstate守护进程的共享内存 (多进程共用一次解码), 不可用时回退到DDS订阅
+        if self.config.lowstate_shm_name:
+            from unitree_sdk2py.core.lowstate_shm import LowStateView
+            view = LowStateView(self.config.lowstate_shm_name)
+            if view.Init():
+                self._state_view = view
+            else:
+                print("[G1Arm] 共享内存状态不可用, 回退到DDS订阅")
         
-        time.sleep(1.0)  # 等待连接稳定
+        # 初始化状态订阅者
+        if self._state_view is None:
+            self._state_subscriber = ChannelSubscriber(self._state_topic, LowState_, QOS_PROFILE_STATE)
+            self._state_subscriber.Init(keepLatest=True, drainLen=16)  # 只保留最新样本, 无额外线程; 积压时一次取完
+        
+        # 等待连接就绪 (命令话题匹配 + 收到首个状态消息), 最多1秒, 代替固定等待
+        deadline = time.monotonic() + 1.0
+        self._cmd_publisher.WaitMatched(1.0)
+        state_source = self._state_view if self._state_view is not None else self._state_subscriber
+        state_source.WaitNewer(0, max(0.0, deadline - time.monotonic()))
     
-    def _state_callback(self, msg):
-        """状态消息回调函数 - 线程安全更新"""
-        with self._state_lock:
-            self._latest_state = msg
+    def _get_latest_state(self):
+        """获取最新状态消息 (尚未收到时返回None; 共享内存模式下为 LowStateSample, 字段访问与 LowState_ 相同)"""
+        state_source = self._state_view if self._state_view is not None else self._state_subscriber
+        latest = state_source.ReadLatest()
+        return latest.sample if latest is not None else None
     
     def _publish_command(self, cmd) -> bool:
         """
@@ -271,49 +508,43 @@ class G1ArmClient:
         """
         try:
             self._cmd_publisher.Write(cmd)
-            return True
         except Exception as e:
             print(f"[G1Arm] 命令发布失败: {e}")
             return False
+        if self.history is not None:
+            self._record_history()
+        return True
     
-    def _create_arm_command(
-        self, positions: List[float], velocities: Optional[List[float]] = None,
-        torques: Optional[List[float]] = None, kp: Optional[float] = None,
-        kd: Optional[float] = None, weight: Optional[float] = None
-    ):
+    def _record_history(self):
+        """记录一行历史: 刚发布的命令 + 当前最新实测状态 (尚无状态时只记命令)"""
+        now = time.monotonic()
+        positions, velocities = self._last_cmd
+        state_source = self._state_view if self._state_view is not None else self._state_subscriber
+        latest = state_source.ReadLatest()
+        arm_state = self._arm_state_of(latest.sample) if latest is not None else None
+        if arm_state is not None:
+            self.history.Add(now, positions, velocities, arm_state['q'], arm_state['dq'], arm_state['tau_est'],
+                             arm_state['temperature'], latest.timestamp)
+            return
+        self.history.Add(now, positions, velocities)
+    
+    def _build_arm_command(self):
         """
-        创建手臂控制命令 - 基于官方LowCmd_结构
-        
-        参数:
-            positions: 关节目标位置 (rad)
-            velocities: 关节目标速度 (rad/s)
-            torques: 前馈扭矩 (N·m)
-            kp: 位置增益
-            kd: 速度增益
-            weight: 控制权重 (0~1)
+        构建复用的 LowCmd_ 命令对象 (只在初始化时调用一次)
         
-        返回:
-            LowCmd_ 消息对象
+        静态字段在这里写好, 之后每个控制周期不再重复创建:
+        - 未使用的电机: mode=0, 全部清零
+        - kNotUsedJoint(29): 权重控制通道, mode=1
+        - kWaistYaw: 固定在0位 (kp=60, kd=1.5)
+        - 手臂关节: mode=1
         """
         from unitree_sdk2py.idl.unitree_hg.msg.dds_ import LowCmd_, MotorCmd_
         
-        # 参数默认值处理
-        velocities = velocities or [self.config.default_dq] * self.ARM_JOINT_COUNT
-        torques = torques or [self.config.default_tau_ff] * self.ARM_JOINT_COUNT
-        kp = kp if kp is not None else self.config.default_kp
-        kd = kd if kd is not None else self.config.default_kd
-        weight = weight if weight is not None else self._weight
-        
-        # 🆕 安全限位检查
-        velocities = self._clamp_velocities(velocities)
-        torques = self._clamp_torques(torques)
-        
         # 创建35个电机命令数组 (G1机器人总电机数)
         motor_cmds = [MotorCmd_(mode=0, q=0.0, dq=0.0, tau=0.0, kp=0.0, kd=0.0, reserve=0) for _ in range(35)]
         
         # 设置权重 - 使用 kNotUsedJoint(29) 作为权重控制通道
         motor_cmds[JointIndex.kNotUsedJoint].mode = 1
-        motor_cmds[JointIndex.kNotUsedJoint].q = float(weight)
         
         # 🆕 固定腰部偏航关节到0位
         motor_cmds[JointIndex.kWaistYaw].mode = 1  # 使能模式
@@ -323,16 +554,61 @@ class G1ArmClient:
         motor_cmds[JointIndex.kWaistYaw].kp = 60.0 # 位置增益 (较高的刚度保持固定)
         motor_cmds[JointIndex.kWaistYaw].kd = 1.5  # 速度增益
         
-        # 设置手臂关节命令
-        for i, joint_idx in enumerate(self._arm_joints):
-            motor_cmds[joint_idx].mode = 1  # 使能模式
-            motor_cmds[joint_idx].q = float(positions[i])      # 目标位置
-            motor_cmds[joint_idx].dq = float(velocities[i])    # 目标速度
-            motor_cmds[joint_idx].tau = float(torques[i])      # 前馈扭矩
-            motor_cmds[joint_idx].kp = float(kp)               # 位置增益
-            motor_cmds[joint_idx].kd = float(kd)               # 速度增益
+        # 手臂关节使能 (启用腰部控制时腰部关节也在其中)
+        for joint_idx in self._arm_joints:
+            motor_cmds[joint_idx].mode = 1
+        
+        self._arm_cmd = LowCmd_(mode_pr=0, mode_machine=0, motor_cmd=motor_cmds, reserve=[0]*4, crc=0)
+        self._arm_motor_cmds = [motor_cmds[joint_idx] for joint_idx in self._arm_joints]
+        self._weight_motor_cmd = motor_cmds[JointIndex.kNotUsedJoint]
+    
+    def _create_arm_command(
+        self, positions: List[float], velocities: Optional[List[float]] = None,
+        torques: Optional[List[float]] = None, kp: Optional[float] = None,
+        kd: Optional[float] = None, weight: Optional[float] = None
+    ):
+        """
+        更新手臂控制命令 - 基于官方LowCmd_结构
         
-        return LowCmd_(mode_pr=0, mode_machine=0, motor_cmd=motor_cmds, reserve=[0]*4, crc=0)
+        不再每次新建 LowCmd_/MotorCmd_, 而是复用 _build_arm_command 构建的对象,
+        只更新权重通道和 14/17 个手臂关节槽位。返回的始终是同一个消息对象,
+        调用方应在下一次调用前发布它。
+        
+        参数:
+            positions: 关节目标位置 (rad), 列表或NumPy数组
+            velocities: 关节目标速度 (rad/s)
+            torques: 前馈扭矩 (N·m)
+            kp: 位置增益 (单个值或逐关节数组)
+            kd: 速度增益 (单个值或逐关节数组)
+            weight: 控制权重 (0~1)
+        
+        返回:
+            LowCmd_ 消息对象
+        """
+        kp = self.config.default_kp if kp is None else kp
+        kd = self.config.default_kd if kd is None else kd
+        kps = [float(kp)] * self.ARM_JOINT_COUNT if isinstance(kp, (int, float)) else np.asarray(kp, dtype=np.float64).tolist()
+        kds = [float(kd)] * self.ARM_JOINT_COUNT if isinstance(kd, (int, float)) else np.asarray(kd, dtype=np.float64).tolist()
+        weight = weight if weight is not None else self._weight
+        
+        # 🆕 安全限位检查 (默认值已在初始化时限位)
+        velocities = self._default_velocities if velocities is None else self._clamp_velocities(velocities)
+        torques = self._default_torques if torques is None else self._clamp_torques(torques)
+        positions = np.asarray(positions, dtype=np.float64).tolist()
+        self._last_cmd = (positions, velocities)
+        
+        # 设置权重
+        self._weight_motor_cmd.q = float(weight)
+        
+        # 设置手臂关节命令
+        for motor_cmd, q, dq, tau, joint_kp, joint_kd in zip(self._arm_motor_cmds, positions, velocities, torques, kps, kds):
+            motor_cmd.q = q            # 目标位置
+            motor_cmd.dq = dq          # 目标速度
+            motor_cmd.tau = tau        # 前馈扭矩
+            motor_cmd.kp = joint_kp    # 位置增益
+            motor_cmd.kd = joint_kd    # 速度增益
+        
+        return self._arm_cmd
     
     # 🆕 添加安全限位方法
     def _clamp_velocities(self, velocities: List[float]) -> List[float]:
@@ -345,11 +621,8 @@ class G1ArmClient:
         返回:
             限制后的速度列表
         """
-        limits = self.config.velocity_limits[:self.ARM_JOINT_COUNT]
-        return [
-            self._clamp(vel, -limit, limit)
-            for vel, limit in zip(velocities, limits)
-        ]
+        velocities = np.asarray(velocities, dtype=np.float64)
+        return np.clip(velocities, -self._velocity_limits, self._velocity_limits).tolist()
     
     def _clamp_torques(self, torques: List[float]) -> List[float]:
         """
@@ -361,11 +634,8 @@ class G1ArmClient:
         返回:
             限制后的力矩列表
         """
-        limits = self.config.torque_limits[:self.ARM_JOINT_COUNT]
-        return [
-            self._clamp(tau, -limit, limit)
-            for tau, limit in zip(torques, limits)
-        ]
+        torques = np.asarray(torques, dtype=np.float64)
+        return np.clip(torques, -self._torque_limits, self._torque_limits).tolist()
     
     def get_safety_limits(self) -> Dict[str, Any]:
         """
@@ -384,12 +654,17 @@ class G1ArmClient:
     
     def smooth_transition(
         self, start_positions: Optional[List[float]], target_positions: List[float],
-        duration: float, description: str = ""
+        duration: Optional[float], description: str = "", speed_factor: float = 1.0
     ) -> bool:
         """
         平滑过渡到目标位置
         
-        使用与C++例程相同的控制算法:
+        trajectory_profile 为 "trapezoid"/"quintic" 时 (默认):
+        1. 按各关节速度/加速度上限算出统一时长, 所有关节同时起停 (关节空间直线)
+        2. 整段轨迹 (位置 + 速度前馈) 预先向量化计算, 每个周期只取一个采样点
+        3. duration 小于最短时长时按最短时长执行, 不会超限
+        
+        trajectory_profile 为 "step" 时使用与C++例程相同的控制算法:
         1. 通过 _current_jpos_des 跟踪当前期望位置
         2. 每步限制最大变化量 (防止速度过快)
         3. 逐步趋向目标位置
@@ -397,8 +672,9 @@ class G1ArmClient:
         参数:
             start_positions: 起始位置 (None表示使用当前_current_jpos_des)
             target_positions: 目标位置
-            duration: 过渡时长(秒)
+            duration: 过渡时长(秒), None表示自动计算 (轨迹允许的最短时长, "step"类型同 set_joint_positions)
             description: 描述信息 (用于日志输出)
+            speed_factor: 速度因子, 缩放速度上限 (加速度按平方缩放)
         
         返回:
             bool: 是否成功
@@ -406,139 +682,193 @@ class G1ArmClient:
         if description:
             print(f"[G1Arm] {description}...")
         
-        time_steps = int(duration / self.config.control_dt)
+        # 流式控制: 交给控制线程执行并等待结束
+        if self.is_streaming():
+            motion = self._new_motion(target_positions, duration, speed_factor)
+            success = self._submit_motion(motion, start_positions).wait()
+            if description and success:
+                print(f"[G1Arm] {description}完成")
+            return success
         
         # 只有明确提供 start_positions 时才更新
         if start_positions is not None:
             self._current_jpos_des = start_positions.copy()
         # 否则保持使用当前的 _current_jpos_des
         
-        start_time = time.time()
-        for i in range(time_steps):
-            # 更新期望位置 - 限制每步的最大变化量
-            for j in range(len(self._current_jpos_des)):
-                delta = target_positions[j] - self._current_jpos_des[j]
-                delta = self._clamp(delta, -self._max_joint_delta, self._max_joint_delta)
-                self._current_jpos_des[j] += delta
-            
-            # 创建并发布命令
-            cmd = self._create_arm_command(self._current_jpos_des)
-            if not self._publish_command(cmd):
+        # timerfd 定时 - 无累积误差, 超时的周期立即补发 (CATCH_UP), 统计见 self.last_loop_stats
+        if self.config.trajectory_profile != "step":
+            trajectory = self._plan_trajectory(self._current_jpos_des, target_positions, duration, speed_factor)
+            if not self._play_trajectory(trajectory):
                 return False
             
-            # 精确延时 - 防止累积误差
-            expected_time = start_time + (i + 1) * self._sleep_duration
-            sleep_time = expected_time - time.time()
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+            if description:
+                print(f"[G1Arm] {description}完成")
+            return True
+        
+        if duration is None:
+            duration = self._step_duration(self._current_jpos_des, target_positions, speed_factor)
+        time_steps = int(duration / self.config.control_dt)
+        with PeriodicTimer(self._sleep_duration, OverrunPolicy.CATCH_UP) as timer:
+            for i in range(time_steps):
+                # 更新期望位置 - 限制每步的最大变化量
+                for j in range(len(self._current_jpos_des)):
+                    delta = target_positions[j] - self._current_jpos_des[j]
+                    delta = self._clamp(delta, -self._max_joint_delta, self._max_joint_delta)
+                    self._current_jpos_des[j] += delta
+                
+                # 创建并发布命令
+                if not self._send_arm_command(self._current_jpos_des):
+                    return False
+                
+                timer.Wait()
+        self.last_loop_stats = timer.GetStats()
         
         if description:
             print(f"[G1Arm] {description}完成")
         return True
     
-    def initialize_arms(self) -> bool:
+    def _step_duration(self, start_positions, target_positions, speed_factor: float = 1.0) -> float:
+        """"step" 轨迹类型的自动时长: 按每步最大变化量所需步数, 加余量和速度因子, 最短0.5秒"""
+        max_delta = max(abs(target - start) for start, target in zip(start_positions, target_positions))
+        required_steps = math.ceil(max_delta / self._max_joint_delta)
+        base_duration = required_steps * self.config.control_dt
+        duration = base_duration * 1.1 / speed_factor  # 20%余量 + 速度因子
+        return max(duration, 0.5)  # 最小0.5秒
+    
+    def _plan_trajectory(
+        self, start_positions, target_positions, duration: Optional[float] = None, speed_factor: float = 1.0,
+        joints: Optional[np.ndarray] = None
+    ) -> JointTrajectory:
+        """
+        按 trajectory_profile 规划同步轨迹, 速度上限乘 speed_factor, 加速度上限乘 speed_factor²
+        joints: 只规划部分关节时的关节索引 (单臂槽位), None 为全部
+        """
+        velocity_limits = self._motion_velocity_limits if joints is None else self._motion_velocity_limits[joints]
+        acceleration_limits = (self._motion_acceleration_limits if joints is None
+                               else self._motion_acceleration_limits[joints])
+        return JointTrajectory(
+            start_positions, target_positions,
+            velocity_limits * speed_factor,
+            acceleration_limits * (speed_factor * speed_factor),
+            self.config.control_dt, self.config.trajectory_profile, duration
+        )
+    
+    def _plan_waypoints(
+        self, start_positions, waypoints, blend_radius=None, durations=None, speed_factor: float = 1.0,
+        joints: Optional[np.ndarray] = None
+    ) -> WaypointTrajectory:
+        """从 start_positions 经过各路径点的连续轨迹, 速度/加速度上限缩放和 joints 同 _plan_trajectory"""
+        if blend_radius is not None and np.ndim(blend_radius) > 0:
+            blend_radius = [0.0] + list(blend_radius)  # 起点不是过渡点
+        velocity_limits = self._motion_velocity_limits if joints is None else self._motion_velocity_limits[joints]
+        acceleration_limits = (self._motion_acceleration_limits if joints is None
+                               else self._motion_acceleration_limits[joints])
+        return WaypointTrajectory(
+            [start_positions] + list(waypoints),
+            velocity_limits * speed_factor,
+            acceleration_limits * (speed_factor * speed_factor),
+            self.config.control_dt, blend_radius, durations
+        )
+    
+    def _play_trajectory(self, trajectory) -> bool:
+        """阻塞式逐周期发布预先计算的轨迹 (位置 + 速度前馈)"""
+        # timerfd 定时 - 无累积误差, 超时的周期立即补发 (CATCH_UP), 统计见 self.last_loop_stats
+        with PeriodicTimer(self._sleep_duration, OverrunPolicy.CATCH_UP) as timer:
+            for positions, velocities in zip(trajectory.positions, trajectory.velocities):
+                self._current_jpos_des = positions.tolist()
+                if not self._send_arm_command(positions, velocities=velocities):
+                    return False
+                timer.Wait()
+        self.last_loop_stats = timer.GetStats()
+        return True
+    
+    def initialize_arms(self, wait: bool = True):
         """
         初始化手臂到自然位置
         
-        使用权重过渡算法:
-        1. 逐步增加权重从 0 到 1 (5秒过渡)
-        2. 同时进行位置插值到自然位置
+        使用权重过渡算法 (由流式控制线程执行, 未启动时自动启动):
+        1. 逐步增加权重从当前值到 1 (weight_rate, 默认2.5秒)
+        2. 同时以同步轨迹运动到自然位置 (不短于权重过渡时间)
         3. 权重使用 weight² 的平方关系 (平滑加速)
         
+        参数:
+            wait: False时立即返回 MotionHandle, 权重到达1且到达自然位后 done, cancel() 停在当前权重和位置
+        
         返回:
-            bool: 是否成功
+            bool: 是否成功; wait=False 时返回 MotionHandle (读取状态失败时为None)
         """
         # 获取当前关节位置
         current_positions = self.get_current_joint_positions()
         if current_positions is None:
-            return False
-        
-        self._current_jpos_des = current_positions.copy()
-        
-        # init_time = 5.0  # 初始化时间 5秒
-        init_time = 2.5  # 初始化时间 5秒
-        time_steps = int(init_time / self.config.control_dt)
-        self._weight = 0.0
-        
-        start_time = time.time()
-        for i in range(time_steps):
-            # 逐步增加权重
-            self._weight += self._delta_weight
-            self._weight = self._clamp(self._weight, 0.0, 1.0)
-            
-            # 计算过渡位置 - 线性插值
-            phase = 1.0 if i == time_steps - 1 else float(i) / time_steps
-            transition_positions = [
-                self._nature_pos[j] * phase + current_positions[j] * (1 - phase)
-                for j in range(self.ARM_JOINT_COUNT)
-            ]
-            
-            self._current_jpos_des = transition_positions.copy()
-            
-            # 创建并发布命令 (权重使用平方关系)
-            cmd = self._create_arm_command(transition_positions, weight=self._weight * self._weight)
-            if not self._publish_command(cmd):
-                return False
-            
-            # 精确延时
-            expected_time = start_time + (i + 1) * self._sleep_duration
-            sleep_time = expected_time - time.time()
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-        
-        # 确保权重达到 1.0
-        while self._weight < 1.0:
-            self._weight += self._delta_weight
-            self._weight = self._clamp(self._weight, 0.0, 1.0)
-            cmd = self._create_arm_command(self._nature_pos, weight=self._weight * self._weight)
-            if not self._publish_command(cmd):
-                return False
-            self._current_jpos_des = self._nature_pos.copy()
-            time.sleep(self._sleep_duration)
-        
-        return True
+            return False if wait else None
+        
+        # 权重为0时手臂不受控制, 从实测位置开始; 否则 (如卸力过程中) 从当前期望位置继续
+        start_positions = current_positions if self._weight == 0.0 else None
+        if not self.is_streaming():
+            if start_positions is not None:
+                self._current_jpos_des = start_positions.copy()
+            if not self.start_streaming():
+                return False if wait else None
+            self._stream_auto = True
+        self._stream_stopping = False
+        
+        ramp_time = math.ceil((1.0 - self._weight) / self._delta_weight - 1e-9) * self.config.control_dt
+        motion = self._new_motion(self._nature_pos, ramp_time)
+        self._submit_motion(motion, start_positions)
+        handle = self._submit_ramp(1.0, motion)
+        return handle.wait() if wait else handle
     
-    def stop_control(self) -> bool:
+    def stop_control(self, wait: bool = True):
         """
         停止控制并恢复到自然位置
         
-        🆕 使用 set_joint_positions 实现,自动计算时间
+        立即抢占当前运动, 以自动计算时间的同步轨迹返回自然位; 权重过渡 (降到0) 与返回运动
+        重叠, 推迟到与返回运动同时结束, 总时间约为二者中较长的一个而不是二者之和。
+        返回运动不能被抢占: 之后直到 initialize_arms, 新的运动都以 failed 结束。
+        流式控制由 initialize_arms/stop_control 自动启动时, 完成后自动停止。
+        
+        参数:
+            wait: False时立即返回 MotionHandle (紧急停止用), 返回自然位且权重降到0后 done,
+                  cancel() 停在当前权重和位置
         
         返回:
-            bool: 是否成功
+            bool: 是否成功; wait=False 时返回 MotionHandle (启动流式控制失败时为None)
         """
         print("[G1Arm] 停止控制...")
         
-        # 🎯 直接使用 set_joint_positions,自动计算返回时间
-        # 优势:
-        # 1. 自动计算最优时间 (基于实际位置差)
-        # 2. 复用现有逻辑,代码更简洁
-        # 3. 保持一致的控制行为
-        success = self.set_joint_positions(
-            self._nature_pos,
-            duration=None,  # 自动计算
-            speed_factor=1.0
-        )
-        
-        if not success:
-            print("[G1Arm] 返回自然位失败")
-            return False
-        
-        # 逐步降低权重到 0
-        while self._weight > 0.0:
-            self._weight -= self._delta_weight
-            self._weight = self._clamp(self._weight, 0.0, 1.0)
-            cmd = self._create_arm_command(
-                self._nature_pos, 
-                weight=self._weight * self._weight
+        if not self.is_streaming():
+            if not self.start_streaming():
+                print("[G1Arm] 返回自然位失败")
+                return False if wait else None
+            self._stream_auto = True
+        
+        motion = self._new_motion(self._nature_pos, None)
+        self._submit_motion(motion, stopping=True)
+        handle = self._submit_ramp(0.0, motion, align=True)
+        handle.add_done_callback(self._on_stop_done)
+        return handle.wait() if wait else handle
+    
+    def estimate_stop_time(self) -> float:
+        """
+        stop_control 从当前状态完成所需时间的上界(秒): 返回自然位的轨迹时长 + 权重降到0的时长
+        (二者实际重叠进行), 用于给等待停止完成设置超时
+        """
+        ramp_time = math.ceil(self._weight / self._delta_weight - 1e-9) * self.config.control_dt
+        if self.config.trajectory_profile == "step":
+            return_time = self._step_duration(self._current_jpos_des, self._nature_pos)
+        else:
+            return_time = TrajectoryDuration(
+                np.asarray(self._nature_pos) - np.asarray(self._current_jpos_des),
+                self._motion_velocity_limits, self._motion_acceleration_limits, self.config.trajectory_profile
             )
-            if not self._publish_command(cmd):
-                return False
-            self._current_jpos_des = self._nature_pos.copy()
-            time.sleep(self._sleep_duration)
-        
-        print("[G1Arm] 控制已停止")
-        return True
+        return return_time + ramp_time
+    
+    @staticmethod
+    def _on_stop_done(handle: MotionHandle):
+        if handle.status == MotionHandle.DONE:
+            print("[G1Arm] 控制已停止")
+        else:
+            print(f"[G1Arm] 停止未完成 ({handle.status})")
     
     def set_joint_positions(
         self, 
@@ -546,8 +876,10 @@ class G1ArmClient:
         duration: Optional[float] = None,
         speed_factor: float = 1.0,
         kp: Optional[float] = None, 
-        kd: Optional[float] = None
-    ) -> bool:
+        kd: Optional[float] = None,
+        wait: bool = True,
+        blend_time: float = 0.0
+    ):
         """
         设置关节位置 - 智能时间控制
         
@@ -555,11 +887,13 @@ class G1ArmClient:
             positions: 关节位置列表（弧度）
             duration: 执行时间(秒) - None时自动计算
             speed_factor: 速度因子 (>1加快, <1减慢)
-            kp: 位置增益 (可选)
-            kd: 速度增益 (可选)
+            kp: 位置增益 (可选, 仅流式控制生效)
+            kd: 速度增益 (可选, 仅流式控制生效)
+            wait: False时立即返回 MotionHandle (未启动流式控制时自动启动)
+            blend_time: 流式控制下与当前运动的交叉过渡时间(秒), 0为直接抢占
         
         返回:
-            bool: 是否成功
+            bool: 是否成功; wait=False 时返回 MotionHandle (参数错误时为None)
         
         示例:
             # 自动计算时间
@@ -570,10 +904,14 @@ class G1ArmClient:
             
             # 2倍速执行
             arm.set_joint_positions(pose, speed_factor=2.0)
+            
+            # 不阻塞, 稍后等待
+            handle = arm.set_joint_positions(pose, wait=False)
+            handle.wait()
         """
         if len(positions) != self.ARM_JOINT_COUNT:
             print(f"[G1Arm] 错误: 位置数量({len(positions)})与关节数({self.ARM_JOINT_COUNT})不匹配")
-            return False
+            return False if wait else None
         
         # 关节限位检查
         limits = self.config.joint_limits[:self.ARM_JOINT_COUNT]
@@ -583,21 +921,507 @@ class G1ArmClient:
         ]
         
         # 🎯 智能计算时间（自包含，无需额外函数）
-        if duration is None:
+        if duration is None and self.config.trajectory_profile != "step":
+            # 同步轨迹: 由速度/加速度上限得到最短时长 (开始执行时按实际起点重新规划)
+            delta = np.asarray(clamped_positions) - np.asarray(self._current_jpos_des)
+            estimate = TrajectoryDuration(
+                delta, self._motion_velocity_limits * speed_factor,
+                self._motion_acceleration_limits * (speed_factor * speed_factor), self.config.trajectory_profile
+            )
+            print(f"[G1Arm] 自动时间: {estimate:.2f}s "
+                  f"(Δ={np.max(np.abs(delta)):.3f}rad, 速度={speed_factor}x, {self.config.trajectory_profile})")
+        elif duration is None:
             max_delta = max(
                 abs(clamped_positions[i] - self._current_jpos_des[i])
                 for i in range(len(self._current_jpos_des))
             )
-            
-            required_steps = math.ceil(max_delta / self._max_joint_delta)
-            base_duration = required_steps * self.config.control_dt
-            duration = base_duration * 1.1 / speed_factor  # 20%余量 + 速度因子
-            duration = max(duration, 0.5)  # 最小0.5秒
+            duration = self._step_duration(self._current_jpos_des, clamped_positions, speed_factor)
             
             print(f"[G1Arm] 自动时间: {duration:.2f}s "
                   f"(Δ={max_delta:.3f}rad, 速度={speed_factor}x)")
         
-        return self.smooth_transition(None, clamped_positions, duration, "")
+        if wait and not self.is_streaming():
+            return self.smooth_transition(None, clamped_positions, duration, "", speed_factor)
+        
+        if not self.is_streaming() and not self.start_streaming():
+            return None
+        motion = self._new_motion(clamped_positions, duration, speed_factor, kp, kd)
+        handle = self._submit_motion(motion, None, blend_time)
+        return handle.wait() if wait else handle
+    
+    def set_arm_positions(
+        self,
+        side: str,
+        positions: List[float],
+        duration: Optional[float] = None,
+        speed_factor: float = 1.0,
+        kp: Optional[float] = None,
+        kd: Optional[float] = None,
+        wait: bool = True,
+        blend_time: float = 0.0
+    ):
+        """
+        单独控制一侧手臂 (或腰部) - 通过流式控制的命令混合
+        
+        左臂/右臂/腰部各有一个槽位, 控制线程每个周期把各槽位的期望位置合成一帧
+        rt/arm_sdk 发布: 两侧可以由不同的调用方同时控制, 互不覆盖, 也不增加DDS流量。
+        新目标只抢占同一槽位上的运动 (set_joint_positions 的14关节运动占用左右两个槽位)。
+        未启动流式控制时自动启动。
+        
+        参数:
+            side: 'left' / 'right' / 'waist' (需要 enable_waist_control)
+            positions: 该侧关节位置 (手臂7个, 腰部3个, 弧度)
+            duration, speed_factor, kp, kd, wait, blend_time: 同 set_joint_positions
+        
+        返回:
+            bool: 是否成功; wait=False 时返回 MotionHandle (参数错误时为None)
+        
+        示例:
+            # 右臂挥手的同时左臂执行其他任务
+            wave = arm.set_arm_positions('right', wave_pose, wait=False)
+            arm.set_arm_positions('left', press_pose)
+            wave.wait()
+        """
+        slot = self._stream_slots.get(side)
+        if slot is None:
+            print(f"[G1Arm] 错误: 未知的槽位 {side} (可用: {list(self._stream_slots)})")
+            return False if wait else None
+        if len(positions) != len(slot.joints):
+            print(f"[G1Arm] 错误: 位置数量({len(positions)})与{side}关节数({len(slot.joints)})不匹配")
+            return False if wait else None
+        
+        limits = [self.config.joint_limits[i] for i in slot.joints]
+        clamped_positions = [
+            max(min_val, min(max_val, pos))
+            for pos, (min_val, max_val) in zip(positions, limits)
+        ]
+        
+        if not self.is_streaming() and not self.start_streaming():
+            return False if wait else None
+        motion = self._new_motion(clamped_positions, duration, speed_factor, kp, kd, slots=[side])
+        handle = self._submit_motion(motion, None, blend_time)
+        return handle.wait() if wait else handle
+    
+    def execute_waypoints(
+        self,
+        waypoints: List[List[float]],
+        blend_radius=None,
+        durations: Optional[List[float]] = None,
+        speed_factor: float = 1.0,
+        kp: Optional[float] = None,
+        kd: Optional[float] = None,
+        wait: bool = True,
+        blend_time: float = 0.0,
+        side: Optional[str] = None
+    ):
+        """
+        连续经过多个路径点 - 中间点不停顿
+        
+        各段匀速, 在路径点附近以恒定加速度过渡到下一段速度 (抛物线过渡), 只有关节
+        需要反向时才减速; 所有关节同步, 起点和终点静止且精确到达。中间点会被
+        "切角", 偏差由 blend_radius 限制。比逐个 set_joint_positions (每点停一次) 更快更平滑。
+        
+        参数:
+            waypoints: 路径点列表, 每个为 14 个关节位置 (弧度); 给出 side 时为该侧关节位置
+            blend_radius: 中间点最大偏差(弧度), 单个值或每个路径点一个值;
+                          0 表示在该点停下并精确到达; None 不限制 (终点总是精确到达)
+            durations: 每段最短时长(秒) (可选), 不会快于速度/加速度上限
+            speed_factor: 速度因子, 缩放速度上限 (加速度按平方缩放)
+            kp, kd, wait, blend_time: 同 set_joint_positions
+            side: 'left' / 'right' / 'waist' 时只占用该侧槽位 (同 set_arm_positions, 使用流式控制),
+                  None 为全部关节
+        
+        返回:
+            bool: 是否成功; wait=False 时返回 MotionHandle (参数错误时为None)
+        
+        示例:
+            arm.execute_waypoints([wave_left, wave_right, wave_left], blend_radius=0.05)
+            arm.execute_waypoints([wave_1, wave_2], side='right')
+        """
+        joints = None
+        if side is not None:
+            slot = self._stream_slots.get(side)
+            if slot is None:
+                print(f"[G1Arm] 错误: 未知的槽位 {side} (可用: {list(self._stream_slots)})")
+                return False if wait else None
+            joints = slot.joints
+        limits = [self.config.joint_limits[i] for i in (range(self.ARM_JOINT_COUNT) if joints is None else joints)]
+        joint_count = len(limits)
+        clamped_waypoints = []
+        for positions in waypoints:
+            if len(positions) != joint_count:
+                print(f"[G1Arm] 错误: 位置数量({len(positions)})与关节数({joint_count})不匹配")
+                return False if wait else None
+            clamped_waypoints.append([
+                max(min_val, min(max_val, pos))
+                for pos, (min_val, max_val) in zip(positions, limits)
+            ])
+        if not clamped_waypoints:
+            return True if wait else None
+        
+        if wait and side is None and not self.is_streaming():
+            trajectory = self._plan_waypoints(self._current_jpos_des, clamped_waypoints, blend_radius,
+                                              durations, speed_factor)
+            print(f"[G1Arm] 路径点: {len(clamped_waypoints)}个, 时长 {trajectory.duration:.2f}s")
+            return self._play_trajectory(trajectory)
+        
+        if not self.is_streaming() and not self.start_streaming():
+            return None
+        planner = lambda q: self._plan_waypoints(q, clamped_waypoints, blend_radius, durations, speed_factor, joints)
+        handle = MotionHandle(clamped_waypoints[-1], self._cancel_motion)
+        motion = self._bind_slots(_TrajectoryMotion(handle, planner, kp, kd), None if side is None else [side])
+        handle = self._submit_motion(motion, None, blend_time)
+        return handle.wait() if wait else handle
+    
+    # ==================== 流式控制 ====================
+    
+    def start_streaming(self, external: bool = False) -> bool:
+        """
+        启动流式控制线程: 按 control_dt 周期发布当前命令, 从 _current_jpos_des 和当前权重开始保持
+        
+        参数:
+            external: True 时不启动线程, 由调用方 (如 WholeBodyController) 每个周期调用 step_stream(),
+                      与其他发布者在同一个控制循环中发布
+        
+        返回:
+            bool: 是否成功 (已启动也返回True)
+        """
+        with self._stream_lock:
+            if self.is_streaming():
+                return True
+            self._stream_q = np.asarray(self._current_jpos_des, dtype=np.float64)
+            self._stream_weight = self._weight * self._weight
+            self._reset_stream_gains()
+            if external:
+                self._stream_external = True
+            else:
+                # 超时的周期直接跳过 (SKIP), 不连续补发旧命令
+                self._stream_thread = RecurrentThread(self.config.control_dt, target=self._stream_tick,
+                                                      name="g1_arm_stream", policy=OverrunPolicy.SKIP)
+                self._stream_thread.Start()
+        print(f"[G1Arm] 流式控制已启动 ({1.0 / self.config.control_dt:.0f}Hz{', 外部时钟' if external else ''})")
+        return True
+    
+    def stop_streaming(self, timeout: float = 1.0) -> bool:
+        """
+        停止流式控制线程, 未完成的运动以 failed 结束; 之后恢复为阻塞式控制
+        
+        参数:
+            timeout: 等待线程退出的超时时间(秒)
+        
+        返回:
+            bool: 是否成功
+        """
+        thread = self._stream_thread
+        if not self.is_streaming():
+            return True
+        if thread is not None:
+            # 在控制线程自身中调用 (如结束回调) 时只通知退出, 不等待
+            thread.Wait(0.0 if thread.GetId() == threading.get_ident() else timeout)
+        with self._stream_lock:
+            self._stream_thread = None
+            self._stream_external = False
+            self._stream_auto = False
+            if thread is not None:
+                self.last_loop_stats = thread.GetStats()
+            aborted = self._take_stream_motions()
+        self._finish_handles(aborted, MotionHandle.FAILED)
+        print("[G1Arm] 流式控制已停止")
+        return True
+    
+    def is_streaming(self) -> bool:
+        """流式控制是否在运行 (自有线程或外部时钟)"""
+        return self._stream_thread is not None or self._stream_external
+    
+    def step_stream(self):
+        """外部时钟模式 (start_streaming(external=True)) 下每个控制周期调用一次: 推进运动并发布一帧"""
+        self._stream_tick()
+    
+    def _new_motion(
+        self, target_positions: List[float], duration: Optional[float], speed_factor: float = 1.0,
+        kp: Optional[float] = None, kd: Optional[float] = None, slots: Optional[List[str]] = None
+    ):
+        """按 trajectory_profile 创建流式控制的运动 (含句柄), slots 为占用的槽位 (None为全部)"""
+        handle = MotionHandle(list(target_positions), self._cancel_motion)
+        joints = self._slot_joints(slots)
+        if self.config.trajectory_profile == "step":
+            min_steps = int(duration / self.config.control_dt) if duration is not None else 0
+            motion = _StepMotion(handle, np.asarray(target_positions, dtype=np.float64), self._max_joint_delta,
+                                 min_steps, kp, kd)
+        else:
+            planner = lambda q: self._plan_trajectory(q, target_positions, duration, speed_factor, joints)
+            motion = _TrajectoryMotion(handle, planner, kp, kd)
+        return self._bind_slots(motion, slots)
+    
+    def _slot_joints(self, slots: Optional[List[str]] = None) -> Optional[np.ndarray]:
+        """槽位对应的关节索引 (按左臂/右臂/腰部顺序), None 表示全部关节"""
+        if slots is None:
+            return None
+        return np.concatenate([slot.joints for name, slot in self._stream_slots.items() if name in slots])
+    
+    def _bind_slots(self, motion, slots: Optional[List[str]] = None):
+        """记录运动占用的槽位和关节"""
+        motion.slots = [name for name in self._stream_slots if slots is None or name in slots]
+        motion.joints = np.concatenate([self._stream_slots[name].joints for name in motion.slots])
+        return motion
+    
+    def _submit_motion(
+        self, motion, start_positions: Optional[List[float]] = None, blend_time: float = 0.0,
+        stopping: bool = False
+    ) -> MotionHandle:
+        """
+        提交一次运动给控制线程, 下一个周期生效; 尚未被接收且槽位重叠的运动被抢占
+        stopping: stop_control 的返回运动, 之后的运动被拒绝 (以 failed 结束) 直到 initialize_arms
+        """
+        blend_steps = int(blend_time / self.config.control_dt)
+        # 检查停止状态与替换待接收运动在同一临界区: 已检查通过的运动不能在之后替换掉停止的返回运动
+        with self._stream_lock:
+            rejected = self._stream_stopping and not stopping
+            if not rejected:
+                self._stream_stopping = self._stream_stopping or stopping
+                if start_positions is not None:
+                    self._stream_q = np.asarray(start_positions, dtype=np.float64)
+                replaced = [pending for pending, _ in self._stream_pending if set(pending.slots) & set(motion.slots)]
+                self._stream_pending = [entry for entry in self._stream_pending if entry[0] not in replaced]
+                self._stream_pending.append((motion, blend_steps))
+        if rejected:
+            print("[G1Arm] 错误: 正在停止控制 (stop_control), 需要先 initialize_arms")
+            motion.handle._finish(MotionHandle.FAILED)
+            return motion.handle
+        self._finish_handles([pending.handle for pending in replaced], MotionHandle.PREEMPTED)
+        return motion.handle
+    
+    def _submit_ramp(self, target: float, motion=None, align: bool = False) -> MotionHandle:
+        """提交权重过渡给控制线程 (与 motion 同时进行), 抢占尚未完成的权重过渡"""
+        handle = MotionHandle(list(self._nature_pos), self._cancel_ramp)
+        handle.status = MotionHandle.RUNNING
+        with self._stream_lock:
+            replaced = self._stream_ramp
+            self._stream_ramp = _WeightRamp(handle, target, self._delta_weight, motion, align)
+        if replaced is not None:
+            replaced.handle._finish(MotionHandle.PREEMPTED)
+        return handle
+    
+    def _cancel_ramp(self, handle: MotionHandle) -> bool:
+        """取消权重过渡, 权重停在当前值, 一同提交的运动也取消"""
+        with self._stream_lock:
+            ramp = self._stream_ramp
+            if ramp is None or ramp.handle is not handle:
+                return False
+            self._stream_ramp = None
+        if ramp.motion is not None:
+            ramp.motion.handle.cancel()
+        handle._finish(MotionHandle.CANCELLED)
+        return True
+    
+    def _cancel_motion(self, handle: MotionHandle) -> bool:
+        """取消运动 (MotionHandle.cancel), 它占用的关节停在当前期望位置"""
+        finished = []
+        with self._stream_lock:
+            for entry in self._stream_pending:
+                if entry[0].handle is handle:
+                    self._stream_pending.remove(entry)
+                    finished.append((handle, MotionHandle.CANCELLED))
+                    break
+            else:
+                motion = next((m for m in self._active_motions() if m.handle is handle), None)
+                if motion is None:
+                    return False
+                # 过渡中取消新运动时停在当前输出位置, 旧运动一并结束
+                self._detach_motion(motion, MotionHandle.CANCELLED, finished)
+        self._finish_handles_with_status(finished)
+        return True
+    
+    def _active_motions(self) -> list:
+        """各槽位中的运动及交叉过渡的旧运动 (去重, 调用方持有 _stream_lock)"""
+        motions = []
+        for slot in self._stream_slots.values():
+            for motion in (slot.motion, slot.blend[0] if slot.blend is not None else None):
+                if motion is not None and not any(motion is m for m in motions):
+                    motions.append(motion)
+        return motions
+    
+    def _detach_motion(self, motion, status: str, finished: list):
+        """从所有槽位移除运动, 以它为目标的交叉过渡的旧运动一并结束 (调用方持有 _stream_lock)"""
+        for slot in self._stream_slots.values():
+            if slot.motion is motion:
+                slot.motion = None
+                if slot.blend is not None:
+                    finished.append((slot.blend[0].handle, MotionHandle.PREEMPTED))
+                    slot.blend = None
+            elif slot.blend is not None and slot.blend[0] is motion:
+                slot.blend = None
+        finished.append((motion.handle, status))
+    
+    def _take_stream_motions(self) -> List[MotionHandle]:
+        """取出所有未完成运动 (及权重过渡) 的句柄 (调用方持有 _stream_lock, 在锁外结束它们)"""
+        handles = [motion.handle for motion in self._active_motions()]
+        handles.extend(motion.handle for motion, _ in self._stream_pending)
+        self._stream_pending = []
+        if self._stream_ramp is not None:
+            handles.append(self._stream_ramp.handle)
+            self._stream_ramp = None
+        for slot in self._stream_slots.values():
+            slot.motion = slot.blend = None
+        return handles
+    
+    def _reset_stream_gains(self):
+        for slot in self._stream_slots.values():
+            slot.gains = (None, None)
+    
+    @staticmethod
+    def _finish_handles(handles: List[MotionHandle], status: str):
+        for handle in handles:
+            handle._finish(status)
+    
+    @staticmethod
+    def _finish_handles_with_status(finished: list):
+        for handle, status in finished:
+            handle._finish(status)
+    
+    def _accept_motion(self, motion, blend_steps: int, finished: list):
+        """
+        控制线程接收新运动: 占用的槽位上的旧运动被抢占 (blend_steps>0 时先交叉过渡)
+        规划失败 (如参数错误) 时新运动以 failed 结束, 旧运动不受影响
+        """
+        try:
+            motion.begin(self._stream_q[motion.joints])
+        except Exception as e:
+            print(f"[G1Arm] 运动规划失败: {e}")
+            finished.append((motion.handle, MotionHandle.FAILED))
+            return
+        
+        slots = [self._stream_slots[name] for name in motion.slots]
+        for slot in slots:
+            if slot.blend is not None:
+                finished.append((slot.blend[0].handle, MotionHandle.PREEMPTED))
+                slot.blend = None
+        for old in {id(slot.motion): slot.motion for slot in slots if slot.motion is not None}.values():
+            if blend_steps <= 0:
+                self._detach_motion(old, MotionHandle.PREEMPTED, finished)
+                continue
+            # 旧运动只在新运动的槽位上继续作为过渡来源, 它的其他槽位停在当前位置
+            for slot in self._stream_slots.values():
+                if slot.motion is old:
+                    slot.motion = None
+                    if slot in slots:
+                        slot.blend = [old, 0, blend_steps]
+        
+        for slot in slots:
+            slot.motion = motion
+            slot.gains = (motion.kp, motion.kd)
+        self._stream_weight = self._weight * self._weight
+        motion.handle.status = MotionHandle.RUNNING
+    
+    def _stream_gain_arrays(self):
+        """各槽位增益合成逐关节数组, 全部为默认值时返回 (None, None)"""
+        if all(slot.gains == (None, None) for slot in self._stream_slots.values()):
+            return None, None
+        kp = np.full(self.ARM_JOINT_COUNT, self.config.default_kp)
+        kd = np.full(self.ARM_JOINT_COUNT, self.config.default_kd)
+        for slot in self._stream_slots.values():
+            if slot.gains[0] is not None:
+                kp[slot.joints] = slot.gains[0]
+            if slot.gains[1] is not None:
+                kd[slot.joints] = slot.gains[1]
+        return kp, kd
+    
+    def _stream_tick(self):
+        """控制线程的一个周期: 接收新运动 -> 推进各槽位运动 (及交叉过渡) 和权重过渡 -> 合成一帧发布"""
+        finished = []
+        shutdown = False
+        with self._stream_lock:
+            pending, self._stream_pending = self._stream_pending, []
+            for motion, blend_steps in pending:
+                self._accept_motion(motion, blend_steps, finished)
+            
+            motions = self._active_motions()
+            reached = {id(motion): motion.step() for motion in motions}
+            q = self._stream_q.copy()
+            velocities = None
+            for motion in motions:
+                if not any(self._stream_slots[name].motion is motion for name in motion.slots):
+                    continue  # 只作为过渡来源
+                q[motion.joints] = motion.q
+                if motion.dq is not None:
+                    if velocities is None:
+                        velocities = np.array(self._default_velocities)
+                    velocities[motion.joints] = motion.dq
+            
+            # 交叉过渡: 旧运动继续前进, 槽位输出从旧运动平滑 (smoothstep) 过渡到新运动
+            for slot in self._stream_slots.values():
+                if slot.blend is None:
+                    continue
+                old, count, total = slot.blend
+                count += 1
+                s = count / total
+                s = s * s * (3.0 - 2.0 * s)
+                old_q = old.q[np.searchsorted(old.joints, slot.joints)]
+                q[slot.joints] = old_q * (1.0 - s) + q[slot.joints] * s
+                if velocities is not None:
+                    velocities[slot.joints] = np.asarray(self._default_velocities)[slot.joints]
+                if count >= total:
+                    finished.append((old.handle, MotionHandle.PREEMPTED))
+                    slot.blend = None
+                else:
+                    slot.blend[1] = count
+            
+            # 过渡结束前新运动不算完成
+            for motion in motions:
+                slots = [self._stream_slots[name] for name in motion.slots]
+                if (reached[id(motion)] and any(slot.motion is motion for slot in slots)
+                        and all(slot.blend is None for slot in slots)):
+                    self._detach_motion(motion, MotionHandle.DONE, finished)
+            
+            self._stream_q = q
+            if motions:
+                self._current_jpos_des = q.tolist()
+            
+            # 权重过渡: 与运动同一帧发布
+            ramp = self._stream_ramp
+            if ramp is not None:
+                self._weight = ramp.step(self._weight)
+                self._stream_weight = self._weight * self._weight
+                if ramp.reached(self._weight):
+                    status = ramp.status()
+                    finished.append((ramp.handle, status))
+                    self._stream_ramp = None
+                    # stop_control 完成: 自动启动的流式控制随之停止
+                    shutdown = ramp.align and status == MotionHandle.DONE and self._stream_auto
+            
+            kp, kd = self._stream_gain_arrays()
+            cmd = self._create_arm_command(self._stream_q, velocities, kp=kp, kd=kd, weight=self._stream_weight)
+            if not self._publish_command(cmd):
+                finished.extend((handle, MotionHandle.FAILED) for handle in self._take_stream_motions())
+        
+        # 在锁外结束句柄, 回调中可以提交新的运动; 先停止流式控制, 等待方返回时线程已停止
+        if shutdown:
+            self.stop_streaming()
+        self._finish_handles_with_status(finished)
+    
+    def _send_arm_command(
+        self, positions: List[float], weight: Optional[float] = None, velocities: Optional[List[float]] = None
+    ) -> bool:
+        """
+        发送一帧命令: 未启动流式控制时直接发布; 否则交给控制线程保持发布,
+        并抢占正在执行的运动和权重过渡
+        正在停止控制 (stop_control) 时不抢占返回运动, 返回False 使阻塞式运动中止
+        """
+        if not self.is_streaming():
+            return self._publish_command(self._create_arm_command(positions, velocities, weight=weight))
+        
+        with self._stream_lock:
+            stopping = self._stream_stopping
+            if not stopping:
+                preempted = self._take_stream_motions()
+                self._stream_q = np.asarray(positions, dtype=np.float64)
+                self._stream_weight = self._weight * self._weight if weight is None else weight
+                self._reset_stream_gains()
+        if stopping:
+            print("[G1Arm] 错误: 正在停止控制 (stop_control), 需要先 initialize_arms")
+            return False
+        self._finish_handles(preempted, MotionHandle.PREEMPTED)
+        return True
 
     def set_arm_pose(self, pose_name: str) -> bool:
         """
@@ -614,36 +1438,27 @@ class G1ArmClient:
             return False
         return self.set_joint_positions(pose)
     
-    def get_current_joint_positions(self, timeout: float = 2.0) -> Optional[List[float]]:
+    def get_current_joint_positions(self, timeout: float = 2.0, max_age: float = 0.05) -> Optional[List[float]]:
         """
         获取当前手臂关节位置
         
         参数:
             timeout: 超时时间(秒)
+            max_age: 缓存状态不超过该时长(秒)时立即返回, 否则等待下一帧状态
         
         返回:
             关节位置列表 (rad) 或 None (超时)
         """
-        start_time = time.time()
-        time.sleep(0.1)  # 等待首次消息
-        
-        while time.time() - start_time < timeout:
-            with self._state_lock:
-                if self._latest_state is not None:
-                    state = self._latest_state
-                    # 检查消息是否包含足够的电机状态
-                    if hasattr(state, 'motor_state') and len(state.motor_state) >= 35:
-                        return [float(state.motor_state[idx].q) for idx in self._arm_joints]
-            time.sleep(0.01)
-        
-        return None
+        arm_state = self._read_arm_state(timeout, max_age)
+        return arm_state['q'] if arm_state is not None else None
     
-    def get_joint_states(self, timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+    def get_joint_states(self, timeout: float = 2.0, max_age: float = 0.05) -> Optional[Dict[str, Any]]:
         """
         获取详细的关节状态
         
         参数:
             timeout: 超时时间(秒)
+            max_age: 缓存状态不超过该时长(秒)时立即返回, 否则等待下一帧状态
         
         返回:
             包含位置、速度、扭矩、温度等信息的字典, 或 None (超时)
@@ -652,35 +1467,104 @@ class G1ArmClient:
                 'positions': [q1, q2, ...],      # 关节位置 (rad)
                 'velocities': [dq1, dq2, ...],   # 关节速度 (rad/s)
                 'torques': [tau1, tau2, ...],    # 关节扭矩 (N·m)
-                'temperatures': [t1, t2, ...]    # 电机温度 (℃)
+                'temperatures': [t1, t2, ...],   # 电机温度 (℃)
+                'timestamp': t                   # 接收时间 (time.monotonic())
             }
         """
-        start_time = time.time()
-        time.sleep(0.1)
-        
-        while time.time() - start_time < timeout:
-            with self._state_lock:
-                if self._latest_state is not None:
-                    state = self._latest_state
-                    if hasattr(state, 'motor_state') and len(state.motor_state) >= 35:
-                        joint_states = {
-                            'positions': [],      # 位置
-                            'velocities': [],     # 速度
-                            'torques': [],        # 扭矩
-                            'temperatures': []    # 温度
-                        }
-                        for idx in self._arm_joints:
-                            ms = state.motor_state[idx]
-                            joint_states['positions'].append(float(ms.q))
-                            joint_states['velocities'].append(float(ms.dq))
-                            joint_states['torques'].append(float(ms.tau_est))
-                            joint_states['temperatures'].append(
-                                ms.temperature[0] if hasattr(ms, 'temperature') else 0
-                            )
-                        return joint_states
-            time.sleep(0.01)
+        arm_state = self._read_arm_state(timeout, max_age)
+        if arm_state is None:
+            return None
+        return {
+            'positions': arm_state['q'],                # 位置
+            'velocities': arm_state['dq'],              # 速度
+            'torques': arm_state['tau_est'],            # 扭矩
+            'temperatures': arm_state['temperature'],   # 温度
+            'timestamp': arm_state['timestamp']         # 接收时间
+        }
+    
+    def get_tracking_stats(self, window: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        命令跟踪统计 (需要 history_size > 0)
+        
+        参数:
+            window: 统计最近多少秒 (None 为整个历史)
+        
+        返回:
+            字典或 None (未启用历史/没有实测数据):
+            {
+                'rms': [e1, e2, ...],        # 各关节 命令-实测 位置误差均方根 (rad)
+                'peak_lag': [l1, l2, ...],   # 各关节 实测落后命令的最大距离 (rad)
+                'latency': t,                # 命令到运动的估计延迟 (秒), 命令未变化时为 None
+                'samples': n                 # 参与统计的行数
+            }
+        """
+        if self.history is None:
+            return None
+        stats = self.history.TrackingStats(window)
+        if stats is None:
+            return None
+        return {
+            'rms': stats['rms'].tolist(),
+            'peak_lag': stats['peakLag'].tolist(),
+            'latency': stats['latency'],
+            'samples': stats['samples']
+        }
+    
+    def _read_arm_state(self, timeout: float, max_age: float = 0.05) -> Optional[Dict[str, Any]]:
+        """
+        读取手臂关节状态数组 (按 self._arm_joints 顺序)
+        
+        缓存的最新状态不超过 max_age 秒时立即返回, 否则等待订阅回调通知下一帧 (不轮询)
+        
+        参数:
+            timeout: 超时时间(秒)
+            max_age: 可接受的状态时长(秒)
+        
+        返回:
+            {'q', 'dq', 'tau_est', 'temperature'} -> 列表 与 'timestamp' (接收时间), 或 None (超时)
+        """
+        deadline = time.monotonic() + timeout
+        state_source = self._state_view if self._state_view is not None else self._state_subscriber
+        latest = state_source.ReadFresh(max_age, timeout)
+        while latest is not None:
+            arm_state = self._arm_state_of(latest.sample)  # 电机数不足35时为None
+            if arm_state is not None:
+                arm_state['timestamp'] = latest.timestamp
+                return arm_state
+            latest = state_source.WaitNewer(latest.seq, max(0.0, deadline - time.monotonic()))
         
         return None
+    
+    def _arm_state_of(self, state) -> Optional[Dict[str, List]]:
+        """
+        取出一帧 LowState_ 中手臂关节的 q/dq/tau_est/temperature (按 self._arm_joints 顺序)
+        
+        逐属性读取: 消息是Python对象, 直接读属性比转换成NumPy数组快得多 (见 test/decode/bench_decode.py);
+        共享内存状态 (LowStateSample) 已经解码成数组, 直接按索引取
+        
+        返回:
+            {'q', 'dq', 'tau_est', 'temperature'} -> 列表, 或 None (电机数不足35)
+        """
+        if hasattr(state, 'GetState'):
+            record = state.GetState()
+            joints = self._arm_joints
+            return {
+                'q': record['q'][joints].tolist(),
+                'dq': record['dq'][joints].tolist(),
+                'tau_est': record['tau_est'][joints].tolist(),
+                'temperature': record['temperature'][joints, 0].tolist()
+            }
+        
+        motors = state.motor_state
+        if len(motors) < 35:
+            return None
+        arm_motors = [motors[idx] for idx in self._arm_joints]
+        return {
+            'q': [float(ms.q) for ms in arm_motors],
+            'dq': [float(ms.dq) for ms in arm_motors],
+            'tau_est': [float(ms.tau_est) for ms in arm_motors],
+            'temperature': [ms.temperature[0] for ms in arm_motors]
+        }
 
 
 class G1ArmGestures:
@@ -1,7 +1,8 @@
+import os
 import time
 from typing import Any, Callable
 import threading
-from threading import Thread, Event
+from threading import Thread, Event, Condition
 
 from cyclonedds.domain import Domain, DomainParticipant
 from cyclonedds.internal import dds_c_t
@@ -18,7 +19,64 @@ from .channel_config import ChannelConfigAutoDetermine, ChannelConfigHasInterfac
 
 # for singleton
 from ..utils.singleton import Singleton
-from ..utils.bqueue import BQueue
+from ..utils.ring_buffer import RingBuffer, OverflowPolicy
+
+# per topic metrics, re-exported here
+from .channel_metrics import ChannelMetrics, TopicMetrics, ChannelMetricsEnable, ChannelMetricsSnapshot, ChannelMetricsPrometheus
+
+# named reader/writer qos, re-exported here
+from .channel_qos import QosProfile, QosProfileRegister, QosProfileGet, QosResolve
+
+
+"""
+" class ChannelBackend
+" entity types a Channel is built from: cyclonedds, or the in-process
+" loopback in channel_loopback with the same constructors and methods.
+"""
+class ChannelBackend:
+    def __init__(self, topic: Any, reader: Any, writer: Any, listener: Any):
+        self.Topic = topic
+        self.DataReader = reader
+        self.DataWriter = writer
+        self.Listener = listener
+
+DdsBackend = ChannelBackend(Topic, DataReader, DataWriter, Listener)
+
+
+"""
+" class LatestSample
+"""
+class LatestSample:
+    def __init__(self, sample: Any, seq: int, timestamp: float):
+        self.sample = sample
+        self.seq = seq
+        self.timestamp = timestamp
+
+    def __str__(self):
+        return f"LatestSample(seq={self.seq}, timestamp={self.timestamp})"
+
+
+"""
+" class ReaderStats
+"""
+class ReaderStats:
+    def __init__(self):
+        self.wakeups = 0
+        self.taken = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.maxBatch = 0
+        # reported by dds: samples lost on the way, requested deadline missed
+        self.lost = 0
+        self.deadlineMissed = 0
+
+    def ToDict(self):
+        return {"wakeups": self.wakeups, "taken": self.taken, "dropped": self.dropped,
+                "coalesced": self.coalesced, "maxBatch": self.maxBatch,
+                "lost": self.lost, "deadlineMissed": self.deadlineMissed}
+
+    def __str__(self):
+        return f"ReaderStats(wakeups={self.wakeups}, taken={self.taken}, dropped={self.dropped}, coalesced={self.coalesced}, maxBatch={self.maxBatch}, lost={self.lost}, deadlineMissed={self.deadlineMissed})"
 
 
 """
@@ -34,26 +92,57 @@ class Channel:
     " internal class __Reader
     """
     class __Reader:
-        def __init__(self):
+        def __init__(self, backend: ChannelBackend, metrics: TopicMetrics = None):
+            self.__backend = backend
+            self.__metrics = metrics
             self.__reader = None
             self.__handler = None
             self.__queue = None
             self.__queueEnable = False
             self.__threadEvent = None
             self.__threadReader = None
+            self.__keepLatest = False
+            self.__latest = None
+            self.__latestSeq = 0
+            self.__latestCondition = None
+            self.__drainLen = 1
+            self.__coalesce = False
+            self.__batchHandler = False
+            self.__stats = ReaderStats()
+            self.__subscription_matched_count = 0
+            self.__matchedCondition = Condition()
         
-        def Init(self, participant: DomainParticipant, topic: Topic, qos: Qos = None, handler: Callable = None, queueLen: int = 0):
-            if handler is None:
-                self.__reader = DataReader(participant, topic, qos)
+        def Init(self, participant: DomainParticipant, topic: Topic, qos: Qos = None, handler: Callable = None, queueLen: int = 0, keepLatest: bool = False,
+                 drainLen: int = 1, coalesce: bool = False, batchHandler: bool = False):
+            # drainLen: max samples taken per listener wakeup
+            # coalesce: only the newest sample of each wakeup is dispatched
+            # batchHandler: handler receives the list of samples of one wakeup
+            self.__drainLen = drainLen if drainLen > 0 else 1
+            self.__coalesce = coalesce
+            self.__batchHandler = batchHandler
+
+            if keepLatest:
+                self.__keepLatest = True
+                self.__latestCondition = Condition()
+
+            if handler is None and not keepLatest:
+                self.__reader = self.__backend.DataReader(participant, topic, qos,
+                                                          self.__backend.Listener(on_subscription_matched=self.__OnSubscriptionMatched,
+                                                                                  on_requested_deadline_missed=self.__OnDeadlineMissed,
+                                                                                  on_sample_lost=self.__OnSampleLost))
             else:
                 self.__handler = handler
-                if queueLen > 0:
+                if handler is not None and queueLen > 0:
                     self.__queueEnable = True
-                    self.__queue = BQueue(queueLen)
+                    self.__queue = RingBuffer(queueLen, OverflowPolicy.DROP_OLDEST)
                     self.__threadEvent = Event()
                     self.__threadReader = Thread(target=self.__ChannelReaderThreadFunc, name="ch_reader", daemon=True)
                     self.__threadReader.start()
-                self.__reader = DataReader(participant, topic, qos, Listener(on_data_available=self.__OnDataAvailable))
+                self.__reader = self.__backend.DataReader(participant, topic, qos,
+                                                          self.__backend.Listener(on_data_available=self.__OnDataAvailable,
+                                                                                  on_subscription_matched=self.__OnSubscriptionMatched,
+                                                                                  on_requested_deadline_missed=self.__OnDeadlineMissed,
+                                                                                  on_sample_lost=self.__OnSampleLost))
 
         def Read(self, timeout: float = None):
             sample = None
@@ -71,6 +160,37 @@ class Channel:
 
             return sample
 
+        def ReadLatest(self):
+            # the reference is swapped as a whole, no lock needed to read it
+            return self.__latest
+
+        def WaitNewer(self, seq: int = 0, timeout: float = None):
+            if not self.__keepLatest:
+                print("[Reader] keep latest mode is not enabled")
+                return None
+
+            with self.__latestCondition:
+                if not self.__latestCondition.wait_for(lambda: self.__latestSeq > seq, timeout):
+                    return None
+                return self.__latest
+
+        def ReadFresh(self, maxAge: float = 0.0, timeout: float = None):
+            # newest sample if received at most maxAge seconds ago, else wait for the next one
+            latest = self.__latest
+            if latest is not None and time.monotonic() - latest.timestamp <= maxAge:
+                return latest
+            return self.WaitNewer(0 if latest is None else latest.seq, timeout)
+
+        def GetStats(self):
+            return self.__stats
+
+        def WaitMatched(self, timeout: float = None):
+            if self.__subscription_matched_count > 0:
+                return True
+
+            with self.__matchedCondition:
+                return self.__matchedCondition.wait_for(lambda: self.__subscription_matched_count > 0, timeout)
+
         def Close(self):
             if self.__reader is not None:
                 del self.__reader
@@ -84,7 +204,7 @@ class Channel:
         def __OnDataAvailable(self, reader: DataReader):
             samples = []
             try:
-                samples = reader.take(1)
+                samples = reader.take(self.__drainLen)
             except DDSException as e:
                 print("[Reader] catch DDSException error. msg:", e.msg)
                 return
@@ -95,51 +215,124 @@ class Channel:
                 print("[Reader] take sample error")
                 return
 
-            if samples is None:
+            if not samples:
                 return
 
-            # check invalid sample        
-            sample = samples[0]
-            if isinstance(sample, InvalidSample):
+            # check invalid sample
+            samples = [sample for sample in samples if not isinstance(sample, InvalidSample)]
+            if not samples:
                 return
 
-            # do sample
-            if self.__queueEnable:
-                self.__queue.Put(sample)
+            stats = self.__stats
+            count = len(samples)
+            metrics = self.__metrics
+            if metrics is not None:
+                metrics.OnReceive(count)
+            stats.wakeups += 1
+            stats.taken += count
+            if count > stats.maxBatch:
+                stats.maxBatch = count
+
+            # coalesce to newest
+            if self.__coalesce and count > 1:
+                stats.coalesced += count - 1
+                samples = samples[-1:]
+
+            # keep latest
+            if self.__keepLatest:
+                self.__SetLatest(samples[-1], count)
+
+            # do samples
+            if self.__handler is None:
+                return
+            elif self.__batchHandler:
+                if self.__queueEnable:
+                    if not self.__queue.Put(samples):
+                        stats.dropped += len(samples)
+                else:
+                    self.__CallHandler(samples)
+            elif self.__queueEnable:
+                for sample in samples:
+                    if not self.__queue.Put(sample):
+                        stats.dropped += 1
             else:
+                for sample in samples:
+                    self.__CallHandler(sample)
+
+        def __CallHandler(self, sample: Any):
+            if self.__metrics is None:
                 self.__handler(sample)
+            else:
+                start = time.perf_counter()
+                self.__handler(sample)
+                self.__metrics.OnHandled(time.perf_counter() - start)
+
+        def __OnSubscriptionMatched(self, reader: DataReader, status: dds_c_t.subscription_matched_status):
+            with self.__matchedCondition:
+                self.__subscription_matched_count = status.current_count
+                self.__matchedCondition.notify_all()
+
+        def __OnDeadlineMissed(self, reader: DataReader, status: dds_c_t.requested_deadline_missed_status):
+            self.__stats.deadlineMissed += status.total_count_change
+            if self.__metrics is not None:
+                self.__metrics.OnDeadlineMissed(status.total_count_change)
+
+        def __OnSampleLost(self, reader: DataReader, status: dds_c_t.sample_lost_status):
+            self.__stats.lost += status.total_count_change
+            if self.__metrics is not None:
+                self.__metrics.OnSampleLost(status.total_count_change)
+
+        def __SetLatest(self, sample: Any, count: int = 1):
+            with self.__latestCondition:
+                self.__latestSeq += count
+                self.__latest = LatestSample(sample, self.__latestSeq, time.monotonic())
+                self.__latestCondition.notify_all()
 
         def __ChannelReaderThreadFunc(self):
             while not self.__threadEvent.is_set():
-                sample = self.__queue.Get()
-                if sample is not None:
-                    self.__handler(sample)
+                for sample in self.__queue.GetMany():
+                    self.__CallHandler(sample)
 
     """
     " internal class __Writer
     """
     class __Writer:
-        def __init__(self):
+        def __init__(self, backend: ChannelBackend, metrics: TopicMetrics = None):
+            self.__backend = backend
+            self.__metrics = metrics
             self.__writer = None
             self.__publication_matched_count = 0
+            self.__deadlineMissed = 0
+            self.__matchedCondition = Condition()
         
         def Init(self, participant: DomainParticipant, topic: Topic, qos: Qos = None):
-            self.__writer = DataWriter(participant, topic, qos, Listener(on_publication_matched=self.__OnPublicationMatched))
-            time.sleep(0.2)
+            self.__writer = self.__backend.DataWriter(participant, topic, qos,
+                                                      self.__backend.Listener(on_publication_matched=self.__OnPublicationMatched,
+                                                                              on_offered_deadline_missed=self.__OnDeadlineMissed))
+            # give discovery up to 0.2s, returns as soon as a reader is matched
+            self.WaitMatched(0.2)
+
+        def WaitMatched(self, timeout: float = None):
+            if self.__publication_matched_count > 0:
+                return True
 
-        def Write(self, sample: Any, timeout: float = None):
-            waitsec = 0.0 if timeout is None else timeout
+            with self.__matchedCondition:
+                return self.__matchedCondition.wait_for(lambda: self.__publication_matched_count > 0, timeout)
 
+        def Write(self, sample: Any, timeout: float = None):
             # check publication_matched_count
-            while waitsec > 0.0 and self.__publication_matched_count == 0:
-                time.sleep(0.1)
-                waitsec = waitsec - 0.1
-            #   print(time.time())
-
-            # check waitsec
-            if timeout is not None and waitsec <= 0.0:
+            if timeout is not None and not self.WaitMatched(timeout):
                 return False
 
+            if self.__metrics is None:
+                return self.__Write(sample)
+
+            start = time.perf_counter()
+            ok = self.__Write(sample)
+            self.__metrics.OnWrite(time.perf_counter() - start, ok)
+            return ok
+
+        def __Write(self, sample: Any):
             try:
                 self.__writer.write(sample)
             except DDSException as e:
@@ -156,21 +349,35 @@ class Channel:
                 del self.__writer
         
         def __OnPublicationMatched(self, writer: DataWriter, status: dds_c_t.publication_matched_status):
-            self.__publication_matched_count = status.current_count
+            with self.__matchedCondition:
+                self.__publication_matched_count = status.current_count
+                self.__matchedCondition.notify_all()
+
+        def GetDeadlineMissed(self):
+            return self.__deadlineMissed
+
+        def __OnDeadlineMissed(self, writer: DataWriter, status: dds_c_t.offered_deadline_missed_status):
+            # the writer did not write within the deadline of its qos
+            self.__deadlineMissed += status.total_count_change
+            if self.__metrics is not None:
+                self.__metrics.OnDeadlineMissed(status.total_count_change)
 
 
     # channel __init__
-    def __init__(self, participant: DomainParticipant, name: str, type: Any, qos: Qos = None):
-        self.__reader = self.__Reader()
-        self.__writer = self.__Writer()
+    def __init__(self, participant: DomainParticipant, name: str, type: Any, qos: Qos = None, backend: ChannelBackend = DdsBackend):
+        metrics = ChannelMetrics().GetTopic(name)
+        self.__reader = self.__Reader(backend, metrics)
+        self.__writer = self.__Writer(backend, metrics)
         self.__participant = participant
-        self.__topic = Topic(self.__participant, name, type, qos)
+        self.__topic = backend.Topic(self.__participant, name, type, qos)
 
-    def SetWriter(self, qos: Qos = None):
-        self.__writer.Init(self.__participant, self.__topic, qos)
+    # qos: cyclonedds Qos, QosProfile or profile name, None for the topic qos
+    def SetWriter(self, qos: Any = None):
+        self.__writer.Init(self.__participant, self.__topic, QosResolve(qos))
 
-    def SetReader(self, qos: Qos = None, handler: Callable = None, queueLen: int = 0):
-        self.__reader.Init(self.__participant, self.__topic, qos, handler, queueLen)
+    def SetReader(self, qos: Any = None, handler: Callable = None, queueLen: int = 0, keepLatest: bool = False,
+                  drainLen: int = 1, coalesce: bool = False, batchHandler: bool = False):
+        self.__reader.Init(self.__participant, self.__topic, QosResolve(qos), handler, queueLen, keepLatest, drainLen, coalesce, batchHandler)
         
     def Write(self, sample: Any, timeout: float = None):
         return self.__writer.Write(sample, timeout)
@@ -178,6 +385,27 @@ class Channel:
     def Read(self, timeout: float = None):
         return self.__reader.Read(timeout)
 
+    def ReadLatest(self):
+        return self.__reader.ReadLatest()
+
+    def WaitNewer(self, seq: int = 0, timeout: float = None):
+        return self.__reader.WaitNewer(seq, timeout)
+
+    def ReadFresh(self, maxAge: float = 0.0, timeout: float = None):
+        return self.__reader.ReadFresh(maxAge, timeout)
+
+    def GetReaderStats(self):
+        return self.__reader.GetStats()
+
+    def GetWriterDeadlineMissed(self):
+        return self.__writer.GetDeadlineMissed()
+
+    def WaitWriterMatched(self, timeout: float = None):
+        return self.__writer.WaitMatched(timeout)
+
+    def WaitReaderMatched(self, timeout: float = None):
+        return self.__reader.WaitMatched(timeout)
+
     def CloseReader(self):
         self.__reader.Close()
 
@@ -192,6 +420,7 @@ class ChannelFactory(Singleton):
     __domain = None
     __participant = None
     __qos = None
+    __backend = DdsBackend
 
     __initialized = False
     __init_lock = threading.Lock()
@@ -199,14 +428,28 @@ class ChannelFactory(Singleton):
     def __init__(self):
         super().__init__()
 
-    def Init(self, id: int, networkInterface: str = None, qos: Qos = None):
+    def Init(self, id: int, networkInterface: str = None, qos: Qos = None, backend: str = None):
         if self.__class__.__initialized:
             return True
         
         with self.__class__.__init_lock:
             if self.__class__.__initialized:
                 return True
-            
+
+            # backend "dds" (default) or "loopback": in-process only, no domain is created
+            if backend is None:
+                backend = os.environ.get("UNITREE_SDK_CHANNEL_BACKEND", "dds")
+            if backend == "loopback":
+                from .channel_loopback import LoopbackParticipant, LoopbackTopic, LoopbackDataReader, LoopbackDataWriter, LoopbackListener
+                self.__class__.__backend = ChannelBackend(LoopbackTopic, LoopbackDataReader, LoopbackDataWriter, LoopbackListener)
+                self.__class__.__participant = LoopbackParticipant(id)
+                self.__class__.__qos = qos
+                self.__class__.__initialized = True
+                return True
+            elif backend != "dds":
+                print("[ChannelFactory] unknown backend:", backend)
+                return False
+
             config = None
             # choose config
             if networkInterface is None:
@@ -237,31 +480,35 @@ class ChannelFactory(Singleton):
             return True
 
     def CreateChannel(self, name: str, type: Any):
-        return Channel(self.__class__.__participant, name, type, self.__class__.__qos)
+        return Channel(self.__class__.__participant, name, type, self.__class__.__qos, self.__class__.__backend)
 
-    def CreateSendChannel(self, name: str, type: Any):
+    def CreateSendChannel(self, name: str, type: Any, qos: Any = None):
         channel = self.CreateChannel(name, type)
-        channel.SetWriter(None)
+        channel.SetWriter(qos)
         return channel
 
-    def CreateRecvChannel(self, name: str, type: Any, handler: Callable = None, queueLen: int = 0):
+    def CreateRecvChannel(self, name: str, type: Any, handler: Callable = None, queueLen: int = 0, keepLatest: bool = False,
+                          qos: Any = None):
         channel = self.CreateChannel(name, type)
-        channel.SetReader(None, handler, queueLen)
+        channel.SetReader(qos, handler, queueLen, keepLatest)
         return channel
 
 
 """
 " class ChannelPublisher
+" qos: profile name ("control", "state", "rpc", see channel_qos), QosProfile
+" or cyclonedds Qos. None keeps the qos given to ChannelFactory.Init.
 """
 class ChannelPublisher:
-    def __init__(self, name: str, type: Any):
+    def __init__(self, name: str, type: Any, qos: Any = None):
         factory = ChannelFactory()
         self.__channel = factory.CreateChannel(name, type)
+        self.__qos = qos
         self.__inited = False
 
     def Init(self):
         if not self.__inited:
-            self.__channel.SetWriter(None)
+            self.__channel.SetWriter(self.__qos)
             self.__inited = True
 
     def Close(self):
@@ -271,18 +518,29 @@ class ChannelPublisher:
     def Write(self, sample: Any, timeout: float = None):
         return self.__channel.Write(sample, timeout)
 
+    # wait until at least one reader is matched, False on timeout
+    def WaitMatched(self, timeout: float = None):
+        return self.__channel.WaitWriterMatched(timeout)
+
+    # offered deadline misses, only counted when the qos has a deadline
+    def GetDeadlineMissed(self):
+        return self.__channel.GetWriterDeadlineMissed()
+
 """
 " class ChannelSubscriber
+" qos: as ChannelPublisher
 """
 class ChannelSubscriber:
-    def __init__(self, name: str, type: Any):
+    def __init__(self, name: str, type: Any, qos: Any = None):
         factory = ChannelFactory()
         self.__channel = factory.CreateChannel(name, type)
+        self.__qos = qos
         self.__inited = False
 
-    def Init(self, handler: Callable = None, queueLen: int = 0):
+    def Init(self, handler: Callable = None, queueLen: int = 0, keepLatest: bool = False,
+             drainLen: int = 1, coalesce: bool = False, batchHandler: bool = False):
         if not self.__inited:
-            self.__channel.SetReader(None, handler, queueLen)
+            self.__channel.SetReader(self.__qos, handler, queueLen, keepLatest, drainLen, coalesce, batchHandler)
             self.__inited = True
 
     def Close(self):
@@ -292,10 +550,32 @@ class ChannelSubscriber:
     def Read(self, timeout: int = None):
         return self.__channel.Read(timeout)
 
+    # keepLatest mode: newest LatestSample(sample, seq, timestamp) or None
+    def ReadLatest(self):
+        return self.__channel.ReadLatest()
+
+    # keepLatest mode: wait for a LatestSample with seq greater than `seq`, None on timeout
+    def WaitNewer(self, seq: int = 0, timeout: float = None):
+        return self.__channel.WaitNewer(seq, timeout)
+
+    # keepLatest mode: the newest LatestSample when it is at most maxAge seconds old (timestamp is the
+    # receive time, time.monotonic), otherwise wait for the next one. None on timeout
+    def ReadFresh(self, maxAge: float = 0.0, timeout: float = None):
+        return self.__channel.ReadFresh(maxAge, timeout)
+
+    # taken/dropped/coalesced counters, taken growing faster than wakeups means samples pile up.
+    # lost/deadlineMissed come from dds, deadlineMissed only with a deadline in the qos
+    def GetStats(self):
+        return self.__channel.GetReaderStats()
+
+    # wait until at least one writer is matched, False on timeout
+    def WaitMatched(self, timeout: float = None):
+        return self.__channel.WaitReaderMatched(timeout)
+
 """
 " function ChannelFactoryInitialize. used to intialize channel everenment.
 """
-def ChannelFactoryInitialize(id: int = 0, networkInterface: str = None):
+def ChannelFactoryInitialize(id: int = 0, networkInterface: str = None, backend: str = None):
     factory = ChannelFactory()
-    if not factory.Init(id, networkInterface):
+    if not factory.Init(id, networkInterface, None, backend):
         raise Exception("channel factory init error.")
@@ -0,0 +1,155 @@
+import weakref
+from collections import deque
+from threading import Lock, Condition
+from typing import Any
+
+
+"""
+" in-process loopback transport
+"
+" stand-ins for the cyclonedds Topic/DataReader/DataWriter/Listener used by
+" Channel, selected with ChannelFactoryInitialize(..., backend="loopback") or
+" UNITREE_SDK_CHANNEL_BACKEND=loopback. a write is handed to the readers of
+" the same topic name in this process, inside the writer's thread, without
+" serialization: readers get the written object itself and must not modify
+" it, and a writer that reuses one sample object (G1ArmClient) updates it
+" under readers that keep a reference. qos is ignored, the reader cache
+" keeps the last HISTORY_DEPTH samples like the dds default KEEP_LAST 1.
+"""
+HISTORY_DEPTH = 1
+
+
+class _MatchedStatus:
+    def __init__(self, current_count: int):
+        self.current_count = current_count
+
+
+"""
+" class LoopbackParticipant
+"""
+class LoopbackParticipant:
+    def __init__(self, id: int = 0):
+        self.id = id
+        self.__lock = Lock()
+        self.__readers = {}
+        self.__writers = {}
+
+    def GetReaders(self, name: str):
+        with self.__lock:
+            return list(self.__readers.get(name, ()))
+
+    def _Attach(self, name: str, entity: Any, isWriter: bool):
+        with self.__lock:
+            own, other = (self.__writers, self.__readers) if isWriter else (self.__readers, self.__writers)
+            own.setdefault(name, weakref.WeakSet()).add(entity)
+            peers = list(other.get(name, ()))
+            count = len(own[name])
+        entity._Matched(len(peers))
+        for peer in peers:
+            peer._Matched(count)
+
+    def _Detach(self, name: str, entity: Any, isWriter: bool):
+        with self.__lock:
+            own, other = (self.__writers, self.__readers) if isWriter else (self.__readers, self.__writers)
+            if name in own:
+                own[name].discard(entity)
+            count = len(own.get(name, ()))
+            peers = list(other.get(name, ()))
+        for peer in peers:
+            peer._Matched(count)
+
+
+"""
+" class LoopbackListener
+"""
+class LoopbackListener:
+    def __init__(self, on_data_available=None, on_subscription_matched=None, on_publication_matched=None, **kwargs):
+        self.on_data_available = on_data_available
+        self.on_subscription_matched = on_subscription_matched
+        self.on_publication_matched = on_publication_matched
+
+
+"""
+" class LoopbackTopic
+"""
+class LoopbackTopic:
+    def __init__(self, participant: LoopbackParticipant, name: str, type: Any, qos: Any = None):
+        self.participant = participant
+        self.name = name
+        self.type = type
+
+
+"""
+" class LoopbackDataWriter
+"""
+class LoopbackDataWriter:
+    def __init__(self, participant: LoopbackParticipant, topic: LoopbackTopic, qos: Any = None,
+                 listener: LoopbackListener = None):
+        self.__participant = participant
+        self.__name = topic.name
+        self.__listener = listener
+        participant._Attach(self.__name, self, True)
+
+    def write(self, sample: Any):
+        for reader in self.__participant.GetReaders(self.__name):
+            reader._Deliver(sample)
+
+    def _Matched(self, count: int):
+        if self.__listener is not None and self.__listener.on_publication_matched is not None:
+            self.__listener.on_publication_matched(self, _MatchedStatus(count))
+
+    def __del__(self):
+        try:
+            self.__participant._Detach(self.__name, self, True)
+        except Exception:
+            pass
+
+
+"""
+" class LoopbackDataReader
+"""
+class LoopbackDataReader:
+    def __init__(self, participant: LoopbackParticipant, topic: LoopbackTopic, qos: Any = None,
+                 listener: LoopbackListener = None):
+        self.__participant = participant
+        self.__name = topic.name
+        self.__listener = listener
+        self.__cache = deque(maxlen=HISTORY_DEPTH)
+        self.__condition = Condition()
+        participant._Attach(self.__name, self, False)
+
+    def take(self, N: int = 1):
+        samples = []
+        with self.__condition:
+            while self.__cache and len(samples) < N:
+                samples.append(self.__cache.popleft())
+        return samples
+
+    def take_one(self, timeout: int = None):
+        # timeout in ns like cyclonedds duration()
+        with self.__condition:
+            if not self.__condition.wait_for(lambda: len(self.__cache) > 0,
+                                             None if timeout is None else timeout / 1e9):
+                raise TimeoutError()
+            return self.__cache.popleft()
+
+    def _Deliver(self, sample: Any):
+        with self.__condition:
+            self.__cache.append(sample)
+            self.__condition.notify()
+
+        if self.__listener is not None and self.__listener.on_data_available is not None:
+            try:
+                self.__listener.on_data_available(self)
+            except Exception as e:
+                print("[LoopbackDataReader] data available handler error. msg:", e.args)
+
+    def _Matched(self, count: int):
+        if self.__listener is not None and self.__listener.on_subscription_matched is not None:
+            self.__listener.on_subscription_matched(self, _MatchedStatus(count))
+
+    def __del__(self):
+        try:
+            self.__participant._Detach(self.__name, self, False)
+        except Exception:
+            pass
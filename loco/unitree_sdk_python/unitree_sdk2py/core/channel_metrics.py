@@ -0,0 +1,155 @@
+import os
+import time
+import threading
+
+from ..utils.singleton import Singleton
+from ..utils.histogram import Histogram
+
+
+"""
+" class TopicMetrics
+" counters and histograms of one topic, fed by every reader and writer of it.
+" updated without a lock from the dds listener / writer threads, so values
+" are approximate when several threads hit the same topic at once.
+"""
+class TopicMetrics:
+    # seconds, 100us .. 2s
+    TIME_BOUNDS = (0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.recvCount = 0
+        self.sendCount = 0
+        self.writeErrors = 0
+        self.deadlineMissed = 0
+        self.samplesLost = 0
+        self.interArrival = Histogram(self.TIME_BOUNDS)
+        self.handlerTime = Histogram(self.TIME_BOUNDS)
+        self.writeTime = Histogram(self.TIME_BOUNDS)
+        self.__lastRecv = None
+        self.__rateTime = time.monotonic()
+        self.__rateRecv = 0
+        self.__rateSend = 0
+
+    def OnReceive(self, count: int = 1):
+        now = time.monotonic()
+        if self.__lastRecv is not None:
+            self.interArrival.Add(now - self.__lastRecv)
+        self.__lastRecv = now
+        self.recvCount += count
+
+    def OnHandled(self, elapsed: float):
+        self.handlerTime.Add(elapsed)
+
+    def OnWrite(self, elapsed: float, ok: bool):
+        self.writeTime.Add(elapsed)
+        if ok:
+            self.sendCount += 1
+        else:
+            self.writeErrors += 1
+
+    def OnDeadlineMissed(self, count: int = 1):
+        # requested (reader) or offered (writer) deadline of the channel qos
+        self.deadlineMissed += count
+
+    def OnSampleLost(self, count: int = 1):
+        self.samplesLost += count
+
+    def ToDict(self):
+        # rates are averaged over the time since the previous snapshot
+        now = time.monotonic()
+        interval = now - self.__rateTime
+        recvRate = (self.recvCount - self.__rateRecv) / interval if interval > 0 else 0.0
+        sendRate = (self.sendCount - self.__rateSend) / interval if interval > 0 else 0.0
+        self.__rateTime = now
+        self.__rateRecv = self.recvCount
+        self.__rateSend = self.sendCount
+
+        return {"recv": self.recvCount, "send": self.sendCount, "writeErrors": self.writeErrors,
+                "deadlineMissed": self.deadlineMissed, "samplesLost": self.samplesLost,
+                "recvRate": recvRate, "sendRate": sendRate,
+                "interArrival": self.interArrival.ToDict(), "handlerTime": self.handlerTime.ToDict(),
+                "writeTime": self.writeTime.ToDict()}
+
+
+"""
+" class ChannelMetrics
+" per topic metrics registry. disabled by default, then channels get no
+" TopicMetrics and the only cost is one `is None` check per sample.
+" enable with ChannelMetricsEnable() before the channels are created, or
+" with environment variable UNITREE_SDK_CHANNEL_METRICS=1.
+"""
+class ChannelMetrics(Singleton):
+    __enabled = os.environ.get("UNITREE_SDK_CHANNEL_METRICS", "0") not in ("", "0")
+    __topics = {}
+    __lock = threading.Lock()
+
+    def __init__(self):
+        super().__init__()
+
+    def Enable(self, enable: bool = True):
+        self.__class__.__enabled = enable
+
+    def IsEnabled(self):
+        return self.__class__.__enabled
+
+    def GetTopic(self, name: str):
+        # None when disabled
+        if not self.__class__.__enabled:
+            return None
+
+        with self.__class__.__lock:
+            metrics = self.__class__.__topics.get(name)
+            if metrics is None:
+                metrics = self.__class__.__topics[name] = TopicMetrics(name)
+            return metrics
+
+    def Snapshot(self):
+        with self.__class__.__lock:
+            topics = list(self.__class__.__topics.values())
+        return {metrics.name: metrics.ToDict() for metrics in topics}
+
+    def ToPrometheus(self, prefix: str = "unitree_channel"):
+        with self.__class__.__lock:
+            topics = list(self.__class__.__topics.values())
+
+        lines = []
+        counters = (("messages_received_total", "recvCount"), ("messages_sent_total", "sendCount"),
+                    ("write_errors_total", "writeErrors"), ("deadline_missed_total", "deadlineMissed"),
+                    ("samples_lost_total", "samplesLost"))
+        for metric, attr in counters:
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for metrics in topics:
+                lines.append(f'{prefix}_{metric}{{topic="{metrics.name}"}} {getattr(metrics, attr)}')
+
+        histograms = (("interarrival_seconds", "interArrival"), ("handler_seconds", "handlerTime"),
+                      ("write_seconds", "writeTime"))
+        for metric, attr in histograms:
+            lines.append(f"# TYPE {prefix}_{metric} histogram")
+            for metrics in topics:
+                histogram = getattr(metrics, attr)
+                if histogram.GetCount() == 0:
+                    continue
+                label = f'topic="{metrics.name}"'
+                cumulative = 0
+                for bound, count in zip(histogram.GetBounds(), histogram.GetBuckets()):
+                    cumulative += count
+                    lines.append(f'{prefix}_{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_{metric}_bucket{{{label},le="+Inf"}} {histogram.GetCount()}')
+                lines.append(f"{prefix}_{metric}_sum{{{label}}} {histogram.GetSum()}")
+                lines.append(f"{prefix}_{metric}_count{{{label}}} {histogram.GetCount()}")
+
+        return "\n".join(lines) + "\n"
+
+
+"""
+" function ChannelMetricsEnable / ChannelMetricsSnapshot / ChannelMetricsPrometheus
+"""
+def ChannelMetricsEnable(enable: bool = True):
+    ChannelMetrics().Enable(enable)
+
+def ChannelMetricsSnapshot():
+    return ChannelMetrics().Snapshot()
+
+def ChannelMetricsPrometheus():
+    return ChannelMetrics().ToPrometheus()
@@ -0,0 +1,99 @@
+import threading
+from typing import Any
+
+from cyclonedds.qos import Qos, Policy
+from cyclonedds.util import duration
+
+
+"""
+" class QosProfile
+" named reader/writer qos. reliable None, depth None or deadline None leave
+" that policy to the topic qos given to ChannelFactory.Init.
+"
+" dds matches a reader only with writers offering at least what it requests:
+" a reliable reader does not match a best effort writer, and a reader with a
+" deadline does not match a writer without one. the robot's own writers use
+" the default qos, so give subscribers of robot topics no deadline; on our
+" own writers a deadline reports loop stalls as offered deadline misses.
+"""
+class QosProfile:
+    def __init__(self, name: str, reliable: bool = None, depth: int = None, deadline: float = None,
+                 maxBlocking: float = 0.1):
+        self.name = name
+        self.reliable = reliable
+        self.depth = depth
+        self.deadline = deadline
+        self.maxBlocking = maxBlocking
+        self.__qos = None
+        self.__built = False
+
+    def ToQos(self):
+        # cyclonedds Qos, None when the profile sets no policy
+        if not self.__built:
+            policies = []
+            if self.reliable is not None:
+                if self.reliable:
+                    policies.append(Policy.Reliability.Reliable(max_blocking_time=duration(seconds=self.maxBlocking)))
+                else:
+                    policies.append(Policy.Reliability.BestEffort)
+            if self.depth is not None:
+                policies.append(Policy.History.KeepLast(self.depth))
+            if self.deadline is not None:
+                policies.append(Policy.Deadline(duration(seconds=self.deadline)))
+            self.__qos = Qos(*policies) if policies else None
+            self.__built = True
+        return self.__qos
+
+    def __str__(self):
+        return f"QosProfile(name={self.name}, reliable={self.reliable}, depth={self.depth}, deadline={self.deadline})"
+
+
+"""
+" builtin profiles
+" control: high rate command writers (rt/arm_sdk, dex3 cmd). keep last 1, a
+"          command not yet delivered is replaced by the next one instead of
+"          queueing up. reliability is left as is, a best effort writer would
+"          not match a reliable reader on the robot.
+" state:   high rate state readers, best effort keep last 1: only the newest
+"          sample matters, and a best effort reader matches any writer.
+" rpc:     request/response topics, reliable with some history so that a
+"          burst of requests is not overwritten before it is taken.
+"""
+QOS_PROFILE_DEFAULT = "default"
+QOS_PROFILE_CONTROL = "control"
+QOS_PROFILE_STATE = "state"
+QOS_PROFILE_RPC = "rpc"
+
+__profiles = {
+    QOS_PROFILE_DEFAULT: QosProfile(QOS_PROFILE_DEFAULT),
+    QOS_PROFILE_CONTROL: QosProfile(QOS_PROFILE_CONTROL, depth=1),
+    QOS_PROFILE_STATE: QosProfile(QOS_PROFILE_STATE, reliable=False, depth=1),
+    QOS_PROFILE_RPC: QosProfile(QOS_PROFILE_RPC, reliable=True, depth=16, maxBlocking=1.0),
+}
+__lock = threading.Lock()
+
+
+"""
+" function QosProfileRegister / QosProfileGet / QosResolve
+"""
+def QosProfileRegister(profile: QosProfile):
+    # adds or replaces a profile, channels created afterwards use it
+    with __lock:
+        __profiles[profile.name] = profile
+
+def QosProfileGet(name: str):
+    with __lock:
+        return __profiles.get(name)
+
+def QosResolve(qos: Any):
+    # None, a profile name, a QosProfile or a cyclonedds Qos -> cyclonedds Qos or None
+    if qos is None or isinstance(qos, Qos):
+        return qos
+    if isinstance(qos, QosProfile):
+        return qos.ToQos()
+
+    profile = QosProfileGet(qos)
+    if profile is None:
+        print("[ChannelQos] unknown qos profile:", qos, ", default qos used")
+        return None
+    return profile.ToQos()
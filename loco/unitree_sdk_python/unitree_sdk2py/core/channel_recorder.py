@@ -0,0 +1,400 @@
+import os
+import json
+import mmap
+import time
+import struct
+import importlib
+from threading import Thread, Lock
+from typing import Any, Callable
+
+from .channel import ChannelSubscriber, ChannelPublisher
+from ..utils.ring_buffer import RingBuffer, OverflowPolicy
+
+
+"""
+" log format
+"
+" data file, append only, grown and memory-mapped one chunk at a time:
+"   file header  <8sIIqq>   magic, version, chunk size, wall clock ns and monotonic ns at start
+"   records      <qIHH>     monotonic receive time ns, payload length, topic id, kind
+"                payload    serialized CDR bytes (kind SAMPLE) or topic json (kind TOPIC), 8 bytes aligned
+"   a record never crosses a chunk boundary, the rest of a chunk is left empty.
+"
+" index file (<data>.idx), one fixed size entry per sample record, ordered by time:
+"   header       <8sI>      magic, version
+"   entries      <qQIHH>    time ns, data offset, payload length, topic id, kind
+"   fixed size entries are binary searched in place, seek is O(log n) on any log size.
+"
+" topic file (<data>.topics), one json line {"id", "name", "type"} per topic,
+" the same as the TOPIC records in the data file, so opening a log reads no samples.
+"""
+LOG_MAGIC = b"UTRECLOG"
+INDEX_MAGIC = b"UTRECIDX"
+LOG_VERSION = 1
+
+LOG_HEADER = struct.Struct("<8sIIqq")
+LOG_HEADER_SIZE = 64
+RECORD_HEADER = struct.Struct("<qIHH")
+INDEX_HEADER = struct.Struct("<8sI")
+INDEX_HEADER_SIZE = 16
+INDEX_ENTRY = struct.Struct("<qQIHH")
+
+RECORD_KIND_SAMPLE = 0
+RECORD_KIND_TOPIC = 1
+
+
+def _Align8(size: int):
+    return (size + 7) & ~7
+
+
+def _ResolveType(typename: str):
+    # "unitree_hg.msg.dds_.LowState_" -> unitree_sdk2py.idl.unitree_hg.msg.dds_.LowState_
+    moduleName, _, className = typename.rpartition(".")
+    module = importlib.import_module("unitree_sdk2py.idl." + moduleName)
+    return getattr(module, className)
+
+
+"""
+" class ChannelRecorder
+" subscribes the given topics and appends every sample to a log. the dds
+" listener only stamps and queues the sample, serialization and file io run
+" on the recorder thread. Record serializes right away instead: its caller
+" may reuse and change the sample as soon as it returns.
+"""
+class ChannelRecorder:
+    def __init__(self, path: str, chunkSize: int = 64 * 1024 * 1024, queueLen: int = 4096):
+        self.__path = path
+        self.__chunkSize = _Align8(max(chunkSize, 4096))
+        self.__queue = RingBuffer(queueLen, OverflowPolicy.DROP_OLDEST)
+        # the ring buffer is single producer, the listeners of all topics and Record put in turn
+        self.__putLock = Lock()
+        self.__lock = Lock()
+        self.__topics = {}
+        self.__subscribers = []
+        self.__thread = None
+        self.__quit = False
+
+        self.__fd = None
+        self.__chunk = None
+        self.__chunkStart = 0
+        self.__chunkPos = 0
+        self.__index = None
+        self.__topicFile = None
+        self.__lastStamp = 0
+
+        self.__records = 0
+        self.__bytes = 0
+        self.__dropped = 0
+
+    def Open(self):
+        self.__fd = os.open(self.__path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        self.__MapChunk(0)
+        header = LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, self.__chunkSize, time.time_ns(), time.monotonic_ns())
+        self.__chunk[0:len(header)] = header
+        self.__chunkPos = LOG_HEADER_SIZE
+
+        self.__index = open(self.__path + ".idx", "wb")
+        self.__index.write(INDEX_HEADER.pack(INDEX_MAGIC, LOG_VERSION).ljust(INDEX_HEADER_SIZE, b"\0"))
+        self.__topicFile = open(self.__path + ".topics", "w")
+
+        self.__thread = Thread(target=self.__RecorderThreadFunc, name="ch_recorder", daemon=True)
+        self.__thread.start()
+        return True
+
+    def AddTopic(self, name: str, type: Any):
+        topicId = self.__RegistTopic(name, type)
+        subscriber = ChannelSubscriber(name, type)
+        subscriber.Init(lambda sample: self.__Enqueue(topicId, sample))
+        self.__subscribers.append(subscriber)
+
+    def Record(self, name: str, sample: Any):
+        # for samples this process writes itself, e.g. the commands it publishes
+        stamp = time.monotonic_ns()
+        topicId = self.__topics.get(name)
+        if topicId is None:
+            topicId = self.__RegistTopic(name, type(sample))
+        try:
+            payload = sample.serialize()
+        except Exception as e:
+            print("[ChannelRecorder] serialize sample error. msg:", e.args)
+            self.__dropped += 1
+            return
+        with self.__putLock:
+            self.__queue.Put((stamp, topicId, payload))
+
+    def Close(self):
+        for subscriber in self.__subscribers:
+            subscriber.Close()
+        self.__subscribers = []
+
+        self.__quit = True
+        self.__queue.Interrupt()
+        if self.__thread is not None:
+            self.__thread.join()
+
+        with self.__lock:
+            # take what is left after the thread stopped
+            for item in self.__queue.GetMany(0, 0):
+                self.__WriteSample(*item)
+
+            if self.__chunk is not None:
+                self.__chunk.flush()
+                self.__chunk.close()
+                self.__chunk = None
+            if self.__fd is not None:
+                os.ftruncate(self.__fd, self.__chunkStart + self.__chunkPos)
+                os.close(self.__fd)
+                self.__fd = None
+            if self.__index is not None:
+                self.__index.close()
+                self.__index = None
+            if self.__topicFile is not None:
+                self.__topicFile.close()
+                self.__topicFile = None
+
+    def GetStats(self):
+        return {"records": self.__records, "bytes": self.__bytes,
+                "dropped": self.__dropped + self.__queue.GetOverflowCount()}
+
+    def __RegistTopic(self, name: str, type: Any):
+        with self.__lock:
+            topicId = self.__topics.get(name)
+            if topicId is not None:
+                return topicId
+            topicId = len(self.__topics)
+            self.__topics[name] = topicId
+            topic = json.dumps({"id": topicId, "name": name, "type": type.__idl_typename__})
+            self.__Append(time.monotonic_ns(), topicId, RECORD_KIND_TOPIC, topic.encode())
+            self.__topicFile.write(topic + "\n")
+            self.__topicFile.flush()
+            return topicId
+
+    def __Enqueue(self, topicId: int, sample: Any):
+        stamp = time.monotonic_ns()
+        with self.__putLock:
+            self.__queue.Put((stamp, topicId, sample))
+
+    def __RecorderThreadFunc(self):
+        while not self.__quit:
+            items = self.__queue.GetMany()
+            with self.__lock:
+                for item in items:
+                    self.__WriteSample(*item)
+            self.__index.flush()
+
+    def __WriteSample(self, stamp: int, topicId: int, sample: Any):
+        # sample, or its payload already serialized by Record
+        if isinstance(sample, bytes):
+            self.__Append(stamp, topicId, RECORD_KIND_SAMPLE, sample)
+            return
+        try:
+            payload = sample.serialize()
+        except Exception as e:
+            print("[ChannelRecorder] serialize sample error. msg:", e.args)
+            self.__dropped += 1
+            return
+        self.__Append(stamp, topicId, RECORD_KIND_SAMPLE, payload)
+
+    def __Append(self, stamp: int, topicId: int, kind: int, payload: bytes):
+        # called with the lock held
+        size = RECORD_HEADER.size + _Align8(len(payload))
+        if size > self.__chunkSize:
+            print("[ChannelRecorder] record larger than chunk size, dropped. size:", size)
+            self.__dropped += 1
+            return
+
+        if self.__chunkPos + size > self.__chunkSize:
+            self.__MapChunk(self.__chunkStart + self.__chunkSize)
+
+        # listeners of different topics stamp concurrently, keep the index ordered
+        stamp = max(stamp, self.__lastStamp)
+        self.__lastStamp = stamp
+
+        pos = self.__chunkPos
+        RECORD_HEADER.pack_into(self.__chunk, pos, stamp, len(payload), topicId, kind)
+        self.__chunk[pos + RECORD_HEADER.size:pos + RECORD_HEADER.size + len(payload)] = payload
+        self.__chunkPos = pos + size
+
+        if kind == RECORD_KIND_SAMPLE:
+            offset = self.__chunkStart + pos
+            self.__index.write(INDEX_ENTRY.pack(stamp, offset, len(payload), topicId, kind))
+        self.__records += 1
+        self.__bytes += size
+
+    def __MapChunk(self, start: int):
+        if self.__chunk is not None:
+            self.__chunk.flush()
+            self.__chunk.close()
+        os.ftruncate(self.__fd, start + self.__chunkSize)
+        self.__chunk = mmap.mmap(self.__fd, self.__chunkSize, offset=start)
+        self.__chunkStart = start
+        self.__chunkPos = 0
+
+
+"""
+" class ChannelLogReader
+" random access to a recorded log. data and index are memory-mapped, entries
+" are addressed by position in the index and found by time with a binary search.
+"""
+class ChannelLogReader:
+    def __init__(self, path: str):
+        self.__path = path
+        self.__dataFile = None
+        self.__indexFile = None
+        self.__data = None
+        self.__index = None
+        self.__count = 0
+        self.__topics = {}
+        self.__types = {}
+        self.__wallStart = 0
+        self.__monoStart = 0
+
+    def Open(self):
+        self.__dataFile = open(self.__path, "rb")
+        self.__data = mmap.mmap(self.__dataFile.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.__wallStart, self.__monoStart = LOG_HEADER.unpack_from(self.__data, 0)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            print("[ChannelLogReader] not a channel log. path:", self.__path)
+            return False
+
+        self.__indexFile = open(self.__path + ".idx", "rb")
+        self.__index = mmap.mmap(self.__indexFile.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = INDEX_HEADER.unpack_from(self.__index, 0)
+        if magic != INDEX_MAGIC or version != LOG_VERSION:
+            print("[ChannelLogReader] bad index file. path:", self.__path + ".idx")
+            return False
+
+        # a partly written last entry is ignored
+        self.__count = (len(self.__index) - INDEX_HEADER_SIZE) // INDEX_ENTRY.size
+
+        with open(self.__path + ".topics") as f:
+            for line in f:
+                if line.strip():
+                    topic = json.loads(line)
+                    self.__topics[topic["id"]] = topic
+        return True
+
+    def Close(self):
+        for m in (self.__data, self.__index):
+            if m is not None:
+                m.close()
+        for f in (self.__dataFile, self.__indexFile):
+            if f is not None:
+                f.close()
+        self.__data = self.__index = self.__dataFile = self.__indexFile = None
+
+    def GetCount(self):
+        return self.__count
+
+    def GetTopics(self):
+        # {topic id: {"name": ..., "type": ...}}
+        return dict(self.__topics)
+
+    def GetTimeRange(self):
+        if self.__count == 0:
+            return None, None
+        return self.__Entry(0)[0], self.__Entry(self.__count - 1)[0]
+
+    def ToWallTime(self, stamp: int):
+        # monotonic record time ns to wall clock seconds
+        return (self.__wallStart + stamp - self.__monoStart) / 1e9
+
+    def Seek(self, stamp: int):
+        # position of the first entry at or after stamp
+        lo, hi = 0, self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__Entry(mid)[0] < stamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def GetRaw(self, position: int):
+        # (stamp, topic name, serialized payload as memoryview)
+        stamp, offset, length, topicId, kind = self.__Entry(position)
+        return stamp, self.__topics[topicId]["name"], self.__Payload(offset, length)
+
+    def Get(self, position: int):
+        # (stamp, topic name, sample)
+        stamp, offset, length, topicId, kind = self.__Entry(position)
+        return stamp, self.__topics[topicId]["name"], self.__Deserialize(topicId, self.__Payload(offset, length))
+
+    def Iterate(self, start: int = None, end: int = None, topics: list = None):
+        # samples with start <= stamp < end, optionally only the named topics
+        first = 0 if start is None else self.Seek(start)
+        last = self.__count if end is None else self.Seek(end)
+        topicIds = None
+        if topics is not None:
+            topicIds = {id for id, topic in self.__topics.items() if topic["name"] in topics}
+
+        for position in range(first, last):
+            stamp, offset, length, topicId, kind = self.__Entry(position)
+            if topicIds is not None and topicId not in topicIds:
+                continue
+            yield stamp, self.__topics[topicId]["name"], self.__Deserialize(topicId, self.__Payload(offset, length))
+
+    def GetType(self, topicId: int):
+        type = self.__types.get(topicId)
+        if type is None:
+            type = self.__types[topicId] = _ResolveType(self.__topics[topicId]["type"])
+        return type
+
+    def __Entry(self, position: int):
+        return INDEX_ENTRY.unpack_from(self.__index, INDEX_HEADER_SIZE + position * INDEX_ENTRY.size)
+
+    def __Payload(self, offset: int, length: int):
+        start = offset + RECORD_HEADER.size
+        return memoryview(self.__data)[start:start + length]
+
+    def __Deserialize(self, topicId: int, payload: memoryview):
+        return self.GetType(topicId).deserialize(bytes(payload))
+
+
+"""
+" class ChannelPlayer
+" replays a log in record time order, either republished through
+" ChannelPublisher or handed to a callback(stamp, name, sample).
+" speed 1.0 is real time, 0 replays as fast as possible.
+"""
+class ChannelPlayer:
+    def __init__(self, reader: ChannelLogReader):
+        self.__reader = reader
+        self.__publishers = {}
+        self.__quit = False
+
+    def Play(self, speed: float = 1.0, start: int = None, end: int = None, topics: list = None,
+             callback: Callable = None, publish: bool = True):
+        self.__quit = False
+        firstStamp = None
+        wallStart = time.monotonic()
+        count = 0
+
+        for stamp, name, sample in self.__reader.Iterate(start, end, topics):
+            if self.__quit:
+                break
+
+            if speed > 0.0:
+                if firstStamp is None:
+                    firstStamp = stamp
+                delay = wallStart + (stamp - firstStamp) / 1e9 / speed - time.monotonic()
+                if delay > 0.0:
+                    time.sleep(delay)
+
+            if publish:
+                self.__GetPublisher(name, type(sample)).Write(sample)
+            if callback is not None:
+                callback(stamp, name, sample)
+            count += 1
+
+        return count
+
+    def Stop(self):
+        self.__quit = True
+
+    def __GetPublisher(self, name: str, type: Any):
+        publisher = self.__publishers.get(name)
+        if publisher is None:
+            publisher = self.__publishers[name] = ChannelPublisher(name, type)
+            publisher.Init()
+        return publisher
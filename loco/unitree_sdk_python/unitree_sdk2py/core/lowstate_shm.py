@@ -0,0 +1,414 @@
+import os
+import sys
+import time
+import zlib
+from threading import Thread, Event
+from typing import Any, Callable
+
+import numpy as np
+from multiprocessing import shared_memory
+
+from .channel import ChannelSubscriber, LatestSample
+from .channel_qos import QOS_PROFILE_STATE
+from ..utils.state_decoder import LowStateDtype, LowStateDecoder
+
+
+"""
+" shared memory lowstate
+"
+" one LowStateDaemon subscribes rt/lowstate (unitree_hg LowState_), decodes
+" each sample once and stores it in a named shared memory block. any number
+" of LowStateView in other processes attach to the block and read it without
+" dds or deserialization.
+"
+" the block is one LOWSTATE_DTYPE record (header + the LowStateDecoder
+" record as "state") guarded by a seqlock: the writer
+" makes seq odd, writes the fields, then makes it even again. a reader copies
+" the record and keeps the copy only if seq was even and unchanged around the
+" copy, so every reader gets a whole sample and never blocks the writer.
+" stamp is time.monotonic() of the write, comparable between processes.
+"
+" numpy stores and loads carry no memory fences: on a weakly ordered cpu
+" (aarch64) a reader may see the new seq before the field stores, or read the
+" fields after its re-check. the writer therefore also stores crc, a crc32 of
+" everything from seq to the end of the record, after the new seq. a copy is
+" kept only if its crc matches its content, a torn copy is retried.
+"""
+LOWSTATE_SHM_NAME = "unitree_lowstate"
+LOWSTATE_SHM_MAGIC = 0x4C535348
+LOWSTATE_SHM_VERSION = 3
+MOTOR_COUNT = 35
+
+STATE_DTYPE = LowStateDtype(motorCount=MOTOR_COUNT)
+LOWSTATE_DTYPE = np.dtype([
+    ("magic", "<u4"), ("version", "<u4"), ("crc", "<u4"), ("seq", "<u8"), ("stamp", "<f8"), ("pid", "<u4"),
+    ("state", STATE_DTYPE),
+], align=True)
+
+# the crc covers seq .. end of the record
+CRC_START = LOWSTATE_DTYPE.fields["seq"][1]
+
+# copy attempts before a read gives up, a write takes tens of microseconds
+READ_RETRY = 1000
+
+
+# the block is never left to the multiprocessing resource tracker: before 3.13 every
+# attaching process registers it, and the first of them to exit would unlink it.
+# the daemon unlinks it on Close, and takes over a block left by a daemon that died.
+def _OpenShm(name: str, create: bool = False):
+    size = LOWSTATE_DTYPE.itemsize if create else 0
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, create, size, track=False)
+
+    shm = shared_memory.SharedMemory(name, create, size)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+def _UnlinkShm(shm: shared_memory.SharedMemory):
+    if sys.version_info < (3, 13):
+        # unlink unregisters the block, register it first to keep the tracker balanced
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.register(shm._name, "shared_memory")
+        except Exception:
+            pass
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _Checksum(buffer):
+    return zlib.crc32(buffer[CRC_START:LOWSTATE_DTYPE.itemsize])
+
+
+def _ProcessAlive(pid: int):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+"""
+" class MotorStateView / IMUStateView
+" read only LowState_ style access to one motor / the imu of a LowStateSample.
+"""
+class MotorStateView:
+    def __init__(self, record: np.ndarray, index: int):
+        self.__record = record
+        self.__index = index
+
+    @property
+    def mode(self):
+        return int(self.__record["mode"][self.__index])
+
+    @property
+    def q(self):
+        return float(self.__record["q"][self.__index])
+
+    @property
+    def dq(self):
+        return float(self.__record["dq"][self.__index])
+
+    @property
+    def ddq(self):
+        return float(self.__record["ddq"][self.__index])
+
+    @property
+    def tau_est(self):
+        return float(self.__record["tau_est"][self.__index])
+
+    @property
+    def temperature(self):
+        return self.__record["temperature"][self.__index].tolist()
+
+    @property
+    def vol(self):
+        return float(self.__record["vol"][self.__index])
+
+    @property
+    def motorstate(self):
+        return int(self.__record["motorstate"][self.__index])
+
+
+class IMUStateView:
+    def __init__(self, record: np.ndarray):
+        self.__record = record
+
+    @property
+    def quaternion(self):
+        return self.__record["quaternion"].tolist()
+
+    @property
+    def gyroscope(self):
+        return self.__record["gyroscope"].tolist()
+
+    @property
+    def accelerometer(self):
+        return self.__record["accelerometer"].tolist()
+
+    @property
+    def rpy(self):
+        return self.__record["rpy"].tolist()
+
+    @property
+    def temperature(self):
+        return int(self.__record["imu_temperature"])
+
+
+"""
+" class LowStateSample
+" a consistent copy of the shared block. LowState_ attribute access
+" (motor_state[i].q, imu_state.rpy, tick, ...) for drop-in use, and the
+" per joint numpy arrays (q, dq, tau_est, temperature, ...) for vector code.
+"""
+class LowStateSample:
+    def __init__(self, record: np.ndarray):
+        self.__record = record
+        self.__state = record["state"]
+        self.__motorState = None
+        self.imu_state = IMUStateView(self.__state)
+
+    @property
+    def motor_state(self):
+        if self.__motorState is None:
+            self.__motorState = [MotorStateView(self.__state, i) for i in range(MOTOR_COUNT)]
+        return self.__motorState
+
+    def __getattr__(self, name: str):
+        # q, dq, ddq, tau_est, temperature, vol, motorstate, quaternion, ... as arrays
+        if name in STATE_DTYPE.names:
+            value = self.__state[name]
+        elif name in ("seq", "stamp"):
+            value = self.__record[name]
+        else:
+            raise AttributeError(name)
+        return value if value.ndim > 0 else value.item()
+
+    def GetRecord(self):
+        return self.__record
+
+    def GetState(self):
+        # the LowStateDecoder record of this sample
+        return self.__state
+
+
+"""
+" class LowStateDaemon
+"""
+class LowStateDaemon:
+    def __init__(self, name: str = LOWSTATE_SHM_NAME, topic: str = "rt/lowstate"):
+        self.__name = name
+        self.__topic = topic
+        self.__shm = None
+        self.__block = None
+        self.__decoder = None
+        self.__subscriber = None
+        self.__count = 0
+        self.__decodeTime = 0.0
+
+    def Init(self, subscribe: bool = True):
+        # subscribe=False only creates the block, samples come from Write (simulator bridge, replay)
+        try:
+            self.__shm = _OpenShm(self.__name, True)
+        except FileExistsError:
+            shm = _OpenShm(self.__name)
+            if shm.size < LOWSTATE_DTYPE.itemsize:
+                print("[LowStateDaemon] shared memory size mismatch. name:", self.__name)
+                shm.close()
+                return False
+
+            record = np.ndarray((1,), LOWSTATE_DTYPE, buffer=shm.buf)
+            pid = int(record["pid"][0])
+            del record
+            if pid != 0 and _ProcessAlive(pid):
+                print("[LowStateDaemon] another daemon is running. pid:", pid)
+                shm.close()
+                return False
+            # left over by a daemon that died, take it over
+            self.__shm = shm
+
+        self.__block = np.ndarray((1,), LOWSTATE_DTYPE, buffer=self.__shm.buf)
+        self.__block[0] = np.zeros((), LOWSTATE_DTYPE)
+        self.__block["magic"] = LOWSTATE_SHM_MAGIC
+        self.__block["version"] = LOWSTATE_SHM_VERSION
+        self.__block["pid"] = os.getpid()
+        # decodes straight into the shared block
+        self.__decoder = LowStateDecoder(motorCount=MOTOR_COUNT, out=self.__block["state"].reshape(()))
+
+        if subscribe:
+            from ..idl.unitree_hg.msg.dds_ import LowState_
+            self.__subscriber = ChannelSubscriber(self.__topic, LowState_, QOS_PROFILE_STATE)
+            # decode in the listener thread, no queue: a late sample is replaced by the next one anyway
+            self.__subscriber.Init(self.Write)
+
+        return True
+
+    def Write(self, msg: Any):
+        start = time.perf_counter()
+        block = self.__block
+        seqField = block["seq"]
+        seq = int(seqField[0])
+        if len(msg.motor_state) < MOTOR_COUNT:
+            print("[LowStateDaemon] lowstate with too few motors:", len(msg.motor_state))
+            return
+
+        # odd seq: write in progress
+        seqField[0] = seq + 1
+        self.__decoder.Decode(msg)
+        block["stamp"] = time.monotonic()
+        seqField[0] = seq + 2
+        # last: a reader that sees any store of this write out of order fails the crc
+        block["crc"] = _Checksum(self.__shm.buf)
+
+        self.__count += 1
+        self.__decodeTime += time.perf_counter() - start
+
+    def GetStats(self):
+        return {"samples": self.__count,
+                "decodeMean": self.__decodeTime / self.__count if self.__count else None}
+
+    def Close(self):
+        if self.__subscriber is not None:
+            self.__subscriber.Close()
+            self.__subscriber = None
+
+        if self.__shm is not None:
+            self.__decoder = None
+            self.__block = None
+            self.__shm.close()
+            _UnlinkShm(self.__shm)
+            self.__shm = None
+
+
+"""
+" class LowStateView
+" ChannelSubscriber style reader of the daemon's block: Read, ReadLatest,
+" WaitNewer and an optional handler, fed by polling seq since a shared
+" memory block has no cross process notification.
+"""
+class LowStateView:
+    def __init__(self, name: str = LOWSTATE_SHM_NAME):
+        self.__name = name
+        self.__shm = None
+        self.__block = None
+        self.__seqField = None
+        self.__lastRead = 0
+        self.__pollInterval = 0.001
+        self.__handler = None
+        self.__thread = None
+        self.__threadEvent = None
+
+    def Init(self, handler: Callable = None, pollInterval: float = 0.001):
+        try:
+            self.__shm = _OpenShm(self.__name)
+        except FileNotFoundError:
+            print("[LowStateView] shared memory not found, is the lowstate daemon running? name:", self.__name)
+            return False
+
+        if self.__shm.size < LOWSTATE_DTYPE.itemsize:
+            print("[LowStateView] shared memory size mismatch. name:", self.__name)
+            self.__shm.close()
+            self.__shm = None
+            return False
+
+        self.__block = np.ndarray((1,), LOWSTATE_DTYPE, buffer=self.__shm.buf)
+        if self.__block["magic"][0] != LOWSTATE_SHM_MAGIC or self.__block["version"][0] != LOWSTATE_SHM_VERSION:
+            print("[LowStateView] shared memory layout mismatch. name:", self.__name)
+            self.Close()
+            return False
+
+        self.__seqField = self.__block["seq"]
+        self.__pollInterval = pollInterval
+
+        if handler is not None:
+            self.__handler = handler
+            self.__threadEvent = Event()
+            self.__thread = Thread(target=self.__PollThreadFunc, name="lowstate_view", daemon=True)
+            self.__thread.start()
+
+        return True
+
+    def GetSeq(self):
+        # samples written so far
+        return int(self.__seqField[0]) >> 1
+
+    def ReadLatest(self):
+        # LatestSample like ChannelSubscriber keep latest mode, None before the first sample
+        buffer = self.__shm.buf
+        for _ in range(READ_RETRY):
+            seq = int(self.__seqField[0])
+            if not seq & 1:
+                raw = bytes(buffer[:LOWSTATE_DTYPE.itemsize])
+                record = np.frombuffer(raw, LOWSTATE_DTYPE).reshape(())
+                if int(self.__seqField[0]) == seq and int(record["seq"]) == seq:
+                    if seq == 0:
+                        return None
+                    if _Checksum(raw) == int(record["crc"]):
+                        return LatestSample(LowStateSample(record), seq >> 1, float(record["stamp"]))
+            # write in progress, let the writer run (it may be a thread of this process)
+            time.sleep(0)
+
+        print("[LowStateView] read retry limit reached")
+        return None
+
+    def WaitNewer(self, seq: int = 0, timeout: float = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.GetSeq() <= seq:
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(self.__pollInterval)
+        return self.ReadLatest()
+
+    def ReadFresh(self, maxAge: float = 0.0, timeout: float = None):
+        # like ChannelSubscriber.ReadFresh, timestamp is the daemon's receive time
+        latest = self.ReadLatest()
+        if latest is not None and time.monotonic() - latest.timestamp <= maxAge:
+            return latest
+        return self.WaitNewer(0 if latest is None else latest.seq, timeout)
+
+    def Read(self, timeout: float = None):
+        # like ChannelSubscriber.Read: the next sample not returned before, None on timeout
+        latest = self.WaitNewer(self.__lastRead, timeout)
+        if latest is None:
+            return None
+        self.__lastRead = latest.seq
+        return latest.sample
+
+    def GetAge(self):
+        # seconds since the last write, None before the first sample
+        latest = self.ReadLatest()
+        return None if latest is None else time.monotonic() - latest.timestamp
+
+    def Close(self):
+        if self.__thread is not None:
+            self.__threadEvent.set()
+            self.__thread.join()
+            self.__thread = None
+
+        if self.__shm is not None:
+            self.__seqField = None
+            self.__block = None
+            self.__shm.close()
+            self.__shm = None
+
+    def __PollThreadFunc(self):
+        seq = self.GetSeq()
+        while not self.__threadEvent.is_set():
+            if self.GetSeq() > seq:
+                latest = self.ReadLatest()
+                if latest is not None:
+                    seq = latest.seq
+                    try:
+                        self.__handler(latest.sample)
+                    except Exception as e:
+                        print("[LowStateView] handler error. msg:", e.args)
+            self.__threadEvent.wait(self.__pollInterval)
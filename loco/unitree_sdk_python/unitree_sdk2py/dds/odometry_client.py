@@ -106,13 +106,13 @@ class OdometryClient:
             # 创建高频订阅器
             if self.use_high_freq:
                 self.high_freq_sub = ChannelSubscriber(self.TOPIC_HIGH_FREQ, SportModeState_)
-                self.high_freq_sub.Init(self._high_freq_handler, 1)
+                self.high_freq_sub.Init(self._high_freq_handler)
                 print(f"✅ 高频订阅器已创建: {self.TOPIC_HIGH_FREQ}")
             
             # 创建低频订阅器
             if self.use_low_freq:
                 self.low_freq_sub = ChannelSubscriber(self.TOPIC_LOW_FREQ, SportModeState_)
-                self.low_freq_sub.Init(self._low_freq_handler, 1)
+                self.low_freq_sub.Init(self._low_freq_handler)
                 print(f"✅ 低频订阅器已创建: {self.TOPIC_LOW_FREQ}")
             
             return True
@@ -25,6 +25,10 @@ from typing import Optional, List, Tuple, Dict, Any
 from dataclasses import dataclass
 
 from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber, ChannelFactoryInitialize
+from unitree_sdk2py.core.channel_qos import QOS_PROFILE_CONTROL, QOS_PROFILE_STATE
+from unitree_sdk2py.utils.thread import PeriodicTimer, OverrunPolicy, RecurrentThread
+from unitree_sdk2py.utils.motion_handle import MotionHandle
+from unitree_sdk2py.utils.trajectory import JointTrajectory, TrajectoryDuration, WaypointTrajectory, PROFILE_TRAPEZOID
 
 
 @dataclass
@@ -51,6 +55,14 @@ class Dex3Config:
     # 时间控制参数
     control_dt: float = 0.02  # 控制周期 20ms
     max_joint_velocity: float = 1.0  # 最大关节速度 rad/s
+    max_joint_acceleration: float = 8.0  # 最大关节加速度 rad/s²
+    
+    # 轨迹类型: "trapezoid" 梯形速度 / "quintic" 五次多项式(最小冲击) / "step" 旧算法(每周期限幅逼近)
+    trajectory_profile: str = "trapezoid"
+    
+    # 轨迹规划的逐关节速度/加速度上限 (rad/s, rad/s², 7个关节), None 时取 max_joint_velocity / max_joint_acceleration
+    motion_velocity_limits: List[float] = None
+    motion_acceleration_limits: List[float] = None
     
     # 安全参数 (已废弃,使用 torque_limits)
     max_torque: float = 2.0  # 最大扭矩 (N·m) - 向后兼容
@@ -127,6 +139,40 @@ class Dex3Config:
                 12.0,  # 右食指基部 (index_0): 12 rad/s
                 12.0,  # 右食指指尖 (index_1): 12 rad/s
             ]
+        
+        if self.motion_velocity_limits is None:
+            self.motion_velocity_limits = [self.max_joint_velocity] * 7
+        
+        if self.motion_acceleration_limits is None:
+            self.motion_acceleration_limits = [self.max_joint_acceleration] * 7
+
+
+class _HandMotion:
+    """
+    流式控制中的一次运动: 接收时从当前期望位置规划整段轨迹, 之后每个周期只取下一个采样点
+    """
+    
+    def __init__(self, handle: MotionHandle, planner, kp: Optional[float] = None, kd: Optional[float] = None):
+        self.handle = handle
+        self.kp = kp
+        self.kd = kd
+        self._planner = planner
+        self._trajectory = None
+        self._index = 0
+    
+    def begin(self, q: List[float]):
+        """控制线程接收运动时调用, planner(q) 返回 JointTrajectory / WaypointTrajectory"""
+        self._trajectory = self._planner(q)
+    
+    def step(self) -> Tuple[List[float], List[float]]:
+        """前进一个周期, 返回 (位置, 速度前馈)"""
+        positions = self._trajectory.positions[self._index].tolist()
+        velocities = self._trajectory.velocities[self._index].tolist()
+        self._index += 1
+        return positions, velocities
+    
+    def done(self) -> bool:
+        return self._index >= len(self._trajectory)
 
 
 class Dex3Client:
@@ -143,6 +189,11 @@ class Dex3Client:
         dex3.initialize_hand()
         dex3.set_gesture("open")
         dex3.stop_control()
+    
+    流式控制 (start_streaming()):
+        控制线程 (或外部时钟, 如 WholeBodyController) 按 control_dt 周期推进轨迹并发布,
+        set_joint_positions(wait=False) 立即返回 MotionHandle, 新目标抢占当前运动;
+        没有运动时不发布, 手保持最后的命令。流式控制期间所有运动都经由控制循环发布。
     """
     
     def __init__(
@@ -164,10 +215,6 @@ class Dex3Client:
         self._cmd_publisher: Optional[ChannelPublisher] = None
         self._state_subscriber: Optional[ChannelSubscriber] = None
         
-        # 状态缓存
-        self._latest_state: Optional[Any] = None
-        self._state_lock = threading.Lock()
-        
         # 常量
         self.MOTOR_MAX = 7
         self.SENSOR_MAX = 9
@@ -175,6 +222,7 @@ class Dex3Client:
         # 控制参数
         self._max_joint_delta = self.config.max_joint_velocity * self.config.control_dt
         self._sleep_duration = self.config.control_dt
+        self.last_loop_stats = None  # 最近一次控制循环的定时统计
         self._current_jpos_des = [0.0] * self.MOTOR_MAX
         
         # 预定义位置 - 基于实际弧度值
@@ -187,6 +235,13 @@ class Dex3Client:
             else [0.005, -0.616, -0.085, -0.019, -0.035, -0.018, -0.025]
         )
         
+        # 流式控制状态 (由 _stream_lock 保护)
+        self._stream_lock = threading.Lock()
+        self._stream_thread: Optional[RecurrentThread] = None
+        self._stream_external = False    # 外部时钟驱动 (step_stream), 无自有线程
+        self._stream_motion = None       # 当前运动 (_HandMotion)
+        self._stream_pending = None      # 下一个周期接收的运动
+        
         # 初始化DDS连接
         self._init_dds_connection()
     
@@ -197,39 +252,56 @@ class Dex3Client:
         if self._interface:
             ChannelFactoryInitialize(0, self._interface)
         
-        self._cmd_publisher = ChannelPublisher(self._cmd_topic, HandCmd_)
+        self._cmd_publisher = ChannelPublisher(self._cmd_topic, HandCmd_, QOS_PROFILE_CONTROL)  # 只保留最新指令, 不排队重传
         self._cmd_publisher.Init()
         
-        self._state_subscriber = ChannelSubscriber(self._state_topic, HandState_)
-        self._state_subscriber.Init(self._state_callback, 10)
+        self._state_subscriber = ChannelSubscriber(self._state_topic, HandState_, QOS_PROFILE_STATE)
+        self._state_subscriber.Init(keepLatest=True, drainLen=16)  # 只保留最新样本, 无额外线程; 积压时一次取完
         
-        time.sleep(1.0)
+        # 等待连接就绪 (命令话题匹配 + 收到首个状态消息), 最多1秒, 代替固定等待
+        deadline = time.monotonic() + 1.0
+        self._cmd_publisher.WaitMatched(1.0)
+        self._state_subscriber.WaitNewer(0, max(0.0, deadline - time.monotonic()))
     
-    def _state_callback(self, msg):
-        """状态消息回调"""
-        with self._state_lock:
-            self._latest_state = msg
+    def _get_latest_state(self):
+        """获取最新状态消息 (尚未收到时返回None)"""
+        latest = self._state_subscriber.ReadLatest()
+        return latest.sample if latest is not None else None
     
-    def read_state(self, timeout: float = 1.0) -> Optional[Any]:
+    def read_state(self, timeout: float = 1.0, max_age: float = 0.05) -> Optional[Any]:
         """
         读取灵巧手状态
         
+        缓存的最新状态不超过 max_age 秒时立即返回, 否则等待订阅回调通知下一帧 (不轮询)
+        
         Args:
             timeout: 超时时间(秒)
+            max_age: 可接受的状态时长(秒)
         
         Returns:
             HandState_ 消息或 None
         """
-        start_time = time.time()
-        time.sleep(0.1)
+        latest = self._state_subscriber.ReadFresh(max_age, timeout)
+        return latest.sample if latest is not None else None
+    
+    def _read_full_state(self, timeout: float = 1.0, max_age: float = 0.05):
+        """
+        读取电机数完整的灵巧手状态
         
-        while time.time() - start_time < timeout:
-            with self._state_lock:
-                if self._latest_state is not None:
-                    return self._latest_state
-            time.sleep(0.01)
+        Args:
+            timeout: 超时时间(秒)
+            max_age: 可接受的状态时长(秒)
         
-        return None
+        Returns:
+            (HandState_ 消息, 接收时间 time.monotonic()), 超时为 (None, None)
+        """
+        deadline = time.monotonic() + timeout
+        latest = self._state_subscriber.ReadFresh(max_age, timeout)
+        while latest is not None:
+            if len(latest.sample.motor_state) >= self.MOTOR_MAX:
+                return latest.sample, latest.timestamp
+            latest = self._state_subscriber.WaitNewer(latest.seq, max(0.0, deadline - time.monotonic()))
+        return None, None
     
     def _get_joint_limits(self) -> List[Tuple[float, float]]:
         """获取当前手的关节限位"""
@@ -359,46 +431,169 @@ class Dex3Client:
         self,
         start_positions: Optional[List[float]],
         target_positions: List[float],
-        duration: float,
-        description: str = ""
+        duration: Optional[float],
+        description: str = "",
+        speed_factor: float = 1.0
     ) -> bool:
         """
         平滑过渡到目标位置
         
+        trajectory_profile 为 "trapezoid"/"quintic" 时所有关节同时起停, 整段轨迹预先计算;
+        为 "step" 时每个周期每个关节最多移动 max_joint_velocity * control_dt
+        
         Args:
             start_positions: 起始位置 (None表示使用当前_current_jpos_des)
             target_positions: 目标位置
-            duration: 过渡时长(秒)
+            duration: 过渡时长(秒), None表示自动计算 (轨迹允许的最短时长, "step"类型同 set_joint_positions)
             description: 描述信息
+            speed_factor: 速度因子, 缩放速度上限 (加速度按平方缩放)
         """
         if description:
             print(f"[Dex3] {description}...")
         
-        time_steps = int(duration / self.config.control_dt)
-        
         if start_positions is not None:
             self._current_jpos_des = start_positions.copy()
         
-        start_time = time.time()
-        for i in range(time_steps):
-            for j in range(len(self._current_jpos_des)):
-                delta = target_positions[j] - self._current_jpos_des[j]
-                delta = self._clamp(delta, -self._max_joint_delta, self._max_joint_delta)
-                self._current_jpos_des[j] += delta
-            
-            cmd = self._create_hand_command(self._current_jpos_des)
-            if not self._publish_command(cmd):
+        # 流式控制: 交给控制循环执行并等待结束
+        if self.is_streaming():
+            planner = lambda q: self._plan_trajectory(q, target_positions, duration, speed_factor)
+            success = self._submit_motion(_HandMotion(MotionHandle(list(target_positions), self._cancel_motion),
+                                                      planner)).wait()
+            if description and success:
+                print(f"[Dex3] {description}完成")
+            return success
+        
+        if self.config.trajectory_profile != "step":
+            trajectory = self._plan_trajectory(self._current_jpos_des, target_positions, duration, speed_factor)
+            if not self._play_trajectory(trajectory):
                 return False
             
-            expected_time = start_time + (i + 1) * self._sleep_duration
-            sleep_time = expected_time - time.time()
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+            if description:
+                print(f"[Dex3] {description}完成")
+            return True
+        
+        if duration is None:
+            duration = self._step_duration(self._current_jpos_des, target_positions, speed_factor)
+        time_steps = int(duration / self.config.control_dt)
+        
+        # timerfd 定时, 超时的周期立即补发, 统计见 self.last_loop_stats
+        with PeriodicTimer(self._sleep_duration, OverrunPolicy.CATCH_UP) as timer:
+            for i in range(time_steps):
+                for j in range(len(self._current_jpos_des)):
+                    delta = target_positions[j] - self._current_jpos_des[j]
+                    delta = self._clamp(delta, -self._max_joint_delta, self._max_joint_delta)
+                    self._current_jpos_des[j] += delta
+                
+                cmd = self._create_hand_command(self._current_jpos_des)
+                if not self._publish_command(cmd):
+                    return False
+                
+                timer.Wait()
+        self.last_loop_stats = timer.GetStats()
         
         if description:
             print(f"[Dex3] {description}完成")
         return True
     
+    def _step_duration(self, start_positions, target_positions, speed_factor: float = 1.0) -> float:
+        """"step" 轨迹类型的自动时长: 按每步最大变化量所需步数, 加余量和速度因子, 最短0.5秒"""
+        max_delta = max(abs(target - start) for start, target in zip(start_positions, target_positions))
+        required_steps = math.ceil(max_delta / self._max_joint_delta)
+        base_duration = required_steps * self.config.control_dt
+        duration = base_duration * 1.2 / speed_factor  # 20%余量 + 速度因子
+        return max(duration, 0.5)  # 最小0.5秒
+    
+    def _motion_limits(self, speed_factor: float = 1.0):
+        """轨迹规划用的速度上限 (不超过URDF) 乘 speed_factor, 加速度上限乘 speed_factor²"""
+        velocity_limits = [
+            min(limit, urdf_limit) * speed_factor
+            for limit, urdf_limit in zip(self.config.motion_velocity_limits, self._get_velocity_limits())
+        ]
+        acceleration_limits = [limit * speed_factor * speed_factor for limit in self.config.motion_acceleration_limits]
+        return velocity_limits, acceleration_limits
+    
+    def _plan_trajectory(
+        self, start_positions, target_positions, duration: Optional[float] = None, speed_factor: float = 1.0
+    ) -> JointTrajectory:
+        """
+        按 trajectory_profile 规划同步轨迹, 速度上限乘 speed_factor, 加速度上限乘 speed_factor²
+        ("step" 类型只用于阻塞式控制, 流式控制下按梯形轨迹规划)
+        """
+        velocity_limits, acceleration_limits = self._motion_limits(speed_factor)
+        profile = self.config.trajectory_profile if self.config.trajectory_profile != "step" else PROFILE_TRAPEZOID
+        return JointTrajectory(
+            start_positions, target_positions, velocity_limits, acceleration_limits,
+            self.config.control_dt, profile, duration
+        )
+    
+    def _play_trajectory(self, trajectory) -> bool:
+        """逐周期发布预先计算的轨迹 (位置 + 速度前馈)"""
+        # timerfd 定时, 超时的周期立即补发, 统计见 self.last_loop_stats
+        with PeriodicTimer(self._sleep_duration, OverrunPolicy.CATCH_UP) as timer:
+            for positions, velocities in zip(trajectory.positions.tolist(), trajectory.velocities.tolist()):
+                self._current_jpos_des = positions
+                cmd = self._create_hand_command(positions, velocities)
+                if not self._publish_command(cmd):
+                    return False
+                timer.Wait()
+        self.last_loop_stats = timer.GetStats()
+        return True
+    
+    def execute_waypoints(
+        self,
+        waypoints: List[List[float]],
+        blend_radius=None,
+        durations: Optional[List[float]] = None,
+        speed_factor: float = 1.0,
+        wait: bool = True
+    ):
+        """
+        连续经过多个路径点 (如抓取前预张开 -> 合拢), 中间点不停顿
+        
+        各段匀速, 路径点附近抛物线过渡, 所有关节同步, 终点静止且精确到达
+        
+        参数:
+            waypoints: 路径点列表, 每个为 7 个关节位置 (弧度)
+            blend_radius: 中间点最大偏差(弧度), 单个值或每个路径点一个值;
+                          0 表示在该点停下并精确到达; None 不限制
+            durations: 每段最短时长(秒) (可选)
+            speed_factor: 速度因子, 缩放速度上限 (加速度按平方缩放)
+            wait: False时立即返回 MotionHandle (未启动流式控制时自动启动)
+        
+        返回:
+            bool: 是否成功; wait=False 时返回 MotionHandle (参数错误时为None)
+        """
+        limits = self._get_joint_limits()
+        clamped_waypoints = []
+        for positions in waypoints:
+            if len(positions) != self.MOTOR_MAX:
+                print(f"[Dex3] 错误: 位置数量({len(positions)})与关节数({self.MOTOR_MAX})不匹配")
+                return False if wait else None
+            clamped_waypoints.append([
+                max(min_val, min(max_val, pos))
+                for pos, (min_val, max_val) in zip(positions, limits)
+            ])
+        if not clamped_waypoints:
+            return True if wait else None
+        
+        if blend_radius is not None and not isinstance(blend_radius, (int, float)):
+            blend_radius = [0.0] + list(blend_radius)  # 起点不是过渡点
+        velocity_limits, acceleration_limits = self._motion_limits(speed_factor)
+        planner = lambda q: WaypointTrajectory(
+            [q] + clamped_waypoints, velocity_limits, acceleration_limits,
+            self.config.control_dt, blend_radius, durations
+        )
+        
+        if wait and not self.is_streaming():
+            trajectory = planner(self._current_jpos_des)
+            print(f"[Dex3] 路径点: {len(clamped_waypoints)}个, 时长 {trajectory.duration:.2f}s")
+            return self._play_trajectory(trajectory)
+        
+        if not self.is_streaming() and not self.start_streaming():
+            return False if wait else None
+        handle = self._submit_motion(_HandMotion(MotionHandle(clamped_waypoints[-1], self._cancel_motion), planner))
+        return handle.wait() if wait else handle
+    
     def initialize_hand(self, speed_factor: float = 1.0) -> bool:
         """
         初始化手部到自然位置 - 完全自动版
@@ -497,8 +692,9 @@ class Dex3Client:
         duration: Optional[float] = None,
         speed_factor: float = 1.0,
         kp: Optional[float] = None,
-        kd: Optional[float] = None
-    ) -> bool:
+        kd: Optional[float] = None,
+        wait: bool = True
+    ):
         """
         设置关节位置 - 智能时间控制
         
@@ -506,11 +702,12 @@ class Dex3Client:
             positions: 关节位置列表（弧度）
             duration: 执行时间(秒) - None时自动计算
             speed_factor: 速度因子 (>1加快, <1减慢)
-            kp: 位置增益 (可选)
-            kd: 速度增益 (可选)
+            kp: 位置增益 (可选, 仅流式控制生效)
+            kd: 速度增益 (可选, 仅流式控制生效)
+            wait: False时立即返回 MotionHandle (未启动流式控制时自动启动)
         
         返回:
-            bool: 是否成功
+            bool: 是否成功; wait=False 时返回 MotionHandle (参数错误时为None)
         
         示例:
             # 自动计算时间
@@ -521,10 +718,14 @@ class Dex3Client:
             
             # 2倍速执行
             hand.set_joint_positions(pose, speed_factor=2.0)
+            
+            # 不阻塞, 稍后等待
+            handle = hand.set_joint_positions(pose, wait=False)
+            handle.wait()
         """
         if len(positions) != self.MOTOR_MAX:
             print(f"[Dex3] 错误: 位置数量({len(positions)})与关节数({self.MOTOR_MAX})不匹配")
-            return False
+            return False if wait else None
         
         # 关节限位检查
         limits = self._get_joint_limits()
@@ -534,77 +735,196 @@ class Dex3Client:
         ]
         
         # 🎯 智能计算时间（自包含，无需额外函数）
-        if duration is None:
+        if duration is None and self.config.trajectory_profile != "step":
+            # 同步轨迹: 由速度/加速度上限得到最短时长
+            deltas = [p - q for p, q in zip(clamped_positions, self._current_jpos_des)]
+            estimate = TrajectoryDuration(
+                deltas,
+                [min(v, u) * speed_factor for v, u in zip(self.config.motion_velocity_limits, self._get_velocity_limits())],
+                [a * speed_factor * speed_factor for a in self.config.motion_acceleration_limits],
+                self.config.trajectory_profile
+            )
+            max_delta = max(abs(d) for d in deltas)
+            print(f"[Dex3] 自动时间: {estimate:.2f}s "
+                  f"(Δ={max_delta:.3f}rad, 速度={speed_factor}x, {self.config.trajectory_profile})")
+        elif duration is None:
             max_delta = max(
                 abs(clamped_positions[i] - self._current_jpos_des[i])
                 for i in range(len(self._current_jpos_des))
             )
-            
-            required_steps = math.ceil(max_delta / self._max_joint_delta)
-            base_duration = required_steps * self.config.control_dt
-            duration = base_duration * 1.2 / speed_factor  # 20%余量 + 速度因子
-            duration = max(duration, 0.5)  # 最小0.5秒
+            duration = self._step_duration(self._current_jpos_des, clamped_positions, speed_factor)
             
             print(f"[Dex3] 自动时间: {duration:.2f}s "
                   f"(Δ={max_delta:.3f}rad, 速度={speed_factor}x)")
         
-        return self.smooth_transition(None, clamped_positions, duration, "")
+        if wait and not self.is_streaming():
+            return self.smooth_transition(None, clamped_positions, duration, "", speed_factor)
+        
+        if not self.is_streaming() and not self.start_streaming():
+            return False if wait else None
+        planner = lambda q: self._plan_trajectory(q, clamped_positions, duration, speed_factor)
+        handle = self._submit_motion(_HandMotion(MotionHandle(clamped_positions, self._cancel_motion), planner, kp, kd))
+        return handle.wait() if wait else handle
+    
+    # ==================== 流式控制 ====================
     
-    def get_current_joint_positions(self, timeout: float = 2.0) -> Optional[List[float]]:
+    def start_streaming(self, external: bool = False) -> bool:
+        """
+        启动流式控制线程: 按 control_dt 周期推进运动并发布, 从 _current_jpos_des 开始
+        
+        参数:
+            external: True 时不启动线程, 由调用方 (如 WholeBodyController) 每个周期调用 step_stream(),
+                      与其他发布者在同一个控制循环中发布
+        
+        返回:
+            bool: 是否成功 (已启动也返回True)
+        """
+        with self._stream_lock:
+            if self.is_streaming():
+                return True
+            if external:
+                self._stream_external = True
+            else:
+                # 超时的周期直接跳过 (SKIP), 不连续补发旧命令
+                self._stream_thread = RecurrentThread(self.config.control_dt, target=self._stream_tick,
+                                                      name=f"dex3_{self.hand}_stream", policy=OverrunPolicy.SKIP)
+                self._stream_thread.Start()
+        print(f"[Dex3-{self.hand}] 流式控制已启动 ({1.0 / self.config.control_dt:.0f}Hz{', 外部时钟' if external else ''})")
+        return True
+    
+    def stop_streaming(self, timeout: float = 1.0) -> bool:
+        """停止流式控制, 未完成的运动以 failed 结束; 之后恢复为阻塞式控制"""
+        thread = self._stream_thread
+        if not self.is_streaming():
+            return True
+        if thread is not None:
+            thread.Wait(timeout)
+        with self._stream_lock:
+            self._stream_thread = None
+            self._stream_external = False
+            if thread is not None:
+                self.last_loop_stats = thread.GetStats()
+            aborted = [motion.handle for motion in (self._stream_motion, self._stream_pending) if motion is not None]
+            self._stream_motion = self._stream_pending = None
+        for handle in aborted:
+            handle._finish(MotionHandle.FAILED)
+        print(f"[Dex3-{self.hand}] 流式控制已停止")
+        return True
+    
+    def is_streaming(self) -> bool:
+        """流式控制是否在运行 (自有线程或外部时钟)"""
+        return self._stream_thread is not None or self._stream_external
+    
+    def step_stream(self):
+        """外部时钟模式 (start_streaming(external=True)) 下每个控制周期调用一次: 推进运动并发布一帧"""
+        self._stream_tick()
+    
+    def _submit_motion(self, motion: _HandMotion) -> MotionHandle:
+        """提交一次运动给控制循环, 下一个周期生效; 尚未被接收的运动被抢占"""
+        with self._stream_lock:
+            replaced, self._stream_pending = self._stream_pending, motion
+        if replaced is not None:
+            replaced.handle._finish(MotionHandle.PREEMPTED)
+        return motion.handle
+    
+    def _cancel_motion(self, handle: MotionHandle) -> bool:
+        """取消运动 (MotionHandle.cancel), 手停在当前期望位置"""
+        with self._stream_lock:
+            if self._stream_pending is not None and self._stream_pending.handle is handle:
+                self._stream_pending = None
+            elif self._stream_motion is not None and self._stream_motion.handle is handle:
+                self._stream_motion = None
+            else:
+                return False
+        handle._finish(MotionHandle.CANCELLED)
+        return True
+    
+    def _stream_tick(self):
+        """控制循环的一个周期: 接收新运动 (抢占当前运动) -> 推进并发布一帧; 没有运动时不发布"""
+        finished = []
+        with self._stream_lock:
+            motion, self._stream_pending = self._stream_pending, None
+            if motion is not None:
+                try:
+                    motion.begin(self._current_jpos_des)
+                except Exception as e:
+                    print(f"[Dex3-{self.hand}] 运动规划失败: {e}")
+                    finished.append((motion.handle, MotionHandle.FAILED))
+                else:
+                    if self._stream_motion is not None:
+                        finished.append((self._stream_motion.handle, MotionHandle.PREEMPTED))
+                    self._stream_motion = motion
+                    motion.handle.status = MotionHandle.RUNNING
+            
+            motion = self._stream_motion
+            if motion is not None:
+                positions, velocities = motion.step()
+                self._current_jpos_des = positions
+                if not self._publish_command(self._create_hand_command(positions, velocities, kp=motion.kp, kd=motion.kd)):
+                    finished.append((motion.handle, MotionHandle.FAILED))
+                    self._stream_motion = None
+                elif motion.done():
+                    finished.append((motion.handle, MotionHandle.DONE))
+                    self._stream_motion = None
+        
+        # 在锁外结束句柄, 回调中可以提交新的运动
+        for handle, status in finished:
+            handle._finish(status)
+    
+    def get_current_joint_positions(self, timeout: float = 2.0, max_age: float = 0.05) -> Optional[List[float]]:
         """
         获取当前关节位置
         
         Args:
             timeout: 超时时间(秒)
+            max_age: 缓存状态不超过该时长(秒)时立即返回, 否则等待下一帧状态
         
         Returns:
             关节位置列表或None
         """
-        state = self.read_state(timeout)
-        if state and hasattr(state, 'motor_state') and len(state.motor_state) >= self.MOTOR_MAX:
-            try:
+        try:
+            state, _ = self._read_full_state(timeout, max_age)
+            if state is not None:
                 return [float(ms.q) for ms in state.motor_state[:self.MOTOR_MAX]]
-            except Exception as e:
-                print(f"[Dex3] 解析关节位置失败: {e}")
+        except Exception as e:
+            print(f"[Dex3] 解析关节位置失败: {e}")
         return None
     
-    def get_joint_states(self, timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+    def get_joint_states(self, timeout: float = 2.0, max_age: float = 0.05) -> Optional[Dict[str, Any]]:
         """
         获取详细的关节状态
         
         Returns:
             包含位置、速度、扭矩等信息的字典
         """
-        state = self.read_state(timeout)
-        if state and hasattr(state, 'motor_state') and len(state.motor_state) >= self.MOTOR_MAX:
-            try:
-                joint_states = {
-                    'positions': [],
-                    'velocities': [],
-                    'torques': []
+        try:
+            state, timestamp = self._read_full_state(timeout, max_age)
+            if state is not None:
+                motors = state.motor_state[:self.MOTOR_MAX]
+                return {
+                    'positions': [float(ms.q) for ms in motors],
+                    'velocities': [float(ms.dq) for ms in motors],
+                    'torques': [float(ms.tau_est) for ms in motors],
+                    'timestamp': timestamp  # 接收时间 (time.monotonic())
                 }
-                for ms in state.motor_state[:self.MOTOR_MAX]:
-                    joint_states['positions'].append(float(ms.q))
-                    joint_states['velocities'].append(float(ms.dq))
-                    joint_states['torques'].append(float(ms.tau_est))
-                return joint_states
-            except Exception as e:
-                print(f"[Dex3] 解析关节状态失败: {e}")
+        except Exception as e:
+            print(f"[Dex3] 解析关节状态失败: {e}")
         return None
     
-    def get_pressure_data(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+    def get_pressure_data(self, timeout: float = 1.0, max_age: float = 0.05) -> Optional[Dict[str, Any]]:
         """
         获取触觉传感器数据
         
         Args:
             timeout: 超时时间(秒)
+            max_age: 缓存状态不超过该时长(秒)时立即返回, 否则等待下一帧状态
         
         Returns:
             触觉传感器数据字典
         """
-        state = self.read_state(timeout)
-        if state and hasattr(state, 'press_sensor_state'):
-            try:
+        try:
+            state, _ = self._read_full_state(timeout, max_age)
+            if state is not None:
                 # 定义有效传感器索引
                 useful_indices = {
                     'sensor_1': [3, 6, 8],
@@ -625,33 +945,34 @@ class Dex3Client:
                     
                     pressure_data[sensor_key] = {
                         'pressure': [
-                            sensor.pressure[idx] if idx in indices else None
-                            for idx in range(len(sensor.pressure))
+                            value if idx in indices else None
+                            for idx, value in enumerate(sensor.pressure)
                         ],
                         'temperature': [
-                            sensor.temperature[idx] if idx in indices else None
-                            for idx in range(len(sensor.temperature))
+                            value if idx in indices else None
+                            for idx, value in enumerate(sensor.temperature)
                         ]
                     }
                 
                 return pressure_data
-            except Exception as e:
-                print(f"[Dex3] 解析压力数据失败: {e}")
+        except Exception as e:
+            print(f"[Dex3] 解析压力数据失败: {e}")
         return None
     
-    def get_imu_data(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+    def get_imu_data(self, timeout: float = 1.0, max_age: float = 0.05) -> Optional[Dict[str, Any]]:
         """
         获取IMU数据
         
         Args:
             timeout: 超时时间(秒)
+            max_age: 缓存状态不超过该时长(秒)时立即返回, 否则等待下一帧状态
         
         Returns:
             IMU数据字典
         """
-        state = self.read_state(timeout)
-        if state and hasattr(state, 'imu_state'):
-            try:
+        try:
+            state, _ = self._read_full_state(timeout, max_age)
+            if state is not None:
                 imu = state.imu_state
                 return {
                     'quaternion': list(imu.quaternion),         # QwQxQyQz
@@ -660,8 +981,8 @@ class Dex3Client:
                     'rpy': list(imu.rpy),                       # 欧拉角
                     'temperature': imu.temperature              # IMU温度
                 }
-            except Exception as e:
-                print(f"[Dex3] 解析IMU数据失败: {e}")
+        except Exception as e:
+            print(f"[Dex3] 解析IMU数据失败: {e}")
         return None
 
 
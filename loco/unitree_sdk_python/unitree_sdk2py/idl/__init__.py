@@ -1,5 +1,9 @@
-from .default import *
-from . import builtin_interfaces, geometry_msgs, sensor_msgs, std_msgs, unitree_go, unitree_api
+import importlib
+
+# message packages and the default constructors in .default are imported on
+# first access (PEP 562), so importing one type does not load every idl module
+_packages = ("builtin_interfaces", "geometry_msgs", "nav_msgs", "sensor_msgs", "std_msgs",
+             "unitree_go", "unitree_hg", "unitree_api")
 
 __all__ = [
     "builtin_interfaces",
@@ -10,3 +14,20 @@ __all__ = [
     "unitree_hg",
     "unitree_api",
 ]
+
+
+def __getattr__(name):
+    if name in _packages:
+        return importlib.import_module("." + name, __name__)
+
+    default = importlib.import_module(".default", __name__)
+    try:
+        value = getattr(default, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,5 +5,24 @@
 
 """
 
-from ._Time_ import Time_
+import importlib
+
+# types are imported on first access (PEP 562), importing the package is cheap
+_modules = {
+    "Time_": "._Time_",
+}
+
 __all__ = ["Time_", ]
+
+
+def __getattr__(name):
+    module = _modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
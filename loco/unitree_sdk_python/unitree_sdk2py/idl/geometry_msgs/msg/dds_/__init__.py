@@ -5,19 +5,38 @@
 
 """
 
-from ._Point32_ import Point32_
-from ._Point_ import Point_
-from ._PointStamped_ import PointStamped_
-from ._Pose2D_ import Pose2D_
-from ._Pose_ import Pose_
-from ._PoseStamped_ import PoseStamped_
-from ._PoseWithCovariance_ import PoseWithCovariance_
-from ._PoseWithCovarianceStamped_ import PoseWithCovarianceStamped_
-from ._Quaternion_ import Quaternion_
-from ._QuaternionStamped_ import QuaternionStamped_
-from ._Twist_ import Twist_
-from ._TwistStamped_ import TwistStamped_
-from ._TwistWithCovariance_ import TwistWithCovariance_
-from ._TwistWithCovarianceStamped_ import TwistWithCovarianceStamped_
-from ._Vector3_ import Vector3_
+import importlib
+
+# types are imported on first access (PEP 562), importing the package is cheap
+_modules = {
+    "Point32_": "._Point32_",
+    "Point_": "._Point_",
+    "PointStamped_": "._PointStamped_",
+    "Pose2D_": "._Pose2D_",
+    "Pose_": "._Pose_",
+    "PoseStamped_": "._PoseStamped_",
+    "PoseWithCovariance_": "._PoseWithCovariance_",
+    "PoseWithCovarianceStamped_": "._PoseWithCovarianceStamped_",
+    "Quaternion_": "._Quaternion_",
+    "QuaternionStamped_": "._QuaternionStamped_",
+    "Twist_": "._Twist_",
+    "TwistStamped_": "._TwistStamped_",
+    "TwistWithCovariance_": "._TwistWithCovariance_",
+    "TwistWithCovarianceStamped_": "._TwistWithCovarianceStamped_",
+    "Vector3_": "._Vector3_",
+}
+
 __all__ = ["Point32_", "Point_", "PointStamped_", "Pose2D_", "Pose_", "PoseStamped_", "PoseWithCovariance_", "PoseWithCovarianceStamped_", "Quaternion_", "QuaternionStamped_", "Twist_", "TwistStamped_", "TwistWithCovariance_", "TwistWithCovarianceStamped_", "Vector3_", ]
+
+
+def __getattr__(name):
+    module = _modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,7 +5,26 @@
 
 """
 
-from ._MapMetaData_ import MapMetaData_
-from ._OccupancyGrid_ import OccupancyGrid_
-from ._Odometry_ import Odometry_
+import importlib
+
+# types are imported on first access (PEP 562), importing the package is cheap
+_modules = {
+    "MapMetaData_": "._MapMetaData_",
+    "OccupancyGrid_": "._OccupancyGrid_",
+    "Odometry_": "._Odometry_",
+}
+
 __all__ = ["MapMetaData_", "OccupancyGrid_", "Odometry_", ]
+
+
+def __getattr__(name):
+    module = _modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
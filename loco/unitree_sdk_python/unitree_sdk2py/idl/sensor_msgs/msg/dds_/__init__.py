@@ -5,7 +5,27 @@
 
 """
 
+import importlib
+
 from . import PointField_Constants
-from ._PointCloud2_ import PointCloud2_
-from ._PointField_ import PointField_
+
+# types are imported on first access (PEP 562), importing the package is cheap
+_modules = {
+    "PointCloud2_": "._PointCloud2_",
+    "PointField_": "._PointField_",
+}
+
 __all__ = ["PointField_Constants", "PointCloud2_", "PointField_", ]
+
+
+def __getattr__(name):
+    module = _modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
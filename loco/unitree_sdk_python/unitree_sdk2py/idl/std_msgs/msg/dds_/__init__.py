@@ -5,6 +5,25 @@
 
 """
 
-from ._Header_ import Header_
-from ._String_ import String_
+import importlib
+
+# types are imported on first access (PEP 562), importing the package is cheap
+_modules = {
+    "Header_": "._Header_",
+    "String_": "._String_",
+}
+
 __all__ = ["Header_", "String_", ]
+
+
+def __getattr__(name):
+    module = _modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
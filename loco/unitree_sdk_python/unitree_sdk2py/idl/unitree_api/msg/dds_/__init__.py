@@ -5,12 +5,31 @@
 
 """
 
-from ._RequestHeader_ import RequestHeader_
-from ._RequestIdentity_ import RequestIdentity_
-from ._RequestLease_ import RequestLease_
-from ._RequestPolicy_ import RequestPolicy_
-from ._Request_ import Request_
-from ._ResponseHeader_ import ResponseHeader_
-from ._ResponseStatus_ import ResponseStatus_
-from ._Response_ import Response_
+import importlib
+
+# types are imported on first access (PEP 562), importing the package is cheap
+_modules = {
+    "RequestHeader_": "._RequestHeader_",
+    "RequestIdentity_": "._RequestIdentity_",
+    "RequestLease_": "._RequestLease_",
+    "RequestPolicy_": "._RequestPolicy_",
+    "Request_": "._Request_",
+    "ResponseHeader_": "._ResponseHeader_",
+    "ResponseStatus_": "._ResponseStatus_",
+    "Response_": "._Response_",
+}
+
 __all__ = ["RequestHeader_", "RequestIdentity_", "RequestLease_", "RequestPolicy_", "Request_", "ResponseHeader_", "ResponseStatus_", "Response_", ]
+
+
+def __getattr__(name):
+    module = _modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
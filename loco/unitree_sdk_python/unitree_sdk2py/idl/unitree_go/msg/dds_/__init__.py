@@ -5,27 +5,46 @@
 
 """
 
-from ._AudioData_ import AudioData_
-from ._BmsCmd_ import BmsCmd_
-from ._BmsState_ import BmsState_
-from ._Error_ import Error_
-from ._Go2FrontVideoData_ import Go2FrontVideoData_
-from ._HeightMap_ import HeightMap_
-from ._IMUState_ import IMUState_
-from ._InterfaceConfig_ import InterfaceConfig_
-from ._LidarState_ import LidarState_
-from ._LowCmd_ import LowCmd_
-from ._LowState_ import LowState_
-from ._MotorCmd_ import MotorCmd_
-from ._MotorCmds_ import MotorCmds_
-from ._MotorState_ import MotorState_
-from ._MotorStates_ import MotorStates_
-from ._Req_ import Req_
-from ._Res_ import Res_
-from ._SportModeState_ import SportModeState_
-from ._TimeSpec_ import TimeSpec_
-from ._PathPoint_ import PathPoint_ 
-from ._UwbState_ import UwbState_
-from ._UwbSwitch_ import UwbSwitch_
-from ._WirelessController_ import WirelessController_
+import importlib
+
+# types are imported on first access (PEP 562), importing the package is cheap
+_modules = {
+    "AudioData_": "._AudioData_",
+    "BmsCmd_": "._BmsCmd_",
+    "BmsState_": "._BmsState_",
+    "Error_": "._Error_",
+    "Go2FrontVideoData_": "._Go2FrontVideoData_",
+    "HeightMap_": "._HeightMap_",
+    "IMUState_": "._IMUState_",
+    "InterfaceConfig_": "._InterfaceConfig_",
+    "LidarState_": "._LidarState_",
+    "LowCmd_": "._LowCmd_",
+    "LowState_": "._LowState_",
+    "MotorCmd_": "._MotorCmd_",
+    "MotorCmds_": "._MotorCmds_",
+    "MotorState_": "._MotorState_",
+    "MotorStates_": "._MotorStates_",
+    "Req_": "._Req_",
+    "Res_": "._Res_",
+    "SportModeState_": "._SportModeState_",
+    "TimeSpec_": "._TimeSpec_",
+    "PathPoint_": "._PathPoint_",
+    "UwbState_": "._UwbState_",
+    "UwbSwitch_": "._UwbSwitch_",
+    "WirelessController_": "._WirelessController_",
+}
+
 __all__ = ["AudioData_", "BmsCmd_", "BmsState_", "Error_", "Go2FrontVideoData_", "HeightMap_", "IMUState_", "InterfaceConfig_", "LidarState_", "LowCmd_", "LowState_", "MotorCmd_", "MotorCmds_", "MotorState_", "MotorStates_", "Req_", "Res_", "SportModeState_", "TimeSpec_", "PathPoint_",  "UwbState_", "UwbSwitch_", "WirelessController_", ]
+
+
+def __getattr__(name):
+    module = _modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
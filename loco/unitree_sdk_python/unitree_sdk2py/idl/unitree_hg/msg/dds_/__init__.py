@@ -5,15 +5,34 @@
 
 """
 
-from ._BmsCmd_ import BmsCmd_
-from ._BmsState_ import BmsState_
-from ._HandCmd_ import HandCmd_
-from ._HandState_ import HandState_
-from ._IMUState_ import IMUState_
-from ._LowCmd_ import LowCmd_
-from ._LowState_ import LowState_
-from ._MainBoardState_ import MainBoardState_
-from ._MotorCmd_ import MotorCmd_
-from ._MotorState_ import MotorState_
-from ._PressSensorState_ import PressSensorState_
+import importlib
+
+# types are imported on first access (PEP 562), importing the package is cheap
+_modules = {
+    "BmsCmd_": "._BmsCmd_",
+    "BmsState_": "._BmsState_",
+    "HandCmd_": "._HandCmd_",
+    "HandState_": "._HandState_",
+    "IMUState_": "._IMUState_",
+    "LowCmd_": "._LowCmd_",
+    "LowState_": "._LowState_",
+    "MainBoardState_": "._MainBoardState_",
+    "MotorCmd_": "._MotorCmd_",
+    "MotorState_": "._MotorState_",
+    "PressSensorState_": "._PressSensorState_",
+}
+
 __all__ = ["BmsCmd_", "BmsState_", "HandCmd_", "HandState_", "IMUState_", "LowCmd_", "LowState_", "MainBoardState_", "MotorCmd_", "MotorState_", "PressSensorState_", ]
+
+
+def __getattr__(name):
+    module = _modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,115 @@
+import asyncio
+
+from .async_client_base import AsyncClientBase
+from .lease_client import LeaseClient
+from .internal import *
+
+"""
+" class AsyncClient
+" asyncio counterpart of Client, _Call* return awaitables.
+"""
+class AsyncClient(AsyncClientBase):
+    def __init__(self, serviceName: str, enabaleLease: bool = False):
+        super().__init__(serviceName)
+
+        self.__apiMapping = {}
+        self.__apiVersion = None
+        self.__leaseClient = None
+        self.__enableLease = enabaleLease
+
+        if (self.__enableLease):
+            self.__leaseClient = LeaseClient(serviceName)
+            self.__leaseClient.Init()
+
+    async def WaitLeaseApplied(self):
+        if self.__enableLease:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.__leaseClient.WaitApplied)
+
+    def GetLeaseId(self):
+        if self.__enableLease:
+            return self.__leaseClient.GetId()
+        else:
+            return None
+
+    def GetApiVersion(self):
+        return self.__apiVersion
+    
+    async def GetServerApiVersion(self):
+        code, apiVerson = await self._CallBase(RPC_API_ID_INTERNAL_API_VERSION, "{}", 0, 0)
+        if code != 0:
+            print("[AsyncClient] get server api version error:", code)
+            return code, None
+        else:
+            return code, apiVerson
+
+    def _SetApiVerson(self, apiVersion: str):
+        self.__apiVersion = apiVersion
+
+    async def _Call(self, apiId: int, parameter: str):
+        ret, proirity, leaseId = self.__CheckApi(apiId)
+        if ret == 0:
+            return await self._CallBase(apiId, parameter, proirity, leaseId)
+        else:
+            return RPC_ERR_CLIENT_API_NOT_REG, None
+            
+    async def _CallNoReply(self, apiId: int, parameter: str):
+        ret, proirity, leaseId = self.__CheckApi(apiId)
+        if ret == 0:
+            return await self._CallNoReplyBase(apiId, parameter, proirity, leaseId)
+        else:
+            return RPC_ERR_CLIENT_API_NOT_REG
+    
+    async def _CallRequestWithParamAndBin(self, apiId: int, requestParamter: str,
+                                    requestBinary: list):
+        ret, proirity, leaseId = self.__CheckApi(apiId)
+        if ret == 0:
+            return await self._CallRequestWithParamAndBinBase(apiId, requestParamter,
+                                                        requestBinary, proirity,
+                                                        leaseId)
+        else:
+            return RPC_ERR_CLIENT_API_NOT_REG, None
+
+    async def _CallRequestWithParamAndBinNoReply(self, apiId: int, requestParamter: str,
+                                           requestBinary: list):
+        ret, proirity, leaseId = self.__CheckApi(apiId)
+        if ret == 0:
+            return await self._CallRequestWithParamAndBinNoReplyBase(apiId,
+                                                               requestParamter,
+                                                               requestBinary,
+                                                               proirity,
+                                                               leaseId)
+        else:
+            return RPC_ERR_CLIENT_API_NOT_REG
+
+    async def _CallBinary(self, apiId: int, parameter: list):
+        ret, proirity, leaseId = self.__CheckApi(apiId)
+        if ret == 0:
+            return await self._CallBinaryBase(apiId, parameter, proirity, leaseId)
+        else:
+            return RPC_ERR_CLIENT_API_NOT_REG, None
+
+    async def _CallBinaryNoReply(self, apiId: int, parameter: list):
+        ret, proirity, leaseId = self.__CheckApi(apiId)
+        if ret == 0:
+            return await self._CallBinaryNoReplyBase(apiId, parameter, proirity, leaseId)
+        else:
+            return RPC_ERR_CLIENT_API_NOT_REG
+    
+    def _RegistApi(self, apiId: int, proirity: int):
+        self.__apiMapping[apiId] = proirity
+    
+    def __CheckApi(self, apiId: int):
+        proirity = 0
+        leaseId = 0
+
+        if apiId > RPC_INTERNAL_API_ID_MAX:
+            proirity = self.__apiMapping.get(apiId)
+            
+            if proirity is None:
+                return RPC_ERR_CLIENT_API_NOT_REG, proirity, leaseId
+            
+            if self.__enableLease:
+                leaseId = self.__leaseClient.GetId()
+
+        return 0, proirity, leaseId
\ No newline at end of file
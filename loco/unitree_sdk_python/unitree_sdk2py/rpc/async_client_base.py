@@ -0,0 +1,144 @@
+import asyncio
+
+from ..idl.unitree_api.msg.dds_ import Request_ as Request
+from ..idl.unitree_api.msg.dds_ import RequestHeader_ as RequestHeader
+from ..idl.unitree_api.msg.dds_ import RequestLease_ as RequestLease
+from ..idl.unitree_api.msg.dds_ import RequestIdentity_ as RequestIdentity
+from ..idl.unitree_api.msg.dds_ import RequestPolicy_ as RequestPolicy
+
+from .client_stub import ClientStub
+from .request_future import AsyncRequestFuture
+from .internal import *
+
+
+"""
+" class AsyncClientBase
+" same calls as ClientBase, but awaitable. the response is delivered to the
+" event loop by the stub's response handler, so no thread blocks per call.
+"""
+class AsyncClientBase:
+    def __init__(self, serviceName: str):
+        self.__timeout = 1.0
+        self.__stub = ClientStub(serviceName)
+        self.__stub.Init()
+
+    def SetTimeout(self, timeout: float):
+        self.__timeout = timeout
+
+    def GetRpcStats(self):
+        # pending requests, per api latency histogram, timeout and late response counts
+        return self.__stub.GetStats()
+
+    async def _CallBase(self, apiId: int, parameter: str, proirity: int = 0, leaseId: int = 0):
+        header = self.__SetHeader(apiId, leaseId, proirity, False)
+        request = Request(header, parameter, [])
+
+        code, response = await self.__Request(request)
+        if code != 0:
+            return code, None
+
+        if response.header.identity.api_id != apiId:
+            return RPC_ERR_CLIENT_API_NOT_MATCH, None
+        else:
+            return response.header.status.code, response.data
+
+    async def _CallNoReplyBase(self, apiId: int, parameter: str, proirity: int, leaseId: int):
+        header = self.__SetHeader(apiId, leaseId, proirity, True)
+        request = Request(header, parameter, [])
+
+        if await self.__Send(request):
+            return 0
+        else:
+            return RPC_ERR_CLIENT_SEND
+
+    async def _CallRequestWithParamAndBinBase(self, apiId: int, requestParamter: str,
+                                              requestBinary: list, proirity: int = 0,
+                                              leaseId: int = 0):
+        header = self.__SetHeader(apiId, leaseId, proirity, False)
+        request = Request(header, requestParamter, requestBinary)
+
+        code, response = await self.__Request(request)
+        if code != 0:
+            return code, None
+
+        if response.header.identity.api_id != apiId:
+            return RPC_ERR_CLIENT_API_NOT_MATCH, None
+        else:
+            return response.header.status.code, response.data
+
+    async def _CallRequestWithParamAndBinNoReplyBase(self, apiId: int, requestParamter: str,
+                                                     requestBinary: list, proirity: int,
+                                                     leaseId: int):
+        header = self.__SetHeader(apiId, leaseId, proirity, True)
+        request = Request(header, requestParamter, requestBinary)
+
+        if await self.__Send(request):
+            return 0
+        else:
+            return RPC_ERR_CLIENT_SEND
+
+    async def _CallBinaryBase(self, apiId: int, parameter: list, proirity: int, leaseId: int):
+        header = self.__SetHeader(apiId, leaseId, proirity, False)
+        request = Request(header, "", parameter)
+
+        code, response = await self.__Request(request)
+        if code != 0:
+            return code, None
+
+        if response.header.identity.api_id != apiId:
+            return RPC_ERR_CLIENT_API_NOT_MATCH, None
+        else:
+            return response.header.status.code, response.binary
+
+    async def _CallBinaryNoReplyBase(self, apiId: int, parameter: list, proirity: int, leaseId: int):
+        header = self.__SetHeader(apiId, leaseId, proirity, True)
+        request = Request(header, "", parameter)
+
+        if await self.__Send(request):
+            return 0
+        else:
+            return RPC_ERR_CLIENT_SEND
+
+    async def __WaitMatched(self):
+        # normally matched since stub Init; only before discovery is the wait handed to a worker thread
+        if self.__stub.WaitMatched(0):
+            return True
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.__stub.WaitMatched, self.__timeout)
+
+    async def __Send(self, request: Request):
+        if not await self.__WaitMatched():
+            print("[AsyncClientBase] send error. id:", request.header.identity.id)
+            return False
+        return self.__stub.Send(request, None)
+
+    async def __Request(self, request: Request):
+        id = request.header.identity.id
+
+        if not await self.__WaitMatched():
+            print("[AsyncClientBase] send request error. id:", id)
+            return RPC_ERR_CLIENT_SEND, None
+
+        future = AsyncRequestFuture(asyncio.get_running_loop())
+        if self.__stub.SendRequest(request, self.__timeout, future) is None:
+            return RPC_ERR_CLIENT_SEND, None
+
+        try:
+            response = await asyncio.wait_for(future.GetAwaitable(), self.__timeout)
+        except asyncio.TimeoutError:
+            self.__stub.RemoveFuture(id)
+            return RPC_ERR_CLIENT_API_TIMEOUT, None
+        except asyncio.CancelledError:
+            self.__stub.RemoveFuture(id, False)
+            raise
+        except Exception:
+            self.__stub.RemoveFuture(id, False)
+            return RPC_ERR_UNKNOWN, None
+
+        return 0, response
+
+    def __SetHeader(self, apiId: int, leaseId: int, priority: int, noReply: bool):
+        identity = RequestIdentity(ClientStub.NewRequestId(), apiId)
+        lease = RequestLease(leaseId)
+        policy = RequestPolicy(priority, noReply)
+        return RequestHeader(identity, lease, policy)
@@ -1,5 +1,3 @@
-import time
-
 from ..idl.unitree_api.msg.dds_ import Request_ as Request
 from ..idl.unitree_api.msg.dds_ import RequestHeader_ as RequestHeader
 from ..idl.unitree_api.msg.dds_ import RequestLease_ as RequestLease
@@ -24,6 +22,10 @@ class ClientBase:
     def SetTimeout(self, timeout: float):
         self.__timeout = timeout
 
+    def GetRpcStats(self):
+        # pending requests, per api latency histogram, timeout and late response counts
+        return self.__stub.GetStats()
+
     def _CallBase(self, apiId: int, parameter: str, proirity: int = 0, leaseId: int = 0):
         # print("[CallBase] call apiId:", apiId, ", proirity:", proirity, ", leaseId:", leaseId)
         header = self.__SetHeader(apiId, leaseId, proirity, False)
@@ -122,7 +124,7 @@ class ClientBase:
             return RPC_ERR_CLIENT_SEND
     
     def __SetHeader(self, apiId: int, leaseId: int, priority: int, noReply: bool):
-        identity = RequestIdentity(time.monotonic_ns(), apiId)
+        identity = RequestIdentity(ClientStub.NewRequestId(), apiId)
         lease = RequestLease(leaseId)
         policy = RequestPolicy(priority, noReply)
         return RequestHeader(identity, lease, policy)
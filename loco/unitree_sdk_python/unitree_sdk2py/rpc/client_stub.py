@@ -1,12 +1,13 @@
 import time
 
 from enum import Enum
-from threading import Thread, Condition
+from threading import Thread, Condition, Lock
 
 from ..idl.unitree_api.msg.dds_ import Request_ as Request
 from ..idl.unitree_api.msg.dds_ import Response_ as Response
 
 from ..core.channel import ChannelFactory
+from ..core.channel_qos import QOS_PROFILE_RPC
 from ..core.channel_name import ChannelType, GetClientChannelName
 from .request_future import RequestFuture, RequestFutureQueue
 
@@ -15,6 +16,9 @@ from .request_future import RequestFuture, RequestFutureQueue
 " class ClientStub
 """
 class ClientStub:
+    __idLock = Lock()
+    __lastId = 0
+
     def __init__(self, serviceName: str):
         self.__serviceName = serviceName
         self.__futureQueue = None
@@ -27,10 +31,14 @@ class ClientStub:
         self.__futureQueue = RequestFutureQueue()
 
         # create channel
-        self.__sendChannel = factory.CreateSendChannel(GetClientChannelName(self.__serviceName, ChannelType.SEND), Request)
+        self.__sendChannel = factory.CreateSendChannel(GetClientChannelName(self.__serviceName, ChannelType.SEND), Request, QOS_PROFILE_RPC)
         self.__recvChannel = factory.CreateRecvChannel(GetClientChannelName(self.__serviceName, ChannelType.RECV), Response,
-                                    self.__ResponseHandler,10)
-        time.sleep(0.5)
+                                    self.__ResponseHandler,10, qos=QOS_PROFILE_RPC)
+
+        # wait until the server side is discovered instead of a fixed sleep
+        deadline = time.monotonic() + 0.5
+        self.__sendChannel.WaitWriterMatched(0.5)
+        self.__recvChannel.WaitReaderMatched(max(0.0, deadline - time.monotonic()))
 
 
     def Send(self, request: Request, timeout: float):
@@ -40,22 +48,39 @@ class ClientStub:
             print("[ClientStub] send error. id:", request.header.identity.id)
             return False
 
-    def SendRequest(self, request: Request, timeout: float):
+    def SendRequest(self, request: Request, timeout: float, future: RequestFuture = None):
         id = request.header.identity.id
 
-        future = RequestFuture()
+        if future is None:
+            future = RequestFuture()
         future.SetRequestId(id)
-        self.__futureQueue.Set(id, future)
+        self.__futureQueue.Set(id, future, request.header.identity.api_id)
 
         if self.__sendChannel.Write(request, timeout):
+            # the deadline counts from the end of the write, the caller waits timeout from here too
+            self.__futureQueue.SetDeadline(id, timeout)
             return future
         else:
             print("[ClientStub] send request error. id:", request.header.identity.id)
             self.__futureQueue.Remove(id)
             return None
 
-    def RemoveFuture(self, requestId: int):
-        self.__futureQueue.Remove(requestId)
+    def RemoveFuture(self, requestId: int, timedOut: bool = True):
+        self.__futureQueue.Remove(requestId, timedOut)
+
+    def GetStats(self):
+        return self.__futureQueue.GetStats()
+
+    @classmethod
+    def NewRequestId(cls):
+        # monotonic_ns, but strictly increasing for requests sent from several threads or tasks
+        with cls.__idLock:
+            id = max(time.monotonic_ns(), cls.__lastId + 1)
+            cls.__lastId = id
+            return id
+
+    def WaitMatched(self, timeout: float = None):
+        return self.__sendChannel.WaitWriterMatched(timeout)
 
     def __ResponseHandler(self, response: Response):
         id = response.header.identity.id
@@ -65,5 +90,6 @@ class ClientStub:
         if future is None:
             # print("[ClientStub] get future from queue error. id:", id)
             pass
+        # AsyncRequestFuture.Ready hands the response to its event loop with call_soon_threadsafe
         elif not future.Ready(response):
             print("[ClientStub] set future ready error.")
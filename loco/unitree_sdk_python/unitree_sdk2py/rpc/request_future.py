@@ -1,8 +1,14 @@
+import time
+import heapq
+import asyncio
+
+from collections import OrderedDict
 from threading import Condition, Lock
 from enum import Enum
 
 from ..idl.unitree_api.msg.dds_ import Response_ as Response
 from ..utils.future import Future, FutureResult
+from ..utils.histogram import Histogram
 
 
 """
@@ -20,27 +26,150 @@ class RequestFuture(Future):
         return self.__requestId
 
 
+"""
+" class AsyncRequestFuture
+" resolved from the dds listener thread, awaited on the event loop.
+"""
+class AsyncRequestFuture(RequestFuture):
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        super().__init__()
+        self.__loop = loop
+        self.__future = loop.create_future()
+
+    def GetAwaitable(self):
+        return self.__future
+
+    def Ready(self, value):
+        return self.__CallSoon(self.__SetResult, value)
+
+    def Fail(self, reason: str):
+        return self.__CallSoon(self.__SetException, reason)
+
+    def __CallSoon(self, callback, arg):
+        try:
+            self.__loop.call_soon_threadsafe(callback, arg)
+            return True
+        except RuntimeError:
+            # event loop already closed
+            return False
+
+    def __SetResult(self, value):
+        # the awaiting task may have been cancelled or timed out
+        if not self.__future.done():
+            self.__future.set_result(value)
+
+    def __SetException(self, reason: str):
+        if not self.__future.done():
+            self.__future.set_exception(RuntimeError(reason))
+
+
+"""
+" class RpcApiStats
+"""
+class RpcApiStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.timeouts = 0
+        self.late = 0
+
+    def ToDict(self):
+        return {"latency": self.latency.ToDict(), "timeouts": self.timeouts, "late": self.late}
+
+
+"""
+" class RequestFutureQueue
+" pending-request table. an entry is set before the request is written, so
+" an early response finds it, and gets its deadline (kept in a min-heap) once
+" the write succeeded, a write blocking for a while does not eat into the
+" time left for the response. entries past their deadline are dropped on the
+" next Set/Get, so a request whose caller never cleans up cannot leak. ids of
+" expired requests are kept for a while to tell late responses from responses
+" to other clients.
+"""
 class RequestFutureQueue:
+    EXPIRED_KEEP = 256
+    # the caller starts its own timeout just after the deadline is set, keep the entry a bit longer
+    EXPIRE_GRACE = 0.1
+
     def __init__(self):
         self.__data = {}
+        self.__heap = []
+        self.__expired = OrderedDict()
+        self.__stats = {}
+        self.__unknown = 0
         self.__lock = Lock()
-        
-    def Set(self, requestId: int, future: RequestFuture):
+
+    def Set(self, requestId: int, future: RequestFuture, apiId: int = 0):
         if future is None:
             return False
+        now = time.monotonic()
+        with self.__lock:
+            self.__Expire(now)
+            self.__data[requestId] = (future, apiId, now)
+            return True
+
+    def SetDeadline(self, requestId: int, timeout: float):
+        # expire the entry timeout seconds from now, False when it is already gone
         with self.__lock:
-            self.__data[requestId] = future
+            if requestId not in self.__data:
+                return False
+            heapq.heappush(self.__heap, (time.monotonic() + timeout + self.EXPIRE_GRACE, requestId))
             return True
 
     def Get(self, requestId: int):
-        future = None
+        now = time.monotonic()
         with self.__lock:
-            future = self.__data.get(requestId)
-            if future is not None:
-                self.__data.pop(requestId)
-        return future
+            entry = self.__data.pop(requestId, None)
+            if entry is None:
+                apiId = self.__expired.pop(requestId, None)
+                if apiId is None:
+                    self.__unknown += 1
+                else:
+                    self.__GetStats(apiId).late += 1
+                self.__Expire(now)
+                return None
 
-    def Remove(self, requestId: int):
+            future, apiId, sendTime = entry
+            self.__GetStats(apiId).latency.Add(now - sendTime)
+            self.__Expire(now)
+            return future
+
+    def Remove(self, requestId: int, timedOut: bool = False):
+        with self.__lock:
+            entry = self.__data.pop(requestId, None)
+            if entry is not None and timedOut:
+                self.__MarkExpired(requestId, entry[1])
+
+    def Size(self):
+        return len(self.__data)
+
+    def GetStats(self):
         with self.__lock:
-            if id in self.__data:
-                self.__data.pop(requestId)
\ No newline at end of file
+            apis = {apiId: stats.ToDict() for apiId, stats in self.__stats.items()}
+            return {"pending": len(self.__data), "unknown": self.__unknown, "apis": apis}
+
+    def __GetStats(self, apiId: int):
+        stats = self.__stats.get(apiId)
+        if stats is None:
+            stats = self.__stats[apiId] = RpcApiStats()
+        return stats
+
+    def __MarkExpired(self, requestId: int, apiId: int):
+        self.__GetStats(apiId).timeouts += 1
+        self.__expired[requestId] = apiId
+        if len(self.__expired) > self.EXPIRED_KEEP:
+            self.__expired.popitem(last=False)
+
+    def __Expire(self, now: float):
+        heap = self.__heap
+        while heap and heap[0][0] <= now:
+            _, requestId = heapq.heappop(heap)
+            # answered or removed entries are left in the heap and skipped here
+            entry = self.__data.pop(requestId, None)
+            if entry is not None:
+                self.__MarkExpired(requestId, entry[1])
+
+        # many fast replies with a long timeout leave dead heap entries behind, rebuild
+        if len(heap) > 2 * len(self.__data) + 64:
+            self.__heap = [item for item in heap if item[1] in self.__data]
+            heapq.heapify(self.__heap)
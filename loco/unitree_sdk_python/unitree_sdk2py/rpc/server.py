@@ -19,7 +19,7 @@ class Server(ServerBase):
         self.__apiVersion = ""
         self.__apiHandlerMapping = {}
         self.__apiBinaryHandlerMapping = {}
-        self.__apiBinarySet = {}
+        self.__apiBinarySet = set()
         self.__enableLease = False
         self.__leaseServer = None
         super().__init__(name)
@@ -33,9 +33,9 @@ class Server(ServerBase):
         self.__leaseServer.Init()
         self.__leaseServer.Start(False)
 
-    def Start(self, enablePrioQueue: bool = False):
+    def Start(self, enablePrioQueue: bool = False, workerCount: int = 1, prioLanes: int = 2):
         super()._SetServerRequestHandler(self.__ServerRequestHandler)
-        super()._Start(enablePrioQueue)
+        super()._Start(enablePrioQueue, workerCount, prioLanes)
 
     def GetApiVersion(self):
         return self.__apiVersion
@@ -44,12 +44,16 @@ class Server(ServerBase):
         self.__apiVersion = apiVersion
         print("[Server] set api version:", self.__apiVersion)
 
-    def _RegistHandler(self, apiId: int, handler: Callable, checkLease: bool):
+    def _RegistHandler(self, apiId: int, handler: Callable, checkLease: bool, maxConcurrency: int = 0):
         self.__apiHandlerMapping[apiId] = (handler, checkLease)
+        if maxConcurrency > 0:
+            self._SetApiConcurrency(apiId, maxConcurrency)
 
-    def _RegistBinaryHandler(self, apiId: int, handler: Callable, checkLease: bool):
+    def _RegistBinaryHandler(self, apiId: int, handler: Callable, checkLease: bool, maxConcurrency: int = 0):
         self.__apiBinaryHandlerMapping[apiId] = (handler, checkLease)
         self.__apiBinarySet.add(apiId)
+        if maxConcurrency > 0:
+            self._SetApiConcurrency(apiId, maxConcurrency)
 
     def __GetHandler(self, apiId: int):
         if apiId in self.__apiHandlerMapping:
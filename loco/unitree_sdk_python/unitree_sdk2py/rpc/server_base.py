@@ -3,9 +3,12 @@ import time
 from typing import Callable, Any
 
 from ..idl.unitree_api.msg.dds_ import Request_ as Request
+from ..idl.unitree_api.msg.dds_ import ResponseStatus_ as ResponseStatus
+from ..idl.unitree_api.msg.dds_ import ResponseHeader_ as ResponseHeader
 from ..idl.unitree_api.msg.dds_ import Response_ as Response
 
 from .server_stub import ServerStub
+from .internal import *
 
 
 """
@@ -16,17 +19,36 @@ class ServerBase:
         self.__name = name
         self.__serverRequestHandler = None
         self.__serverStub = ServerStub(self.__name)
+        self.__apiLimit = {}
 
     def GetName(self):
         return self.__name
 
-    def _Start(self, enablePrioQueue: bool = False):
-        self.__serverStub.Init(self.__serverRequestHandler, enablePrioQueue)
-        print("[ServerBase] server started. name:", self.__name, ", enable proirity queue:", enablePrioQueue)
+    def GetStats(self):
+        return self.__serverStub.GetStats()
+
+    def _Start(self, enablePrioQueue: bool = False, workerCount: int = 1, prioLanes: int = 2):
+        self.__serverStub.Init(self.__serverRequestHandler, enablePrioQueue, workerCount, prioLanes,
+                               self.__apiLimit, self.__RejectRequest)
+        print("[ServerBase] server started. name:", self.__name, ", enable proirity queue:", enablePrioQueue,
+              ", worker count:", workerCount)
+
+    def _SetApiConcurrency(self, apiId: int, maxConcurrency: int):
+        # at most maxConcurrency workers run this api at once, 0: no limit. set before start
+        self.__apiLimit[apiId] = maxConcurrency
 
     def _SetServerRequestHandler(self, serverRequestHandler: Callable):
         self.__serverRequestHandler = serverRequestHandler
 
-    def _SendResponse(self, response: Response):
-        if not self.__serverStub.Send(response, 1.0):
+    def _SendResponse(self, response: Response, timeout: float = 1.0):
+        if not self.__serverStub.Send(response, timeout):
             print("[ServerBase] send response error.")
+
+    def __RejectRequest(self, request: Request):
+        if request.header.policy.noreply:
+            return
+
+        # runs on the dds listener thread, do not wait for the client to be matched
+        status = ResponseStatus(RPC_ERR_SERVER_BUSY)
+        response = Response(ResponseHeader(request.header.identity, status), "", [])
+        self._SendResponse(response, 0.0)
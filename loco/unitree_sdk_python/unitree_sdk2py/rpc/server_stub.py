@@ -1,54 +1,75 @@
 import time
 
 from enum import Enum
+from collections import deque
 from threading import Thread, Condition
 from typing import Callable, Any
 
-from ..utils.bqueue import BQueue
 from ..idl.unitree_api.msg.dds_ import Request_ as Request
 from ..idl.unitree_api.msg.dds_ import Response_ as Response
 
 from ..core.channel import ChannelFactory
+from ..core.channel_qos import QOS_PROFILE_RPC
 from ..core.channel_name import ChannelType, GetServerChannelName
 
 
 """
 " class ServerStub
+" requests go into priority lanes (lane = request priority, clamped; a single
+" lane when priority is disabled) and are served by a worker pool, highest
+" lane first. an api at its concurrency limit is skipped until a worker
+" finishes one of its requests. a request that finds its lane full is handed
+" to the reject handler instead of being dropped.
 """
 class ServerStub:
+    QUEUE_LEN = 10
+    PRIO_QUEUE_LEN = 5
+
     def __init__(self, serviceName: str):
         self.__serviceName = serviceName
         self.__serverRquestHandler = None
+        self.__rejectHandler = None
         self.__sendChannel = None
         self.__recvChannel = None
         self.__enablePriority = None
-        self.__queue = None
-        self.__prioQueue = None
-        self.__queueThread = None
-        self.__prioQueueThread = None
 
-    def Init(self, serverRequestHander: Callable, enablePriority: bool = False):
+        self.__lanes = []
+        self.__laneLen = []
+        self.__condition = Condition()
+        self.__apiLimit = {}
+        self.__apiRunning = {}
+        self.__threads = []
+
+        self.__rejectCount = 0
+        self.__handledCount = 0
+
+    def Init(self, serverRequestHander: Callable, enablePriority: bool = False, workerCount: int = 1,
+             prioLanes: int = 2, apiLimit: dict = None, rejectHandler: Callable = None):
         self.__serverRquestHandler = serverRequestHander
+        self.__rejectHandler = rejectHandler
         self.__enablePriority = enablePriority
+        self.__apiLimit = dict(apiLimit) if apiLimit else {}
 
         factory = ChannelFactory()
 
-        # create channel
-        self.__sendChannel = factory.CreateSendChannel(GetServerChannelName(self.__serviceName, ChannelType.SEND), Response)
-        self.__recvChannel = factory.CreateRecvChannel(GetServerChannelName(self.__serviceName, ChannelType.RECV), Request, self.__Enqueue, 10)
+        # lane 0 for normal requests, lanes 1.. for priority requests
+        laneCount = max(2, prioLanes) if enablePriority else 1
+        self.__lanes = [deque() for _ in range(laneCount)]
+        self.__laneLen = [self.QUEUE_LEN] + [self.PRIO_QUEUE_LEN] * (laneCount - 1)
 
-        # start priority request thread
-        self.__queue = BQueue(10)
-        self.__queueThread = Thread(target=self.__QueueThreadFunc, name="server_queue", daemon=True)
-        self.__queueThread.start()
-        
+        # start worker threads
+        for i in range(max(1, workerCount)):
+            self.__StartThread(self.__WorkerThreadFunc, 0, "server_worker_" + str(i))
+
+        # keep one worker for priority requests only, a slow normal api can not hold them up
         if enablePriority:
-            self.__prioQueue = BQueue(5)
-            self.__prioQueueThread = Thread(target=self.__PrioQueueThreadFunc, name="server_prio_queue", daemon=True)
-            self.__prioQueueThread.start()
+            self.__StartThread(self.__WorkerThreadFunc, 1, "server_prio_worker")
 
-        # wait thread started
-        time.sleep(0.5)
+        # create channel, after the workers so early requests have somewhere to go.
+        # no reader queue: __Enqueue runs in the listener, a full lane rejects instead of dropping silently
+        self.__sendChannel = factory.CreateSendChannel(GetServerChannelName(self.__serviceName, ChannelType.SEND), Response, QOS_PROFILE_RPC)
+        self.__recvChannel = factory.CreateRecvChannel(GetServerChannelName(self.__serviceName, ChannelType.RECV), Request, self.__Enqueue, 0,
+                                                       qos=QOS_PROFILE_RPC)
 
     def Send(self, response: Response, timeout: float):
         if self.__sendChannel.Write(response, timeout):
@@ -57,22 +78,64 @@ class ServerStub:
             print("[ServerStub] send error. id:", response.header.identity.id)
             return False
 
+    def GetStats(self):
+        with self.__condition:
+            return {"queued": [len(lane) for lane in self.__lanes], "running": dict(self.__apiRunning),
+                    "handled": self.__handledCount, "rejected": self.__rejectCount}
+
+    def __StartThread(self, target: Callable, minLane: int, name: str):
+        thread = Thread(target=target, args=(minLane,), name=name, daemon=True)
+        thread.start()
+        self.__threads.append(thread)
+
     def __Enqueue(self, request: Request):
+        lane = 0
         if self.__enablePriority and request.header.policy.priority > 0:
-            self.__prioQueue.Put(request, True)
-        else:
-            self.__queue.Put(request, True)
+            lane = min(request.header.policy.priority, len(self.__lanes) - 1)
 
-    def __QueueThreadFunc(self):
-        while True:
-            request = self.__queue.Get()
-            if request is None:
-                continue
-            self.__serverRquestHandler(request)
+        with self.__condition:
+            if len(self.__lanes[lane]) < self.__laneLen[lane]:
+                self.__lanes[lane].append(request)
+                # not every worker can take every request (lane, api limit), wake them all
+                self.__condition.notify_all()
+                return
+            self.__rejectCount += 1
+
+        print("[ServerStub] queue full, request rejected. lane:", lane, ", id:", request.header.identity.id)
+        if self.__rejectHandler is not None:
+            self.__rejectHandler(request)
 
-    def __PrioQueueThreadFunc(self):
+    def __Take(self, minLane: int):
+        # first runnable request, highest lane first. called with the condition held
+        for lane in range(len(self.__lanes) - 1, minLane - 1, -1):
+            queue = self.__lanes[lane]
+            for i, request in enumerate(queue):
+                apiId = request.header.identity.api_id
+                limit = self.__apiLimit.get(apiId, 0)
+                if limit > 0 and self.__apiRunning.get(apiId, 0) >= limit:
+                    continue
+                del queue[i]
+                self.__apiRunning[apiId] = self.__apiRunning.get(apiId, 0) + 1
+                return request
+        return None
+
+    def __WorkerThreadFunc(self, minLane: int):
         while True:
-            request = self.__prioQueue.Get()
-            if request is None:
-                continue
-            self.__serverRquestHandler(request)
+            with self.__condition:
+                request = self.__Take(minLane)
+                while request is None:
+                    self.__condition.wait()
+                    request = self.__Take(minLane)
+
+            apiId = request.header.identity.api_id
+            try:
+                self.__serverRquestHandler(request)
+            except Exception as e:
+                print("[ServerStub] request handler error. msg:", e.args)
+            finally:
+                with self.__condition:
+                    self.__handledCount += 1
+                    self.__apiRunning[apiId] -= 1
+                    # a request held back by the api limit may be runnable now
+                    if apiId in self.__apiLimit:
+                        self.__condition.notify_all()
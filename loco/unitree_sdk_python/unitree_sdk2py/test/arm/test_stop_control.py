@@ -0,0 +1,63 @@
+"""
+" stop_control must not be preempted by a blocking move that was already
+" running when the stop auto-started the stream. in-process loopback backend,
+" a fake robot publishes rt/lowstate.
+"""
+import time
+import threading
+
+from unitree_sdk2py.core.channel import ChannelPublisher, ChannelFactoryInitialize
+from unitree_sdk2py.idl.default import unitree_hg_msg_dds__LowState_
+from unitree_sdk2py.idl.unitree_hg.msg.dds_ import LowState_
+from unitree_sdk2py.arm.arm_client import G1ArmClient, G1ArmConfig
+from unitree_sdk2py.utils.motion_handle import MotionHandle
+
+ChannelFactoryInitialize(0, backend="loopback")
+
+statePublisher = ChannelPublisher("rt/lowstate", LowState_)
+statePublisher.Init()
+state = unitree_hg_msg_dds__LowState_()
+running = True
+
+
+def PublishState():
+    while running:
+        statePublisher.Write(state)
+        time.sleep(0.002)
+
+
+stateThread = threading.Thread(target=PublishState, daemon=True)
+stateThread.start()
+
+config = G1ArmConfig(control_dt=0.005, weight_rate=5.0, max_joint_velocity=5.0, max_joint_acceleration=40.0)
+arm = G1ArmClient(interface=None, config=config)
+
+assert arm.initialize_arms()
+assert arm._weight == 1.0
+# blocking control from here on, weight stays 1
+assert arm.stop_streaming()
+
+# a long blocking move, running on its own thread
+target = [0.5] * arm.ARM_JOINT_COUNT
+moveResult = []
+mover = threading.Thread(target=lambda: moveResult.append(arm.smooth_transition(None, target, 1.0)))
+mover.start()
+time.sleep(0.1)
+
+# the stop auto-starts the stream while the blocking move keeps sending frames,
+# it still finishes within the estimate emergency stops wait for
+stopTime = arm.estimate_stop_time()
+assert stopTime > 0.0
+handle = arm.stop_control(wait=False)
+assert handle is not None
+assert handle.wait(stopTime + 0.5), handle.status
+assert handle.status == MotionHandle.DONE
+
+mover.join(3.0)
+assert moveResult == [False], moveResult
+assert arm._weight == 0.0
+assert not arm.is_streaming()
+
+running = False
+stateThread.join()
+print("stop_control survives a concurrent blocking move: ok")
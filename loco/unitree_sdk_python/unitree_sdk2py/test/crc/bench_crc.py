@@ -0,0 +1,55 @@
+import time
+
+from unitree_sdk2py.idl.default import unitree_go_msg_dds__LowCmd_, unitree_go_msg_dds__LowState_
+from unitree_sdk2py.idl.default import unitree_hg_msg_dds__LowCmd_, unitree_hg_msg_dds__LowState_
+from unitree_sdk2py.utils.crc import CRC
+
+"""
+" micro benchmark: Crc() (struct.pack + __Trans) vs CrcPacked() (preallocated packed buffer)
+"""
+LOOP = 5000
+
+crc = CRC()
+
+def Bench(name: str, msg):
+    start = time.perf_counter()
+    for _ in range(LOOP):
+        crc.Crc(msg)
+    legacy = (time.perf_counter() - start) / LOOP
+
+    start = time.perf_counter()
+    for _ in range(LOOP):
+        crc.CrcPacked(msg)
+    packed = (time.perf_counter() - start) / LOOP
+
+    same = crc.Crc(msg) == crc.CrcPacked(msg)
+    print("{:<12} Crc: {:8.1f} us, CrcPacked: {:8.1f} us, speedup: {:5.2f}x, same: {}".format(
+        name, legacy * 1e6, packed * 1e6, legacy / packed, same))
+
+cmd = unitree_go_msg_dds__LowCmd_()
+for i, m in enumerate(cmd.motor_cmd):
+    m.mode = 0x01
+    m.q = 0.01 * i
+    m.kp = 20.0
+    m.kd = 0.5
+Bench("LowCmd", cmd)
+
+state = unitree_go_msg_dds__LowState_()
+for i, m in enumerate(state.motor_state):
+    m.q = 0.01 * i
+    m.tau_est = 0.1 * i
+Bench("LowState", state)
+
+cmd = unitree_hg_msg_dds__LowCmd_()
+for i, m in enumerate(cmd.motor_cmd):
+    m.mode = 1
+    m.q = 0.01 * i
+    m.kp = 60.0
+    m.kd = 1.5
+Bench("HGLowCmd", cmd)
+
+state = unitree_hg_msg_dds__LowState_()
+for i, m in enumerate(state.motor_state):
+    m.q = 0.01 * i
+    m.tau_est = 0.1 * i
+Bench("HGLowState", state)
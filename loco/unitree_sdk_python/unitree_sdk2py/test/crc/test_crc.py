@@ -25,3 +25,12 @@ state = unitree_hg_msg_dds__LowState_()
 state.crc = crc.Crc(state)
 
 print("CRC[HGLowCmd, HGLowState]: {}, {}".format(cmd.crc, state.crc))
+
+"""
+" Packed buffer CRC must match the struct.pack path.
+"""
+for msg in [unitree_go_msg_dds__LowCmd_(), unitree_go_msg_dds__LowState_(),
+            unitree_hg_msg_dds__LowCmd_(), unitree_hg_msg_dds__LowState_()]:
+    assert crc.CrcPacked(msg) == crc.Crc(msg), msg.__idl_typename__
+
+print("CRC packed: ok")
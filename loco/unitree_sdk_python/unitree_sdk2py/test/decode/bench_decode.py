@@ -0,0 +1,73 @@
+import time
+
+from unitree_sdk2py.idl.default import unitree_hg_msg_dds__LowState_
+from unitree_sdk2py.utils.state_decoder import LowStateDecoder
+
+"""
+" micro benchmark: per sample decode cost of LowStateDecoder against walking
+" motor_state attribute by attribute. a decoder pays off only where one decode
+" is shared (the lowstate daemon), the G1ArmClient getters keep the attribute walk.
+"""
+LOOP = 5000
+
+ARM_JOINTS = list(range(15, 29))
+
+
+def Bench(name: str, legacy, columnar):
+    start = time.perf_counter()
+    for _ in range(LOOP):
+        legacy()
+    legacyTime = (time.perf_counter() - start) / LOOP
+
+    start = time.perf_counter()
+    for _ in range(LOOP):
+        columnar()
+    columnarTime = (time.perf_counter() - start) / LOOP
+
+    print("{:<28} attributes: {:8.1f} us, columnar: {:8.1f} us, speedup: {:5.2f}x".format(
+        name, legacyTime * 1e6, columnarTime * 1e6, legacyTime / columnarTime))
+
+
+lowState = unitree_hg_msg_dds__LowState_()
+for i, m in enumerate(lowState.motor_state):
+    m.q = 0.01 * i
+    m.dq = 0.1 * i
+    m.tau_est = 0.2 * i
+    m.temperature = [30 + i, 31 + i]
+
+
+# arm joint states of G1ArmClient.get_joint_states
+def LegacyArm():
+    states = {'positions': [], 'velocities': [], 'torques': [], 'temperatures': []}
+    for idx in ARM_JOINTS:
+        ms = lowState.motor_state[idx]
+        states['positions'].append(float(ms.q))
+        states['velocities'].append(float(ms.dq))
+        states['torques'].append(float(ms.tau_est))
+        states['temperatures'].append(ms.temperature[0])
+    return states
+
+armDecoder = LowStateDecoder(fields=("q", "dq", "tau_est", "temperature"), motors=ARM_JOINTS)
+
+def ColumnarArm():
+    record = armDecoder.Decode(lowState)
+    return {'positions': record['q'].tolist(), 'velocities': record['dq'].tolist(),
+            'torques': record['tau_est'].tolist(), 'temperatures': record['temperature'][:, 0].tolist()}
+
+
+# full LowState_: every motor field and the imu, what the lowstate daemon decodes
+def LegacyLowState():
+    motors = [(m.mode, m.q, m.dq, m.ddq, m.tau_est, list(m.temperature), m.vol, m.motorstate)
+              for m in lowState.motor_state]
+    imu = lowState.imu_state
+    return motors, list(imu.quaternion), list(imu.gyroscope), list(imu.accelerometer), list(imu.rpy)
+
+lowDecoder = LowStateDecoder()
+
+def ColumnarLowState():
+    return lowDecoder.Decode(lowState)
+
+
+if __name__ == "__main__":
+    Bench("LowState_ arm joints (14)", LegacyArm, ColumnarArm)
+    Bench("LowState_ all motors + imu", LegacyLowState, ColumnarLowState)
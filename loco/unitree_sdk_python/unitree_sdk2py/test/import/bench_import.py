@@ -0,0 +1,49 @@
+import sys
+import json
+import statistics
+import subprocess
+
+"""
+" import time benchmark: every statement runs in a fresh interpreter.
+" reports the median wall time of the import and how many idl type modules it loaded.
+"""
+RUNS = 10 if len(sys.argv) < 2 else int(sys.argv[1])
+
+STATEMENTS = [
+    "import unitree_sdk2py",
+    "from unitree_sdk2py.core.channel import ChannelPublisher",
+    "from unitree_sdk2py.idl.unitree_hg.msg.dds_ import LowCmd_",
+    "from unitree_sdk2py.utils.crc import CRC",
+    "from unitree_sdk2py.idl.default import unitree_hg_msg_dds__LowCmd_",
+    "from unitree_sdk2py.arm.arm_client import G1ArmClient",
+]
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+types = [m for m in sys.modules if m.startswith("unitree_sdk2py.idl.") and m.rsplit(".", 1)[-1].startswith("_")]
+print(json.dumps({{"elapsed": elapsed, "types": len(types)}}))
+"""
+
+
+def Run(statement: str):
+    times = []
+    types = 0
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(statement=statement)],
+                             capture_output=True, text=True)
+        if out.returncode != 0:
+            print("{:<70} error: {}".format(statement, out.stderr.strip().splitlines()[-1]))
+            return
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result["elapsed"])
+        types = result["types"]
+
+    print("{:<70} {:8.1f} ms  idl types: {}".format(statement, statistics.median(times) * 1e3, types))
+
+
+if __name__ == "__main__":
+    for statement in STATEMENTS:
+        Run(statement)
@@ -0,0 +1,100 @@
+import sys
+import time
+import statistics
+
+from unitree_sdk2py.core.channel import ChannelPublisher, ChannelSubscriber, ChannelFactoryInitialize
+from unitree_sdk2py.idl.default import unitree_hg_msg_dds__LowCmd_
+from unitree_sdk2py.idl.unitree_hg.msg.dds_ import LowCmd_
+from unitree_sdk2py.rpc.client import Client
+from unitree_sdk2py.rpc.server import Server
+
+"""
+" publish -> handler and rpc round trip latency, all in this process.
+" usage: python3 bench_loopback.py [loopback|dds] [count]
+"""
+BACKEND = "loopback" if len(sys.argv) < 2 else sys.argv[1]
+COUNT = 10000 if len(sys.argv) < 3 else int(sys.argv[2])
+
+API_ID_ECHO = 1001
+
+
+class EchoServer(Server):
+    def __init__(self):
+        super().__init__("bench_loopback")
+
+    def Init(self):
+        self._SetApiVersion("1.0.0.0")
+        self._RegistHandler(API_ID_ECHO, self.Echo, False)
+
+    def Echo(self, parameter: str):
+        return 0, parameter
+
+
+class EchoClient(Client):
+    def __init__(self):
+        super().__init__("bench_loopback")
+
+    def Init(self):
+        self._SetApiVerson("1.0.0.0")
+        self._RegistApi(API_ID_ECHO, 0)
+
+
+def Report(name: str, times: list):
+    times.sort()
+    print("{:<20} n: {:6d}  median: {:8.1f} us  p99: {:8.1f} us".format(
+        name, len(times), statistics.median(times) * 1e6, times[int(len(times) * 0.99)] * 1e6))
+
+
+def BenchPubSub():
+    received = [0.0]
+
+    def Handler(msg: LowCmd_):
+        received[0] = time.perf_counter()
+
+    sub = ChannelSubscriber("rt/bench_loopback", LowCmd_)
+    sub.Init(Handler)
+    pub = ChannelPublisher("rt/bench_loopback", LowCmd_)
+    pub.Init()
+    pub.WaitMatched(1.0)
+
+    msg = unitree_hg_msg_dds__LowCmd_()
+    times = []
+    for i in range(COUNT):
+        received[0] = 0.0
+        start = time.perf_counter()
+        pub.Write(msg)
+        # dds delivers from its own thread
+        while received[0] == 0.0 and time.perf_counter() - start < 0.1:
+            pass
+        if received[0] > 0.0:
+            times.append(received[0] - start)
+
+    pub.Close()
+    sub.Close()
+    Report("LowCmd_ pub->sub", times)
+
+
+def BenchRpc():
+    server = EchoServer()
+    server.Init()
+    server.Start()
+
+    client = EchoClient()
+    client.SetTimeout(1.0)
+    client.Init()
+
+    times = []
+    for i in range(COUNT // 10):
+        start = time.perf_counter()
+        code, data = client._Call(API_ID_ECHO, "ping")
+        if code == 0:
+            times.append(time.perf_counter() - start)
+
+    Report("rpc round trip", times)
+
+
+if __name__ == "__main__":
+    ChannelFactoryInitialize(0, backend=BACKEND)
+    print("backend:", BACKEND)
+    BenchPubSub()
+    BenchRpc()
@@ -0,0 +1,51 @@
+import sys
+import time
+
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+from unitree_sdk2py.core.lowstate_shm import LowStateDaemon, LowStateView
+
+"""
+" g1 lowstate daemon: subscribes rt/lowstate once and shares it with every
+" process on this machine. readers use LowStateView, or G1ArmConfig(lowstate_shm_name="unitree_lowstate").
+" usage: python3 lowstate_daemon.py networkInterface
+"        python3 lowstate_daemon.py --view      (print what a reader sees)
+"""
+
+
+def View():
+    view = LowStateView()
+    if not view.Init():
+        return
+
+    while True:
+        state = view.Read(1.0)
+        if state is None:
+            print("no lowstate for 1s")
+            continue
+        print("tick:", state.tick, "age: {:.1f} ms".format(view.GetAge() * 1e3),
+              "rpy:", state.imu_state.rpy, "q[15:22]:", state.q[15:22])
+        time.sleep(0.5)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--view":
+        View()
+        sys.exit(0)
+
+    if len(sys.argv) > 1:
+        ChannelFactoryInitialize(0, sys.argv[1])
+    else:
+        ChannelFactoryInitialize(0)
+
+    daemon = LowStateDaemon()
+    if not daemon.Init():
+        sys.exit(1)
+
+    try:
+        while True:
+            time.sleep(10.0)
+            print("[lowstate_daemon]", daemon.GetStats())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.Close()
@@ -0,0 +1,54 @@
+import sys
+import time
+from threading import Thread
+
+from unitree_sdk2py.utils.bqueue import BQueue
+from unitree_sdk2py.utils.ring_buffer import RingBuffer, OverflowPolicy
+
+"""
+" throughput benchmark: BQueue vs RingBuffer, one producer thread, one consumer thread.
+" paced runs at 1kHz/10kHz report put->get latency and cpu time, the unpaced run reports max rate.
+"""
+DURATION = 2.0 if len(sys.argv) < 2 else float(sys.argv[1])
+
+
+def Consume(queue, count, latency):
+    received = 0
+    while received < count:
+        stamp = queue.Get(1.0)
+        if stamp is None:
+            break
+        latency.append(time.perf_counter() - stamp)
+        received += 1
+
+
+def Run(name: str, queue, rate: float):
+    count = int(DURATION * rate) if rate > 0 else 200000
+    latency = []
+    consumer = Thread(target=Consume, args=(queue, count, latency), daemon=True)
+    consumer.start()
+
+    cpu = time.process_time()
+    start = time.perf_counter()
+    for i in range(count):
+        if rate > 0:
+            wait = start + i / rate - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+        queue.Put(time.perf_counter())
+    consumer.join()
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+
+    latency.sort()
+    n = len(latency)
+    mean = sum(latency) / n if n else 0.0
+    p99 = latency[int(n * 0.99)] if n else 0.0
+    label = "{:.0f}Hz".format(rate) if rate > 0 else "unpaced"
+    print("{:<10} {:<8} recv: {:7d}/{:<7d} rate: {:9.0f}/s  latency mean: {:7.1f} us  p99: {:7.1f} us  cpu: {:5.2f}s".format(
+        name, label, n, count, n / elapsed, mean * 1e6, p99 * 1e6, cpu))
+
+
+for rate in [1000.0, 10000.0, 0.0]:
+    Run("BQueue", BQueue(1000), rate)
+    Run("RingBuffer", RingBuffer(1000, OverflowPolicy.BLOCK), rate)
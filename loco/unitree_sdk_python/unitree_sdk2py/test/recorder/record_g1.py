@@ -0,0 +1,60 @@
+"""
+" record:  python3 record_g1.py record g1.ulog [networkInterface]
+" replay:  python3 record_g1.py replay g1.ulog [speed] [networkInterface]
+"""
+import sys
+import time
+
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+from unitree_sdk2py.core.channel_recorder import ChannelRecorder, ChannelLogReader, ChannelPlayer
+from unitree_sdk2py.idl.unitree_hg.msg.dds_ import LowCmd_, LowState_, HandCmd_, HandState_
+from unitree_sdk2py.idl.unitree_go.msg.dds_ import SportModeState_
+
+TOPICS = [
+    ("rt/lowstate", LowState_),
+    ("rt/arm_sdk", LowCmd_),
+    ("rt/dex3/left/cmd", HandCmd_),
+    ("rt/dex3/left/state", HandState_),
+    ("rt/dex3/right/cmd", HandCmd_),
+    ("rt/dex3/right/state", HandState_),
+    ("rt/odommodestate", SportModeState_),
+    ("rt/lf/odommodestate", SportModeState_),
+]
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(-1)
+
+    mode, path = sys.argv[1], sys.argv[2]
+
+    if mode == "record":
+        ChannelFactoryInitialize(0, sys.argv[3] if len(sys.argv) > 3 else None)
+
+        recorder = ChannelRecorder(path)
+        recorder.Open()
+        for name, type in TOPICS:
+            recorder.AddTopic(name, type)
+
+        try:
+            while True:
+                time.sleep(1.0)
+                print("recorder stats:", recorder.GetStats())
+        except KeyboardInterrupt:
+            pass
+        recorder.Close()
+    else:
+        speed = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+        ChannelFactoryInitialize(0, sys.argv[4] if len(sys.argv) > 4 else None)
+
+        reader = ChannelLogReader(path)
+        if not reader.Open():
+            sys.exit(-1)
+
+        start, end = reader.GetTimeRange()
+        print("entries:", reader.GetCount(), ", topics:", [t["name"] for t in reader.GetTopics().values()],
+              ", duration:", (end - start) / 1e9 if start is not None else 0.0)
+
+        count = ChannelPlayer(reader).Play(speed)
+        print("replayed:", count)
+        reader.Close()
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+from unitree_sdk2py.core.channel import ChannelFactoryInitialize
+from unitree_sdk2py.rpc.async_client import AsyncClient
+
+from test_api import *
+
+"""
+" class TestAsyncClient
+"""
+class TestAsyncClient(AsyncClient):
+    def __init__(self, enableLease: bool = False):
+        super().__init__("test", enableLease)
+
+    def Init(self):
+        self._RegistApi(TEST_API_ID_MOVE, 0)
+        self._RegistApi(TEST_API_ID_STOP, 1)
+        self._SetApiVerson(TEST_API_VERSION)
+
+    async def Move(self, vx: float, vy: float, vyaw: float):
+        parameter = {}
+        parameter["vx"] = vx
+        parameter["vy"] = vy
+        parameter["vyaw"] = vyaw
+        p = json.dumps(parameter)
+
+        c, d = await self._Call(TEST_API_ID_MOVE, p)
+        return c
+
+    async def Stop(self):
+        parameter = {}
+        p = json.dumps(parameter)
+
+        c, d = await self._Call(TEST_API_ID_STOP, p)
+        return c
+
+async def main():
+    # create client
+    client = TestAsyncClient(True)
+    client.Init()
+    client.SetTimeout(5.0)
+
+    # get server version
+    code, serverApiVersion = await client.GetServerApiVersion()
+    print("server api version:", serverApiVersion)
+
+    # wait lease applied
+    await client.WaitLeaseApplied()
+
+    # test api, several calls in flight on one event loop
+    while True:
+        codes = await asyncio.gather(client.Move(0.2, 0, 0), client.Move(0, 0.2, 0), client.Move(0, 0, 0.2))
+        print("client move ret:", codes)
+        await asyncio.sleep(1.0)
+
+        code = await client.Stop()
+        print("client stop ret:", code)
+        await asyncio.sleep(1.0)
+
+if __name__ ==  "__main__":
+    # initialize channel factory.
+    ChannelFactoryInitialize(0)
+
+    asyncio.run(main())
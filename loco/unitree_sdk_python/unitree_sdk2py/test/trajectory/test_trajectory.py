@@ -0,0 +1,101 @@
+import numpy as np
+
+from unitree_sdk2py.utils.trajectory import JointTrajectory, WaypointTrajectory, PROFILE_TRAPEZOID, PROFILE_QUINTIC
+
+"""
+" behavior of JointTrajectory / WaypointTrajectory for random deltas and limits:
+" exact endpoints, |v| and |a| within every joint's limit, all joints finishing
+" together, interior corners within blendRadius and radius 0 stopping on the waypoint.
+"""
+rng = np.random.default_rng(7)
+
+CASES = 200
+JOINTS = 7
+DT = 0.02
+# relative slack for float rounding
+EPS = 1e-6
+
+
+def RandomLimits():
+    return rng.uniform(0.2, 3.0, JOINTS), rng.uniform(1.0, 20.0, JOINTS)
+
+
+def CheckLimits(trajectory, start, vmax, amax):
+    # sampled velocities, and the mean velocity / acceleration over every tick, stay within the limits
+    positions = np.vstack([start, trajectory.positions])
+    velocities = np.vstack([np.zeros(JOINTS), trajectory.velocities])
+    assert np.all(np.abs(trajectory.velocities) <= vmax * (1.0 + EPS) + EPS)
+    assert np.all(np.abs(np.diff(positions, axis=0)) / DT <= vmax * (1.0 + EPS) + EPS)
+    assert np.all(np.abs(np.diff(velocities, axis=0)) / DT <= amax * (1.0 + EPS) + EPS)
+
+
+"""
+" JointTrajectory
+"""
+for profile in (PROFILE_TRAPEZOID, PROFILE_QUINTIC):
+    for _ in range(CASES):
+        vmax, amax = RandomLimits()
+        start = rng.uniform(-2.0, 2.0, JOINTS)
+        delta = rng.uniform(-2.0, 2.0, JOINTS) * (rng.random(JOINTS) > 0.2)
+        target = start + delta
+        duration = None if rng.random() < 0.5 else rng.uniform(0.0, 3.0)
+        trajectory = JointTrajectory(start, target, vmax, amax, DT, profile, duration)
+
+        # endpoint exact and at rest
+        assert np.array_equal(trajectory.positions[-1], target)
+        assert np.all(trajectory.velocities[-1] == 0.0)
+        CheckLimits(trajectory, start, vmax, amax)
+
+        # one shared progress s for every moving joint: all start and finish on the same sample
+        moving = np.abs(delta) > 1e-6
+        if moving.any() and len(trajectory) > 1:
+            progress = (trajectory.positions[:, moving] - start[moving]) / delta[moving]
+            assert np.allclose(progress, progress[:, :1], atol=1e-9)
+            assert np.all(progress[:-1, 0] < 1.0)
+
+print("JointTrajectory: ok")
+
+"""
+" WaypointTrajectory with blends
+"""
+for _ in range(CASES):
+    vmax, amax = RandomLimits()
+    points = np.cumsum(rng.uniform(-1.0, 1.0, (rng.integers(2, 6), JOINTS)), axis=0)
+    radius = rng.uniform(0.01, 0.2)
+    trajectory = WaypointTrajectory(points, vmax, amax, DT, radius)
+
+    assert np.array_equal(trajectory.positions[-1], points[-1])
+    assert np.all(trajectory.velocities[-1] == 0.0)
+    CheckLimits(trajectory, points[0], vmax, amax)
+
+    # every joint moving on the last segment is still moving on the sample before the end
+    moving = np.abs(points[-1] - points[-2]) > 1e-6
+    assert np.all(trajectory.positions[-2, moving] != points[-1, moving])
+
+    # interior corners: the path passes within blendRadius of every waypoint (plus half a tick of travel)
+    for waypoint in points[1:-1]:
+        deviation = np.min(np.max(np.abs(trajectory.positions - waypoint), axis=1))
+        assert deviation <= radius + 0.5 * DT * np.max(vmax) + EPS, (deviation, radius)
+
+print("WaypointTrajectory blends: ok")
+
+"""
+" WaypointTrajectory with radius 0 at some waypoints: exact stop there
+"""
+for _ in range(CASES):
+    vmax, amax = RandomLimits()
+    points = np.cumsum(rng.uniform(-1.0, 1.0, (rng.integers(3, 6), JOINTS)), axis=0)
+    radius = rng.uniform(0.01, 0.2, len(points))
+    stops = rng.random(len(points)) < 0.5
+    stops[1] = True
+    radius[stops] = 0.0
+    trajectory = WaypointTrajectory(points, vmax, amax, DT, radius)
+
+    assert np.array_equal(trajectory.positions[-1], points[-1])
+    CheckLimits(trajectory, points[0], vmax, amax)
+    for k in np.flatnonzero(stops[1:-1]) + 1:
+        reached = trajectory.reached[k - 1]
+        assert np.array_equal(trajectory.positions[reached], points[k])
+        assert np.all(trajectory.velocities[reached] == 0.0)
+
+print("WaypointTrajectory stops: ok")
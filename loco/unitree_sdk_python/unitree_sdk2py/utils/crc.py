@@ -1,19 +1,31 @@
 import struct
+import numpy as np
 import cyclonedds
 import cyclonedds.idl as idl
+from typing import TYPE_CHECKING
 
 from .singleton import Singleton
-from ..idl.unitree_go.msg.dds_ import LowCmd_
-from ..idl.unitree_go.msg.dds_ import LowState_
 
-from ..idl.unitree_hg.msg.dds_ import LowCmd_ as HGLowCmd_
-from ..idl.unitree_hg.msg.dds_ import LowState_ as HGLowState_
+# only for annotations, messages are dispatched on __idl_typename__
+if TYPE_CHECKING:
+    from ..idl.unitree_go.msg.dds_ import LowCmd_
+    from ..idl.unitree_go.msg.dds_ import LowState_
+
+    from ..idl.unitree_hg.msg.dds_ import LowCmd_ as HGLowCmd_
+    from ..idl.unitree_hg.msg.dds_ import LowState_ as HGLowState_
 import ctypes
 import os
 import platform
 
 class CRC(Singleton):
+    __inited = False
+
     def __init__(self):
+        # Singleton returns the same instance, but __init__ runs on every CRC()
+        if self.__inited:
+            return
+        self.__inited = True
+
         #4 bytes aligned, little-endian format.
         #size 812
         self.__packFmtLowCmd = '<4B4IH2x' + 'B3x5f3I' * 20 + '4B' + '55Bx2I'
@@ -24,17 +36,77 @@ class CRC(Singleton):
         #size 2092
         self.__packFmtHGLowState = '<2I2B2xI' + '13fh2x' + 'B3x4f2hf7I' * 35 + '40B5I'
 
-        
-        script_dir = os.path.dirname(os.path.abspath(__file__))
+        #packed buffers with the same layouts, preallocated and filled in place
+        self.__dtypeLowCmd = self.__Layout([
+            ('head', 0, ('u1', 2)), ('level_flag', 2, 'u1'), ('frame_reserve', 3, 'u1'),
+            ('sn', 4, ('<u4', 2)), ('version', 12, ('<u4', 2)), ('bandwidth', 20, '<u2'),
+            ('motor_cmd', 24, (self.__Layout([
+                ('mode', 0, 'u1'), ('q', 4, '<f4'), ('dq', 8, '<f4'), ('tau', 12, '<f4'),
+                ('kp', 16, '<f4'), ('kd', 20, '<f4'), ('reserve', 24, ('<u4', 3))], 36), 20)),
+            ('bms_cmd', 744, self.__Layout([('off', 0, 'u1'), ('reserve', 1, ('u1', 3))], 4)),
+            ('wireless_remote', 748, ('u1', 40)), ('led', 788, ('u1', 12)), ('fan', 800, ('u1', 2)),
+            ('gpio', 802, 'u1'), ('reserve', 804, '<u4'), ('crc', 808, '<u4')], 812)
+
+        self.__dtypeLowState = self.__Layout([
+            ('head', 0, ('u1', 2)), ('level_flag', 2, 'u1'), ('frame_reserve', 3, 'u1'),
+            ('sn', 4, ('<u4', 2)), ('version', 12, ('<u4', 2)), ('bandwidth', 20, '<u2'),
+            ('imu_state', 24, self.__Layout([
+                ('quaternion', 0, ('<f4', 4)), ('gyroscope', 16, ('<f4', 3)), ('accelerometer', 28, ('<f4', 3)),
+                ('rpy', 40, ('<f4', 3)), ('temperature', 52, 'u1')], 56)),
+            ('motor_state', 80, (self.__Layout([
+                ('mode', 0, 'u1'), ('q', 4, '<f4'), ('dq', 8, '<f4'), ('ddq', 12, '<f4'), ('tau_est', 16, '<f4'),
+                ('q_raw', 20, '<f4'), ('dq_raw', 24, '<f4'), ('ddq_raw', 28, '<f4'), ('temperature', 32, 'u1'),
+                ('lost', 36, '<u4'), ('reserve', 40, ('<u4', 2))], 48), 20)),
+            ('bms_state', 1040, self.__Layout([
+                ('version_high', 0, 'u1'), ('version_low', 1, 'u1'), ('status', 2, 'u1'), ('soc', 3, 'u1'),
+                ('current', 4, '<i4'), ('cycle', 8, '<u2'), ('bq_ntc', 10, ('u1', 2)), ('mcu_ntc', 12, ('u1', 2)),
+                ('cell_vol', 14, ('<u2', 15))], 44)),
+            ('foot_force', 1084, ('<i2', 4)), ('foot_force_est', 1092, ('<i2', 4)), ('tick', 1100, '<u4'),
+            ('wireless_remote', 1104, ('u1', 40)), ('bit_flag', 1144, 'u1'), ('adc_reel', 1148, '<f4'),
+            ('temperature_ntc1', 1152, 'u1'), ('temperature_ntc2', 1153, 'u1'), ('power_v', 1156, '<f4'),
+            ('power_a', 1160, '<f4'), ('fan_frequency', 1164, ('<u2', 4)), ('reserve', 1172, '<u4'),
+            ('crc', 1176, '<u4')], 1180)
+
+        self.__dtypeHGLowCmd = self.__Layout([
+            ('mode_pr', 0, 'u1'), ('mode_machine', 1, 'u1'),
+            ('motor_cmd', 4, (self.__Layout([
+                ('mode', 0, 'u1'), ('q', 4, '<f4'), ('dq', 8, '<f4'), ('tau', 12, '<f4'),
+                ('kp', 16, '<f4'), ('kd', 20, '<f4'), ('reserve', 24, '<u4')], 28), 35)),
+            ('reserve', 984, ('<u4', 4)), ('crc', 1000, '<u4')], 1004)
+
+        self.__dtypeHGLowState = self.__Layout([
+            ('version', 0, ('<u4', 2)), ('mode_pr', 8, 'u1'), ('mode_machine', 9, 'u1'), ('tick', 12, '<u4'),
+            ('imu_state', 16, self.__Layout([
+                ('quaternion', 0, ('<f4', 4)), ('gyroscope', 16, ('<f4', 3)), ('accelerometer', 28, ('<f4', 3)),
+                ('rpy', 40, ('<f4', 3)), ('temperature', 52, '<i2')], 56)),
+            ('motor_state', 72, (self.__Layout([
+                ('mode', 0, 'u1'), ('q', 4, '<f4'), ('dq', 8, '<f4'), ('ddq', 12, '<f4'), ('tau_est', 16, '<f4'),
+                ('temperature', 20, ('<i2', 2)), ('vol', 24, '<f4'), ('sensor', 28, ('<u4', 2)),
+                ('motorstate', 36, '<u4'), ('reserve', 40, ('<u4', 4))], 56), 35)),
+            ('wireless_remote', 2032, ('u1', 40)), ('reserve', 2072, ('<u4', 4)), ('crc', 2088, '<u4')], 2092)
+
+        self.__bufLowCmd = np.zeros(1, self.__dtypeLowCmd)
+        self.__bufLowState = np.zeros(1, self.__dtypeLowState)
+        self.__bufHGLowCmd = np.zeros(1, self.__dtypeHGLowCmd)
+        self.__bufHGLowState = np.zeros(1, self.__dtypeHGLowState)
+
         self.platform = platform.system()
-        if self.platform == "Linux":
+        self.__crcLib = None
+
+    @property
+    def crc_lib(self):
+        # the shared library is loaded by the first crc, not by CRC()
+        if self.__crcLib is None:
+            script_dir = os.path.dirname(os.path.abspath(__file__))
             if platform.machine()=="x86_64":
-                self.crc_lib = ctypes.CDLL(script_dir + '/lib/crc_amd64.so')
+                crc_lib = ctypes.CDLL(script_dir + '/lib/crc_amd64.so')
             elif platform.machine()=="aarch64":
-                self.crc_lib = ctypes.CDLL(script_dir + '/lib/crc_aarch64.so')
+                crc_lib = ctypes.CDLL(script_dir + '/lib/crc_aarch64.so')
 
-            self.crc_lib.crc32_core.argtypes = (ctypes.POINTER(ctypes.c_uint32), ctypes.c_uint32)
-            self.crc_lib.crc32_core.restype = ctypes.c_uint32
+            crc_lib.crc32_core.argtypes = (ctypes.POINTER(ctypes.c_uint32), ctypes.c_uint32)
+            crc_lib.crc32_core.restype = ctypes.c_uint32
+            self.__crcLib = crc_lib
+        return self.__crcLib
     
     def Crc(self, msg: idl.IdlStruct):
         if msg.__idl_typename__ == 'unitree_go.msg.dds_.LowCmd_':
@@ -48,7 +120,75 @@ class CRC(Singleton):
         else:
             raise TypeError('unknown IDL message type to crc')
 
-    def __PackLowCmd(self, cmd: LowCmd_):
+    def CrcPacked(self, msg: idl.IdlStruct):
+        # same result as Crc(), but the message is written into a preallocated
+        # packed buffer and the crc runs over that buffer in place.
+        if msg.__idl_typename__ == 'unitree_go.msg.dds_.LowCmd_':
+            return self.__Crc32Buffer(self.__FillLowCmd(msg))
+        elif msg.__idl_typename__ == 'unitree_go.msg.dds_.LowState_':
+            return self.__Crc32Buffer(self.__FillLowState(msg))
+        if msg.__idl_typename__ == 'unitree_hg.msg.dds_.LowCmd_':
+            return self.__Crc32Buffer(self.__FillHGLowCmd(msg))
+        elif msg.__idl_typename__ == 'unitree_hg.msg.dds_.LowState_':
+            return self.__Crc32Buffer(self.__FillHGLowState(msg))
+        else:
+            raise TypeError('unknown IDL message type to crc')
+
+    def CrcBuffer(self, data):
+        # crc of an already packed LowCmd/LowState buffer (bytes, bytearray,
+        # memoryview or numpy array). the trailing crc word is not included.
+        words = np.frombuffer(data, dtype='<u4')
+        return self.__Crc32Buffer(words)
+
+    @staticmethod
+    def __Layout(fields, itemsize):
+        return np.dtype({
+            'names': [f[0] for f in fields],
+            'formats': [f[2] for f in fields],
+            'offsets': [f[1] for f in fields],
+            'itemsize': itemsize})
+
+    def __FillLowCmd(self, cmd: "LowCmd_"):
+        buf = self.__bufLowCmd
+        buf[0] = (cmd.head, cmd.level_flag, cmd.frame_reserve, cmd.sn, cmd.version, cmd.bandwidth,
+                  [(m.mode, m.q, m.dq, m.tau, m.kp, m.kd, m.reserve) for m in cmd.motor_cmd[:20]],
+                  (cmd.bms_cmd.off, cmd.bms_cmd.reserve),
+                  cmd.wireless_remote, cmd.led, cmd.fan, cmd.gpio, cmd.reserve, cmd.crc)
+        return buf
+
+    def __FillLowState(self, state: "LowState_"):
+        buf = self.__bufLowState
+        imu = state.imu_state
+        bms = state.bms_state
+        buf[0] = (state.head, state.level_flag, state.frame_reserve, state.sn, state.version, state.bandwidth,
+                  (imu.quaternion, imu.gyroscope, imu.accelerometer, imu.rpy, imu.temperature),
+                  [(m.mode, m.q, m.dq, m.ddq, m.tau_est, m.q_raw, m.dq_raw, m.ddq_raw, m.temperature, m.lost, m.reserve)
+                   for m in state.motor_state[:20]],
+                  (bms.version_high, bms.version_low, bms.status, bms.soc, bms.current, bms.cycle,
+                   bms.bq_ntc, bms.mcu_ntc, bms.cell_vol),
+                  state.foot_force, state.foot_force_est, state.tick, state.wireless_remote, state.bit_flag,
+                  state.adc_reel, state.temperature_ntc1, state.temperature_ntc2, state.power_v, state.power_a,
+                  state.fan_frequency, state.reserve, state.crc)
+        return buf
+
+    def __FillHGLowCmd(self, cmd: "HGLowCmd_"):
+        buf = self.__bufHGLowCmd
+        buf[0] = (cmd.mode_pr, cmd.mode_machine,
+                  [(m.mode, m.q, m.dq, m.tau, m.kp, m.kd, m.reserve) for m in cmd.motor_cmd[:35]],
+                  cmd.reserve, cmd.crc)
+        return buf
+
+    def __FillHGLowState(self, state: "HGLowState_"):
+        buf = self.__bufHGLowState
+        imu = state.imu_state
+        buf[0] = (state.version, state.mode_pr, state.mode_machine, state.tick,
+                  (imu.quaternion, imu.gyroscope, imu.accelerometer, imu.rpy, imu.temperature),
+                  [(m.mode, m.q, m.dq, m.ddq, m.tau_est, m.temperature, m.vol, m.sensor, m.motorstate, m.reserve)
+                   for m in state.motor_state[:35]],
+                  state.wireless_remote, state.reserve, state.crc)
+        return buf
+
+    def __PackLowCmd(self, cmd: "LowCmd_"):
         origData = []
         origData.extend(cmd.head)
         origData.append(cmd.level_flag)
@@ -78,7 +218,7 @@ class CRC(Singleton):
 
         return self.__Trans(struct.pack(self.__packFmtLowCmd, *origData))
 
-    def __PackLowState(self, state: LowState_):
+    def __PackLowState(self, state: "LowState_"):
         origData = []
         origData.extend(state.head)
         origData.append(state.level_flag)
@@ -132,7 +272,7 @@ class CRC(Singleton):
 
         return self.__Trans(struct.pack(self.__packFmtLowState, *origData))
 
-    def __PackHGLowCmd(self, cmd: HGLowCmd_):
+    def __PackHGLowCmd(self, cmd: "HGLowCmd_"):
         origData = []
         origData.append(cmd.mode_pr)
         origData.append(cmd.mode_machine)
@@ -151,7 +291,7 @@ class CRC(Singleton):
 
         return self.__Trans(struct.pack(self.__packFmtHGLowCmd, *origData))
 
-    def __PackHGLowState(self, state: HGLowState_):
+    def __PackHGLowState(self, state: "HGLowState_"):
         origData = []
         origData.extend(state.version)
         origData.append(state.mode_pr)
@@ -226,3 +366,13 @@ class CRC(Singleton):
             return self._crc_ctypes(data)
         else:
             return self._crc_py(data)
+
+    def __Crc32Buffer(self, buf):
+        # 4 bytes aligned, the last word is the crc field itself
+        words = buf.view('<u4')
+        length = len(words) - 1
+        if self.platform == "Linux":
+            ptr = words.ctypes.data_as(ctypes.POINTER(ctypes.c_uint32))
+            return self.crc_lib.crc32_core(ptr, length)
+        else:
+            return self._crc_py(words[:length].tolist())
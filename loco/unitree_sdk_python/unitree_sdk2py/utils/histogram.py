@@ -0,0 +1,66 @@
+import bisect
+
+"""
+" class Histogram
+" fixed buckets, O(log buckets) per sample, constant memory.
+" bounds are upper bounds (inclusive); one extra bucket counts samples above the last bound.
+"""
+class Histogram:
+    # seconds, 0.5ms .. 5s
+    LATENCY_BOUNDS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+    def __init__(self, bounds: tuple = LATENCY_BOUNDS):
+        self.__bounds = tuple(sorted(bounds))
+        self.__buckets = [0] * (len(self.__bounds) + 1)
+        self.__count = 0
+        self.__sum = 0.0
+        self.__min = None
+        self.__max = None
+
+    def Add(self, value: float):
+        self.__buckets[bisect.bisect_left(self.__bounds, value)] += 1
+        self.__count += 1
+        self.__sum += value
+        if self.__min is None or value < self.__min:
+            self.__min = value
+        if self.__max is None or value > self.__max:
+            self.__max = value
+
+    def Reset(self):
+        self.__buckets = [0] * (len(self.__bounds) + 1)
+        self.__count = 0
+        self.__sum = 0.0
+        self.__min = None
+        self.__max = None
+
+    def GetCount(self):
+        return self.__count
+
+    def GetSum(self):
+        return self.__sum
+
+    def GetBounds(self):
+        return self.__bounds
+
+    def GetBuckets(self):
+        return list(self.__buckets)
+
+    def Quantile(self, q: float):
+        # upper bound of the bucket holding the q-th sample, max for the overflow bucket
+        if self.__count == 0:
+            return None
+
+        rank = q * self.__count
+        seen = 0
+        for i, n in enumerate(self.__buckets):
+            seen += n
+            if n > 0 and seen >= rank:
+                return self.__bounds[i] if i < len(self.__bounds) else self.__max
+        return self.__max
+
+    def ToDict(self):
+        return {"count": self.__count, "sum": self.__sum,
+                "mean": self.__sum / self.__count if self.__count else None,
+                "min": self.__min, "max": self.__max,
+                "p50": self.Quantile(0.5), "p99": self.Quantile(0.99),
+                "bounds": list(self.__bounds), "buckets": list(self.__buckets)}
@@ -0,0 +1,119 @@
+import threading
+import numpy as np
+
+
+"""
+" class JointHistory
+" fixed size ring of commanded vs measured joint state, one row per control
+" tick, keyed by time.monotonic(). every column is preallocated, Add only
+" overwrites the oldest row, so memory stays the same however long it runs:
+" capacity * joints * 6 * 4 bytes (float32), 30000 x 14 joints ~ 10 MB.
+"
+" columns: time (tick), cmdQ, cmdDq, q, dq, tau, temperature and stateTime,
+" the receive time of the measured sample (nan when there was none yet).
+"
+" Add is called from the control thread, queries from any thread; both take
+" a lock, queries copy the window out and compute on the copy.
+"""
+class JointHistory:
+    def __init__(self, jointCount: int, capacity: int = 30000):
+        self.__capacity = max(2, capacity)
+        self.__jointCount = jointCount
+        self.__time = np.zeros(self.__capacity, dtype=np.float64)
+        self.__stateTime = np.full(self.__capacity, np.nan, dtype=np.float64)
+        shape = (self.__capacity, jointCount)
+        self.__columns = {name: np.zeros(shape, dtype=np.float32)
+                          for name in ("cmdQ", "cmdDq", "q", "dq", "tau", "temperature")}
+        self.__count = 0
+        self.__lock = threading.Lock()
+
+    def Add(self, time: float, cmdQ, cmdDq=None, q=None, dq=None, tau=None, temperature=None,
+            stateTime: float = None):
+        # one tick, measured columns None when no state was available
+        with self.__lock:
+            row = self.__count % self.__capacity
+            self.__time[row] = time
+            self.__stateTime[row] = np.nan if stateTime is None else stateTime
+            for name, value in (("cmdQ", cmdQ), ("cmdDq", cmdDq), ("q", q), ("dq", dq),
+                                ("tau", tau), ("temperature", temperature)):
+                self.__columns[name][row] = np.nan if value is None else value
+            self.__count += 1
+
+    def Clear(self):
+        with self.__lock:
+            self.__count = 0
+
+    def GetCapacity(self):
+        return self.__capacity
+
+    def GetTotalCount(self):
+        # ticks added since creation, including overwritten ones
+        return self.__count
+
+    def __len__(self):
+        return min(self.__count, self.__capacity)
+
+    def GetWindow(self, window: float = None):
+        # copies of the rows of the last `window` seconds (all rows when None), oldest first
+        with self.__lock:
+            size = min(self.__count, self.__capacity)
+            end = self.__count % self.__capacity
+            order = np.arange(end - size, end) % self.__capacity
+            times = self.__time[order]
+            if window is not None and size:
+                order = order[times >= times[-1] - window]
+                times = self.__time[order]
+            result = {name: column[order] for name, column in self.__columns.items()}
+            result["time"] = times
+            result["stateTime"] = self.__stateTime[order]
+        return result
+
+    def TrackingStats(self, window: float = None, maxLatency: float = 0.5):
+        # tracking of the last `window` seconds, None without measured rows:
+        #   rms:     per joint rms of cmdQ - q
+        #   peakLag: per joint largest |cmdQ - q|, how far the joint fell behind
+        #   latency: command to motion latency (seconds), None when the command did not move:
+        #            the shift of cmdQ that best explains q, from the tick of that command to
+        #            the receive time of q
+        #   samples: rows used
+        rows = self.GetWindow(window)
+        measured = ~np.isnan(rows["stateTime"])
+        if not measured.any():
+            return None
+
+        error = rows["cmdQ"][measured] - rows["q"][measured]
+        return {"rms": np.sqrt(np.mean(error * error, axis=0)), "peakLag": np.max(np.abs(error), axis=0),
+                "latency": self.__Latency(rows, measured, maxLatency), "samples": int(measured.sum())}
+
+    @staticmethod
+    def __Latency(rows: dict, measured: np.ndarray, maxLatency: float):
+        times = rows["time"]
+        if len(times) < 4:
+            return None
+        cmdQ = rows["cmdQ"]
+        moving = np.ptp(cmdQ, axis=0) > 1e-3
+        if not moving.any():
+            return None
+
+        # shift k: q[t] against cmdQ[t - k], rows without a measurement left out
+        dt = float(np.median(np.diff(times)))
+        maxShift = min(len(times) // 2, int(maxLatency / dt) if dt > 0 else 0)
+        q = rows["q"][:, moving]
+        cmd = cmdQ[:, moving]
+        errors = []
+        for k in range(maxShift + 1):
+            use = measured[k:]
+            diff = q[k:][use] - cmd[:len(cmd) - k][use]
+            errors.append(np.mean(diff * diff) if len(diff) else np.inf)
+        best = int(np.argmin(errors))
+        shift = float(best)
+        if 0 < best < maxShift:
+            # parabola through the neighbours, sub tick resolution
+            left, middle, right = errors[best - 1], errors[best], errors[best + 1]
+            curvature = left - 2.0 * middle + right
+            if curvature > 0.0:
+                shift += 0.5 * (left - right) / curvature
+
+        # shift in ticks plus the age of the measured samples at their tick
+        age = rows["stateTime"][measured] - times[measured]
+        return float(shift * dt + np.mean(age))
@@ -0,0 +1,96 @@
+"""
+运动句柄 - 流式控制下一次运动的状态, 可等待/取消/回调 (手臂和灵巧手共用)
+"""
+
+import threading
+from typing import Optional, List
+
+
+class MotionHandle:
+    """
+    流式控制下一次运动的句柄 (G1ArmClient / Dex3Client 的 set_joint_positions(wait=False) 返回)
+    
+    状态: pending(等待控制线程接收) -> running -> done / preempted / cancelled / failed
+    
+    示例:
+        handle = arm.set_joint_positions(pose, wait=False)
+        ...  # 调用方继续做其他事情
+        handle.wait()  # 到达目标返回True
+    """
+    PENDING, RUNNING, DONE = "pending", "running", "done"
+    PREEMPTED, CANCELLED, FAILED = "preempted", "cancelled", "failed"
+    
+    def __init__(self, target: List[float], canceller=None):
+        self.target = target
+        self.status = self.PENDING
+        self._canceller = canceller
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等待运动结束, 到达目标返回True (超时/被抢占/取消/失败返回False)"""
+        self._event.wait(timeout)
+        return self.status == self.DONE
+    
+    def done(self) -> bool:
+        """运动是否已结束 (任意结束状态)"""
+        return self._event.is_set()
+    
+    def cancel(self) -> bool:
+        """取消运动, 手臂停在当前期望位置并保持; 已结束时返回False"""
+        if self.done() or self._canceller is None:
+            return False
+        return self._canceller(self)
+    
+    def add_done_callback(self, callback):
+        """结束时回调 callback(handle), 在控制线程中调用, 不应阻塞; 已结束则立即调用"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+    
+    def _finish(self, status: str):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.status = status
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"[MotionHandle] 运动回调出错: {e}")
+    
+    @classmethod
+    def gather(cls, handles: List["MotionHandle"], target=None) -> "MotionHandle":
+        """
+        合成多个运动的句柄 (如手臂 + 双手的一个姿态): 全部 done 才 done,
+        任一个以其他状态结束则整体以该状态结束; cancel() 取消其中所有未结束的运动
+        """
+        combined = cls(target, lambda handle: any([part.cancel() for part in handles]))
+        if not handles:
+            combined._finish(cls.DONE)
+            return combined
+        combined.status = cls.RUNNING
+        remaining = [len(handles)]
+        lock = threading.Lock()
+        
+        def on_part_done(part: "MotionHandle"):
+            if part.status != cls.DONE:
+                combined._finish(part.status)
+                return
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                combined._finish(cls.DONE)
+        
+        for part in handles:
+            part.add_done_callback(on_part_done)
+        return combined
+    
+    def __repr__(self):
+        return f"MotionHandle(status={self.status})"
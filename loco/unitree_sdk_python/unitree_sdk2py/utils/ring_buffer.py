@@ -0,0 +1,138 @@
+from typing import Any
+from collections import deque
+from threading import Event
+from enum import Enum
+
+"""
+" Enum OverflowPolicy
+"""
+class OverflowPolicy(Enum):
+    DROP_OLDEST = 0
+    DROP_NEWEST = 1
+    BLOCK = 2
+
+"""
+" class RingBuffer
+" fixed capacity queue for one producer thread and one consumer thread.
+" deque append/popleft are atomic, so Put/Get take no lock. the other side
+" is only woken through an Event when it is actually waiting.
+"""
+class RingBuffer:
+    def __init__(self, maxLen: int = 10, policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        self.__maxLen = maxLen if maxLen > 0 else 1
+        self.__policy = policy
+        self.__queue = deque(maxlen=self.__maxLen)
+
+        self.__notEmpty = Event()
+        self.__notFull = Event()
+        self.__getWaiting = False
+        self.__putWaiting = False
+        self.__interrupted = False
+
+        self.__putCount = 0
+        self.__getCount = 0
+        self.__overflowCount = 0
+
+    def Put(self, x: Any, timeout: float = None):
+        # returns False if x or an older item was dropped, or BLOCK timed out
+        noDropped = True
+        if len(self.__queue) >= self.__maxLen:
+            self.__overflowCount += 1
+            if self.__policy == OverflowPolicy.DROP_NEWEST:
+                return False
+            elif self.__policy == OverflowPolicy.BLOCK:
+                if not self.__WaitNotFull(timeout):
+                    return False
+            else:
+                noDropped = False
+
+        self.__queue.append(x)
+        self.__putCount += 1
+
+        if self.__getWaiting:
+            self.__notEmpty.set()
+
+        return noDropped
+
+    def Get(self, timeout: float = None):
+        if not self.__queue and not self.__WaitNotEmpty(timeout):
+            return None
+
+        try:
+            x = self.__queue.popleft()
+        except IndexError:
+            return None
+
+        self.__getCount += 1
+        if self.__putWaiting:
+            self.__notFull.set()
+
+        return x
+
+    def GetMany(self, maxCount: int = 0, timeout: float = None):
+        # wait for at least one item, then take up to maxCount (0: all) without waiting
+        if not self.__queue and not self.__WaitNotEmpty(timeout):
+            return []
+
+        count = len(self.__queue) if maxCount <= 0 else min(maxCount, len(self.__queue))
+        items = []
+        popleft = self.__queue.popleft
+        try:
+            for _ in range(count):
+                items.append(popleft())
+        except IndexError:
+            pass
+
+        self.__getCount += len(items)
+        if self.__putWaiting:
+            self.__notFull.set()
+
+        return items
+
+    def Clear(self):
+        self.__queue.clear()
+        if self.__putWaiting:
+            self.__notFull.set()
+
+    def Size(self):
+        return len(self.__queue)
+
+    def Interrupt(self, notifyAll: bool = False):
+        # wake up a waiting Get/GetMany (returns empty) and a blocked Put.
+        # sticky: a consumer that is about to wait returns immediately too
+        self.__interrupted = True
+        self.__notEmpty.set()
+        self.__notFull.set()
+
+    def GetOverflowCount(self):
+        return self.__overflowCount
+
+    def GetStats(self):
+        return {"put": self.__putCount, "get": self.__getCount, "overflow": self.__overflowCount,
+                "size": len(self.__queue), "maxLen": self.__maxLen, "policy": self.__policy.name}
+
+    def __WaitNotEmpty(self, timeout: float = None):
+        # flag first, clear, then re-check: a Put after the check always sees the flag
+        self.__getWaiting = True
+        self.__notEmpty.clear()
+        try:
+            if self.__queue:
+                return True
+            if not self.__interrupted:
+                self.__notEmpty.wait(timeout)
+            self.__interrupted = False
+            return len(self.__queue) > 0
+        finally:
+            self.__getWaiting = False
+
+    def __WaitNotFull(self, timeout: float = None):
+        self.__putWaiting = True
+        self.__notFull.clear()
+        try:
+            if len(self.__queue) < self.__maxLen:
+                return True
+            if not self.__interrupted:
+                self.__notFull.wait(timeout)
+            return len(self.__queue) < self.__maxLen
+        finally:
+            self.__putWaiting = False
@@ -0,0 +1,124 @@
+import operator
+import itertools
+import numpy as np
+
+
+"""
+" columnar decoding of unitree_hg LowState_, for the shared memory lowstate daemon
+"
+" the motor structs of a message are walked once, each
+" read as one tuple of its fields, and their values land in a preallocated numpy record holding one contiguous
+" array per field: q[35], dq[35], tau_est[35], temperature[35, 2], ...
+" Decode fills and returns the same record on every call, copy what has to
+" outlive the next Decode. a decoder is not thread safe.
+"""
+MOTOR_FIELDS = ("mode", "q", "dq", "ddq", "tau_est", "temperature", "vol", "motorstate")
+
+_MOTOR_FORMATS = {
+    "mode": ("u1", ()), "q": ("<f4", ()), "dq": ("<f4", ()), "ddq": ("<f4", ()), "tau_est": ("<f4", ()),
+    "temperature": ("<i2", (2,)), "vol": ("<f4", ()), "motorstate": ("<u4", ()),
+}
+
+_IMU_FIELDS = [
+    ("quaternion", "<f4", (4,)), ("gyroscope", "<f4", (3,)), ("accelerometer", "<f4", (3,)),
+    ("rpy", "<f4", (3,)), ("imu_temperature", "<i2"),
+]
+
+def _MotorFields(count: int, fields: tuple):
+    return [(name, _MOTOR_FORMATS[name][0], (count,) + _MOTOR_FORMATS[name][1]) for name in fields]
+
+
+def _CheckOut(out: np.ndarray, dtype: np.dtype):
+    if out is None:
+        return np.zeros((), dtype)
+    if out.dtype != dtype or out.shape != ():
+        raise TypeError("decoder output record does not match the decoder layout")
+    return out
+
+
+def LowStateDtype(fields: tuple = MOTOR_FIELDS, motorCount: int = 35):
+    return np.dtype([("tick", "<u4"), ("mode_pr", "u1"), ("mode_machine", "u1")]
+                    + _MotorFields(motorCount, fields) + _IMU_FIELDS
+                    + [("wireless_remote", "u1", (40,))], align=True)
+
+
+def _Columns(record: np.ndarray, names: tuple):
+    # (getter, views): the getter reads every field of one item as a tuple, a Decode walks
+    # the items once and writes the transposed values into the field views in place
+    getter = operator.attrgetter(*names)
+    if len(names) == 1:
+        single = getter
+        getter = lambda item: (single(item),)
+    return getter, [record[name] for name in names]
+
+
+def _FillColumns(columns: tuple, items: list):
+    getter, views = columns
+    for view, values in zip(views, zip(*map(getter, items))):
+        if view.ndim == 1:
+            view[...] = values
+        else:
+            # per item arrays (temperature[2]): flattened, a tuple of lists converts much slower
+            flat = view.reshape(-1)
+            flat[...] = np.fromiter(itertools.chain.from_iterable(values), flat.dtype, flat.size)
+
+
+def _FillFields(columns: tuple, item):
+    getter, views = columns
+    for view, value in zip(views, getter(item)):
+        view[...] = value
+
+
+_IMU_NAMES = ("quaternion", "gyroscope", "accelerometer", "rpy")
+
+
+"""
+" class LowStateDecoder
+" fields selects the motor fields to decode (all by default), motors the
+" motor indices (all motorCount by default): record["q"][i] is then motor
+" motors[i]. out is an optional record of LowStateDtype(fields, len(motors))
+" to decode into, e.g. shared memory.
+"""
+class LowStateDecoder:
+    def __init__(self, fields: tuple = MOTOR_FIELDS, motorCount: int = 35, motors: list = None,
+                 out: np.ndarray = None):
+        self.__fields = tuple(fields)
+        self.__motorCount = motorCount
+        self.__motors = None if motors is None else [int(i) for i in motors]
+        count = motorCount if motors is None else len(self.__motors)
+        self.__record = _CheckOut(out, LowStateDtype(self.__fields, count))
+        self.__motorColumns = _Columns(self.__record, self.__fields)
+        self.__imuColumns = _Columns(self.__record, _IMU_NAMES)
+        self.__scalars = _Columns(self.__record, ("tick", "mode_pr", "mode_machine", "wireless_remote"))
+        self.__imuTemperature = self.__record["imu_temperature"]
+
+    def Decode(self, msg):
+        # the record, or None when the message has fewer motors than the decoder
+        if hasattr(msg, "GetState"):
+            # LowStateSample of the shared memory lowstate, already decoded
+            state = msg.GetState()
+            for name in self.__fields:
+                self.__record[name] = state[name] if self.__motors is None else state[name][self.__motors]
+            for name in ("tick", "mode_pr", "mode_machine", "wireless_remote", "imu_temperature") + _IMU_NAMES:
+                self.__record[name] = state[name]
+            return self.__record
+
+        motors = msg.motor_state
+        if len(motors) < self.__motorCount:
+            return None
+        if self.__motors is not None:
+            motors = [motors[i] for i in self.__motors]
+        elif len(motors) > self.__motorCount:
+            motors = motors[:self.__motorCount]
+
+        _FillColumns(self.__motorColumns, motors)
+
+        imu = msg.imu_state
+        _FillFields(self.__imuColumns, imu)
+        self.__imuTemperature[...] = imu.temperature
+
+        _FillFields(self.__scalars, msg)
+        return self.__record
+
+    def GetRecord(self):
+        return self.__record
@@ -2,10 +2,14 @@ import sys
 import os
 import errno
 import ctypes
+import time
 import struct
 import threading
 
+from enum import Enum
+
 from .future import Future
+from .histogram import Histogram
 from .timerfd import *
 
 class Thread(Future):
@@ -34,50 +38,162 @@ class Thread(Future):
             info = sys.exc_info() 
             self.Fail(f"[Thread] target func raise exception: name={info[0].__name__}, args={str(info[1].args)}")
 
+"""
+" Enum OverrunPolicy
+"""
+class OverrunPolicy(Enum):
+    SKIP = 0        # run once after an overrun, the missed ticks are dropped
+    CATCH_UP = 1    # run once per missed tick, back to back
+
+"""
+" class PeriodicTimer
+" timerfd based period for loops that own their thread: do the work, then
+" Wait() for the next tick. the expiration count read from the fd tells how
+" many ticks passed; with SKIP the missed ones are dropped, with CATCH_UP the
+" next Wait() calls return at once until they are made up (at most
+" maxCatchUp). records overruns, missed ticks, execution time (wake-up to
+" Wait) and wake-up jitter (wake-up vs. scheduled tick).
+"""
+class PeriodicTimer:
+    # seconds, 20us .. 100ms
+    TIME_BOUNDS = (0.00002, 0.00005, 0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1)
+
+    def __init__(self, interval: float, policy: OverrunPolicy = OverrunPolicy.SKIP, maxCatchUp: int = 10):
+        self.__inter = interval
+        self.__policy = policy
+        self.__maxCatchUp = maxCatchUp
+        self.__tfd = None
+        self.__startTime = 0.0
+        self.__tick = 0
+        self.__wakeTime = 0.0
+        self.__owed = 0
+
+        self.__iterations = 0
+        self.__overruns = 0
+        self.__missed = 0
+        self.__execTime = Histogram(self.TIME_BOUNDS)
+        self.__jitter = Histogram(self.TIME_BOUNDS)
+
+    def Start(self):
+        # clock type CLOCK_MONOTONIC = 1
+        self.__tfd = timerfd_create(1, 0)
+        spec = itimerspec.from_seconds(self.__inter, self.__inter)
+        timerfd_settime(self.__tfd, 0, ctypes.byref(spec), None)
+        self.__startTime = time.monotonic()
+        self.__wakeTime = self.__startTime
+        self.__tick = 0
+        self.__owed = 0
+
+    def Wait(self):
+        # returns the number of ticks that passed, 0 for a catch-up iteration
+        now = time.monotonic()
+        self.__execTime.Add(now - self.__wakeTime)
+        self.__iterations += 1
+
+        if self.__owed > 0:
+            self.__owed -= 1
+            self.__wakeTime = now
+            return 0
+
+        try:
+            expirations = struct.unpack("Q", os.read(self.__tfd, 8))[0]
+        except OSError as e:
+            if e.errno != errno.EAGAIN:
+                raise e
+            expirations = 1
+
+        self.__wakeTime = time.monotonic()
+        self.__tick += expirations
+        self.__jitter.Add(max(0.0, self.__wakeTime - (self.__startTime + self.__tick * self.__inter)))
+
+        if expirations > 1:
+            self.__overruns += 1
+            if self.__policy == OverrunPolicy.CATCH_UP:
+                self.__owed = min(expirations - 1, self.__maxCatchUp)
+            self.__missed += expirations - 1 - self.__owed
+
+        return expirations
+
+    def Close(self):
+        if self.__tfd is not None:
+            os.close(self.__tfd)
+            self.__tfd = None
+
+    def GetStats(self):
+        return {"interval": self.__inter, "policy": self.__policy.name, "iterations": self.__iterations,
+                "overruns": self.__overruns, "missed": self.__missed,
+                "exec": self.__execTime.ToDict(), "jitter": self.__jitter.ToDict()}
+
+    def __enter__(self):
+        self.Start()
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+
+def SetThreadScheduling(priority: int = 0, cpus: list = None):
+    # SCHED_FIFO with priority (1-99) and/or cpu affinity for the calling thread.
+    # needs CAP_SYS_NICE for SCHED_FIFO; failures are reported, not raised
+    ok = True
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+        except (OSError, AttributeError) as e:
+            print("[Thread] set cpu affinity error. cpus:", cpus, ", msg:", e)
+            ok = False
+    if priority > 0:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        except (OSError, AttributeError) as e:
+            print("[Thread] set SCHED_FIFO error. priority:", priority, ", msg:", e)
+            ok = False
+    return ok
+
+
 class RecurrentThread(Thread):
-    def __init__(self, interval: float = 1.0, target = None, name = None, args = (), kwargs = None):
+    def __init__(self, interval: float = 1.0, target = None, name = None, args = (), kwargs = None,
+                 policy: OverrunPolicy = OverrunPolicy.SKIP, priority: int = 0, cpus: list = None):
         self.__quit = False
         self.__inter = interval
         self.__loopTarget = target
         self.__loopArgs = args
         self.__loopKwargs = {} if kwargs is None else kwargs
+        self.__priority = priority
+        self.__cpus = cpus
+        self.__timer = None
 
         if interval is None or interval <= 0.0:
             super().__init__(target=self.__LoopFunc_0, name=name)
         else:
+            self.__timer = PeriodicTimer(interval, policy)
             super().__init__(target=self.__LoopFunc, name=name)
 
     def Wait(self, timeout: float = None):
         self.__quit = True
         super().Wait(timeout)
 
+    def GetStats(self):
+        # overruns, missed ticks, execution time and wake-up jitter; None without interval
+        return None if self.__timer is None else self.__timer.GetStats()
+
+    def __RunTarget(self):
+        try:
+            self.__loopTarget(*self.__loopArgs, **self.__loopKwargs)
+        except:
+            info = sys.exc_info()
+            print(f"[RecurrentThread] target func raise exception: name={info[0].__name__}, args={str(info[1].args)}")
+
     def __LoopFunc(self):
-        # clock type CLOCK_MONOTONIC = 1
-        tfd = timerfd_create(1, 0)
-        spec = itimerspec.from_seconds(self.__inter, self.__inter)
-        timerfd_settime(tfd, 0, ctypes.byref(spec), None)
+        SetThreadScheduling(self.__priority, self.__cpus)
 
-        while not self.__quit:
-            try:
-                self.__loopTarget(*self.__loopArgs, **self.__loopKwargs)
-            except:
-                info = sys.exc_info()
-                print(f"[RecurrentThread] target func raise exception: name={info[0].__name__}, args={str(info[1].args)}")
-
-            try:
-                buf = os.read(tfd, 8)
-                # print(struct.unpack("Q", buf)[0])
-            except OSError as e:
-                if e.errno != errno.EAGAIN:
-                    raise e
-
-        os.close(tfd)
+        with self.__timer as timer:
+            while not self.__quit:
+                self.__RunTarget()
+                timer.Wait()
     
     def __LoopFunc_0(self):
-        while not self.__quit:
-            try:
-                self.__loopTarget(*self.__args, **self.__kwargs)
-            except:
-                info = sys.exc_info() 
-                print(f"[RecurrentThread] target func raise exception: name={info[0].__name__}, args={str(info[1].args)}")
+        SetThreadScheduling(self.__priority, self.__cpus)
 
+        while not self.__quit:
+            self.__RunTarget()
@@ -0,0 +1,245 @@
+import math
+import numpy as np
+
+
+"""
+" synchronized point to point joint trajectories
+"
+" every joint follows q = start + (target - start) * s(t) with one shared
+" normalized profile s: 0 -> 1, so all joints start and stop together and
+" move on a straight line in joint space. the duration is the shortest one
+" that keeps every joint within its velocity and acceleration limit (the
+" joint with the most travel for its limits sets it), or a longer requested
+" duration, which slows the profile down.
+"
+" trapezoid: constant acceleration, cruise, constant deceleration
+" quintic:   minimum jerk s = 10u^3 - 15u^4 + 6u^5 (u = t / T), zero velocity
+"            and acceleration at both ends
+"
+" the whole motion is sampled once, vectorized: a control loop then only
+" indexes positions[i] / velocities[i] per tick.
+"""
+PROFILE_TRAPEZOID = "trapezoid"
+PROFILE_QUINTIC = "quintic"
+
+# peak velocity and acceleration of the quintic over unit distance and unit time
+QUINTIC_PEAK_VELOCITY = 1.875
+QUINTIC_PEAK_ACCELERATION = 10.0 / math.sqrt(3.0)
+
+
+def _ProfileLimits(delta: np.ndarray, velocityLimits, accelerationLimits):
+    # limits of s' and s'': joint i moves |delta[i]| * s', joints that do not move put no limit
+    distance = np.abs(delta)
+    moving = distance > 0.0
+    if not moving.any():
+        return None, None
+    velocity = np.broadcast_to(np.asarray(velocityLimits, dtype=np.float64), distance.shape)
+    acceleration = np.broadcast_to(np.asarray(accelerationLimits, dtype=np.float64), distance.shape)
+    return (float(np.min(velocity[moving] / distance[moving])),
+            float(np.min(acceleration[moving] / distance[moving])))
+
+
+def TrajectoryDuration(delta, velocityLimits, accelerationLimits, profile: str = PROFILE_TRAPEZOID):
+    # shortest duration of a synchronized motion over delta, 0.0 when nothing moves
+    v, a = _ProfileLimits(np.asarray(delta, dtype=np.float64), velocityLimits, accelerationLimits)
+    if v is None:
+        return 0.0
+
+    if profile == PROFILE_QUINTIC:
+        return max(QUINTIC_PEAK_VELOCITY / v, math.sqrt(QUINTIC_PEAK_ACCELERATION / a))
+    if profile != PROFILE_TRAPEZOID:
+        raise ValueError("unknown trajectory profile: " + str(profile))
+
+    if v * v >= a:
+        # the velocity limit is never reached: triangle
+        return 2.0 / math.sqrt(a)
+    return 1.0 / v + v / a
+
+
+def _Trapezoid(t: np.ndarray, duration: float, a: float):
+    # keeps the acceleration limit, cruises at the velocity that covers distance 1 in `duration`
+    cruise = 0.5 * (a * duration - math.sqrt(max(0.0, a * a * duration * duration - 4.0 * a)))
+    ramp = cruise / a
+    s = np.empty_like(t)
+    sd = np.empty_like(t)
+
+    accel = t < ramp
+    decel = t > duration - ramp
+    coast = ~(accel | decel)
+    s[accel] = 0.5 * a * t[accel] ** 2
+    sd[accel] = a * t[accel]
+    s[coast] = cruise * (t[coast] - 0.5 * ramp)
+    sd[coast] = cruise
+    left = duration - t[decel]
+    s[decel] = 1.0 - 0.5 * a * left ** 2
+    sd[decel] = a * left
+    return s, sd
+
+
+def _Quintic(t: np.ndarray, duration: float):
+    u = t / duration
+    s = u ** 3 * (10.0 - 15.0 * u + 6.0 * u * u)
+    sd = 30.0 * u * u * (1.0 - u) ** 2 / duration
+    return s, sd
+
+
+"""
+" class JointTrajectory
+" samples at t = dt, 2dt, ... up to the duration, the last one exactly at
+" the target. positions/velocities are (len, joints) arrays.
+"""
+class JointTrajectory:
+    def __init__(self, start, target, velocityLimits, accelerationLimits, dt: float,
+                 profile: str = PROFILE_TRAPEZOID, duration: float = None):
+        self.start = np.asarray(start, dtype=np.float64)
+        self.target = np.asarray(target, dtype=np.float64)
+        self.profile = profile
+        delta = self.target - self.start
+
+        minDuration = TrajectoryDuration(delta, velocityLimits, accelerationLimits, profile)
+        self.duration = minDuration if duration is None else max(duration, minDuration)
+
+        count = max(1, math.ceil(self.duration / dt - 1e-9))
+        t = np.minimum(np.arange(1, count + 1, dtype=np.float64) * dt, self.duration)
+        if minDuration == 0.0:
+            s, sd = np.ones_like(t), np.zeros_like(t)
+        elif profile == PROFILE_QUINTIC:
+            s, sd = _Quintic(t, self.duration)
+        else:
+            s, sd = _Trapezoid(t, self.duration, _ProfileLimits(delta, velocityLimits, accelerationLimits)[1])
+
+        self.positions = self.start + np.outer(s, delta)
+        self.velocities = np.outer(sd, delta)
+        self.positions[-1] = self.target
+        self.velocities[-1] = 0.0
+
+    def __len__(self):
+        return len(self.positions)
+
+
+"""
+" multi waypoint trajectories
+"
+" one continuous motion through waypoints[0] (the start), waypoints[1], ...
+" as linear segments joined by parabolic blends: segment k runs at constant
+" velocity (waypoints[k + 1] - waypoints[k]) / T[k], and around each waypoint
+" the velocity changes from the incoming to the outgoing one at constant
+" acceleration. all joints share the segment durations and blend times, so
+" they stay synchronized; the motion starts and ends at rest exactly on the
+" first and last waypoint and only slows down where a joint turns around.
+"
+" an interior waypoint is not hit exactly: the blend cuts the corner by
+" |v_out - v_in| * tb / 8 per joint. blendRadius bounds that deviation (rad,
+" one value or one per waypoint); segments next to a waypoint whose corner
+" would be cut wider are slowed down until it fits. radius 0 stops exactly
+" on that waypoint: the motion is split there into separate blended pieces,
+" usually faster than squeezing a small corner.
+"
+" T[k] starts from the cruise time at the velocity limit of the slowest
+" joint, blend times from the acceleration limit, and segments are
+" stretched until neighbouring blends do not overlap.
+"""
+_MAX_STRETCH_ROUNDS = 100
+
+
+def _Blends(points: np.ndarray, duration: np.ndarray, amax: np.ndarray):
+    # segment velocities, velocity before/after each waypoint, blend time per waypoint
+    velocity = np.diff(points, axis=0) / duration[:, None]
+    zero = np.zeros((1, points.shape[1]))
+    before = np.vstack([zero, velocity])
+    after = np.vstack([velocity, zero])
+    blend = np.max(np.abs(after - before) / amax, axis=1)
+    return velocity, before, after, blend
+
+
+"""
+" class WaypointTrajectory
+" same sampling and attributes as JointTrajectory. reached[k] is the sample
+" index closest to waypoints[k + 1]. durations: optional minimum duration per
+" segment.
+"""
+class WaypointTrajectory:
+    def __init__(self, waypoints, velocityLimits, accelerationLimits, dt: float,
+                 blendRadius=None, durations=None):
+        points = np.asarray(waypoints, dtype=np.float64)
+        if points.ndim != 2 or len(points) < 2:
+            raise ValueError("a waypoint trajectory needs the start and at least one waypoint")
+        self.start = points[0]
+        self.target = points[-1]
+        joints = points.shape[1]
+        vmax = np.broadcast_to(np.asarray(velocityLimits, dtype=np.float64), (joints,))
+        amax = np.broadcast_to(np.asarray(accelerationLimits, dtype=np.float64), (joints,))
+        radius = None
+        if blendRadius is not None:
+            radius = np.broadcast_to(np.asarray(blendRadius, dtype=np.float64), (len(points),)).copy()
+            radius[0] = radius[-1] = np.inf
+            stops = np.flatnonzero(radius[1:-1] <= 0.0) + 1
+            if len(stops):
+                self.__Split(points, velocityLimits, accelerationLimits, dt, radius, durations, stops)
+                return
+
+        duration = np.max(np.abs(np.diff(points, axis=0)) / vmax, axis=1)
+        if durations is not None:
+            duration = np.maximum(duration, np.asarray(durations, dtype=np.float64))
+        duration = np.maximum(duration, dt)
+
+        for _ in range(_MAX_STRETCH_ROUNDS):
+            velocity, before, after, blend = _Blends(points, duration, amax)
+            # half blends of both ends have to fit in a segment
+            stretch = np.sqrt(np.maximum((0.5 * blend[:-1] + 0.5 * blend[1:]) / duration, 1.0))
+            if radius is not None:
+                deviation = np.max(np.abs(after - before), axis=1) * blend / 8.0
+                corner = np.sqrt(np.maximum(deviation / np.maximum(radius, 1e-9), 1.0))
+                stretch = np.maximum(stretch, np.maximum(corner[:-1], corner[1:]))
+            if np.all(stretch <= 1.0 + 1e-9):
+                break
+            duration = duration * np.maximum(stretch, 1.0 + 1e-3)
+
+        self.durations = duration
+        # waypoint times: the motion starts half a blend before the first one
+        times = 0.5 * blend[0] + np.concatenate([[0.0], np.cumsum(duration)])
+        self.duration = float(times[-1] + 0.5 * blend[-1])
+
+        count = max(1, math.ceil(self.duration / dt - 1e-9))
+        t = np.minimum(np.arange(1, count + 1, dtype=np.float64) * dt, self.duration)
+
+        # linear part of the nearest segment, then the blends override it
+        k = np.clip(np.searchsorted(times, t) - 1, 0, len(duration) - 1)
+        offset = (t - times[k])[:, None]
+        positions = points[k] + velocity[k] * offset
+        velocities = velocity[k].copy()
+        for i in (k, k + 1):
+            inBlend = np.abs(t - times[i]) <= 0.5 * blend[i]
+            if not inBlend.any():
+                continue
+            i = i[inBlend]
+            local = (t[inBlend] - times[i] + 0.5 * blend[i])[:, None]
+            rate = (after[i] - before[i]) / np.maximum(blend[i], 1e-12)[:, None]
+            positions[inBlend] = points[i] + before[i] * (t[inBlend] - times[i])[:, None] + 0.5 * rate * local ** 2
+            velocities[inBlend] = before[i] + rate * local
+
+        self.positions = positions
+        self.velocities = velocities
+        self.positions[-1] = self.target
+        self.velocities[-1] = 0.0
+        self.reached = np.minimum(np.searchsorted(t, times[1:] - 0.5 * dt), count - 1)
+        self.reached[-1] = count - 1
+
+    def __Split(self, points, velocityLimits, accelerationLimits, dt, radius, durations, stops):
+        # pieces between the stops, each starts and ends at rest
+        bounds = [0] + list(stops) + [len(points) - 1]
+        pieces = []
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            pieces.append(WaypointTrajectory(points[first:last + 1], velocityLimits, accelerationLimits, dt,
+                                             radius[first:last + 1],
+                                             None if durations is None else durations[first:last]))
+
+        offsets = np.cumsum([0] + [len(piece) for piece in pieces[:-1]])
+        self.positions = np.vstack([piece.positions for piece in pieces])
+        self.velocities = np.vstack([piece.velocities for piece in pieces])
+        self.reached = np.concatenate([piece.reached + offset for piece, offset in zip(pieces, offsets)])
+        self.durations = np.concatenate([piece.durations for piece in pieces])
+        self.duration = len(self.positions) * dt
+
+    def __len__(self):
+        return len(self.positions)
@@ -0,0 +1,148 @@
+"""
+G1 全身协同控制 - 手臂 + 左右 Dex3 灵巧手共用一个控制循环
+
+提供:
+- 一个控制线程 (按手臂 control_dt) 同时推进手臂和双手的轨迹, 每个周期依次发布
+  rt/arm_sdk 和两只手的 cmd 话题, 三者不再各自 sleep 而逐渐错开
+- set_pose() 立即返回整个姿态的 MotionHandle, 手臂和双手都到达后才算完成
+- 手臂和双手都使用各自客户端的流式控制 (外部时钟模式), 本控制器只提供时钟;
+  运行期间直接调用客户端的 set_joint_positions 也经由同一个控制循环发布
+"""
+
+from typing import Optional, List
+
+from unitree_sdk2py.arm.arm_client import G1ArmClient
+from unitree_sdk2py.utils.motion_handle import MotionHandle
+from unitree_sdk2py.utils.thread import RecurrentThread, OverrunPolicy
+
+
+class WholeBodyController:
+    """
+    全身协同控制器
+
+    示例:
+        body = WholeBodyController(arm_client, left_hand_client, right_hand_client)
+        body.start()
+        handle = body.set_pose(arm_positions, left_hand_positions, right_hand_positions)
+        handle.wait()
+        body.stop()
+    """
+
+    def __init__(self, arm_client: G1ArmClient, left_hand=None, right_hand=None):
+        """
+        参数:
+            arm_client: 已初始化 (initialize_arms) 的 G1ArmClient
+            left_hand: 左手 Dex3Client (可选)
+            right_hand: 右手 Dex3Client (可选)
+        """
+        self.arm = arm_client
+        self.hands = {name: client for name, client in (('left', left_hand), ('right', right_hand))
+                      if client is not None}
+        self.control_dt = arm_client.config.control_dt
+        self.last_loop_stats = None  # 最近一次控制循环的定时统计
+
+        self._thread: Optional[RecurrentThread] = None
+
+    def start(self) -> bool:
+        """
+        启动控制线程 (手臂和双手切换到外部时钟流式控制), 已启动也返回True
+
+        手的轨迹按各自 Dex3Config.control_dt 采样, 每个周期推进一个采样点;
+        与手臂 control_dt 不同时会以错误的速率播放, 此时拒绝启动
+        """
+        if self._thread is not None:
+            return True
+        for name, hand in self.hands.items():
+            if abs(hand.config.control_dt - self.control_dt) > 1e-9:
+                print(f"[WholeBody] 错误: {name}手 control_dt ({hand.config.control_dt}s) "
+                      f"与手臂 control_dt ({self.control_dt}s) 不同")
+                return False
+        for client in [self.arm] + list(self.hands.values()):
+            if client.is_streaming():
+                client.stop_streaming()
+            if not client.start_streaming(external=True):
+                return False
+        # 超时的周期直接跳过 (SKIP), 不连续补发旧命令
+        self._thread = RecurrentThread(self.control_dt, target=self._tick, name="g1_whole_body",
+                                       policy=OverrunPolicy.SKIP)
+        self._thread.Start()
+        print(f"[WholeBody] 控制循环已启动 ({1.0 / self.control_dt:.0f}Hz, 手: {list(self.hands)})")
+        return True
+
+    def stop(self, timeout: float = 1.0) -> bool:
+        """停止控制线程, 未完成的运动以 failed 结束; 手臂和双手恢复为阻塞式控制"""
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.Wait(timeout)
+        self._thread = None
+        self.last_loop_stats = thread.GetStats()
+        for client in [self.arm] + list(self.hands.values()):
+            client.stop_streaming()
+        print("[WholeBody] 控制循环已停止")
+        return True
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def set_pose(
+        self,
+        arm_positions: Optional[List[float]] = None,
+        left_hand_positions: Optional[List[float]] = None,
+        right_hand_positions: Optional[List[float]] = None,
+        duration: Optional[float] = None,
+        speed_factor: float = 1.0
+    ) -> Optional[MotionHandle]:
+        """
+        设置全身姿态 - 立即返回
+
+        各部分同时开始, 各自按速度/加速度上限规划 (duration 为最短时长);
+        新姿态抢占各部分尚未完成的运动。
+
+        参数:
+            arm_positions: 手臂关节位置 (14个), None 表示保持
+            left_hand_positions / right_hand_positions: 手关节位置 (7个), None 表示保持
+            duration: 最短执行时间(秒), None 自动计算
+            speed_factor: 速度因子
+
+        返回:
+            整个姿态的 MotionHandle (所有部分到达后 done, 任一部分被抢占/取消/失败则为该状态),
+            参数错误或未启动时返回 None (已提交的部分被取消)
+        """
+        if self._thread is None:
+            print("[WholeBody] 错误: 控制循环未启动")
+            return None
+
+        parts = []
+        for name, positions in (('left', left_hand_positions), ('right', right_hand_positions)):
+            if positions is None:
+                continue
+            hand = self.hands.get(name)
+            if hand is None:
+                print(f"[WholeBody] 错误: 没有{name}手")
+                return self._abort(parts)
+            handle = hand.set_joint_positions(positions, duration, speed_factor, wait=False)
+            if handle is None:
+                return self._abort(parts)
+            parts.append(handle)
+
+        if arm_positions is not None:
+            handle = self.arm.set_joint_positions(arm_positions, duration, speed_factor, wait=False)
+            if handle is None:
+                return self._abort(parts)
+            parts.append(handle)
+
+        return MotionHandle.gather(parts, arm_positions)
+
+    @staticmethod
+    def _abort(parts: List[MotionHandle]) -> None:
+        """参数错误: 取消已提交的部分"""
+        for part in parts:
+            part.cancel()
+        return None
+
+    def _tick(self):
+        """一个控制周期: 手臂 -> 左手 -> 右手, 依次推进并发布"""
+        self.arm.step_stream()
+        for hand in self.hands.values():
+            hand.step_stream()